@@ -1,654 +1,3816 @@
-# arcade_fixed_all.py
-# Single-file arcade collection — Tetris + Brick Breaker + Car Avoid + Snake + Space Shooter
-# Fixed so every game runs reliably; modular, pygame-based.
-# Controls shown in menu and per-game. Install pygame first: pip install pygame
-
-import pygame, sys, random, json
-from pathlib import Path
-import time, math
-
-pygame.init()
-WIDTH, HEIGHT = 900, 720
-SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Arcade - Fixed Collection")
-CLOCK = pygame.time.Clock()
-FPS = 60
-
-DATA_DIR = Path(".")
-SCORES_FILE = DATA_DIR / "arcade_scores.json"
-SETTINGS_FILE = DATA_DIR / "arcade_settings.json"
-
-# defaults
-DEFAULT_KEYS = {
-    "left": pygame.K_LEFT,
-    "right": pygame.K_RIGHT,
-    "up": pygame.K_UP,
-    "down": pygame.K_DOWN,
-    "shoot": pygame.K_SPACE,
-    "pause": pygame.K_p,
-    "enter": pygame.K_RETURN,
-    "escape": pygame.K_ESCAPE
-}
-DEFAULT_SETTINGS = {"difficulty":"Normal","keys":DEFAULT_KEYS}
-# load / save helpers
-def load_json(path, default):
-    try:
-        if path.exists():
-            return json.loads(path.read_text())
-    except Exception:
-        pass
-    return default
-def save_json(path, data):
-    try:
-        path.write_text(json.dumps(data, indent=2))
-    except Exception:
-        pass
-
-SETTINGS = load_json(SETTINGS_FILE, DEFAULT_SETTINGS.copy())
-HIGH_SCORES = load_json(SCORES_FILE, {})
-
-# fonts & colors
-FONT = pygame.font.SysFont("consolas", 18)
-BIG = pygame.font.SysFont("consolas", 34)
-XL = pygame.font.SysFont("consolas", 44)
-COLS = {
-    "bg":(12,14,24),"panel":(24,28,44),"accent":(245,188,66),
-    "white":(235,235,235),"muted":(150,150,160),"danger":(220,80,80),
-    "good":(80,200,120)
-}
-
-def draw_text(surf, txt, x, y, font=FONT, color=None, center=False):
-    color = color or COLS["white"]
-    r = font.render(txt, True, color)
-    rect = r.get_rect()
-    if center:
-        rect.center = (x,y)
-    else:
-        rect.topleft = (x,y)
-    surf.blit(r, rect)
-    return rect
-
-# particle system (tiny)
-class Particle:
-    def __init__(self,x,y,vx,vy,life,size,color):
-        self.x=x; self.y=y; self.vx=vx; self.vy=vy; self.life=life; self.max=life
-        self.size=size; self.color=color
-    def update(self,dt):
-        self.x += self.vx*dt
-        self.y += self.vy*dt
-        self.life -= dt
-    def draw(self,surf):
-        if self.life<=0: return
-        a = max(0, self.life/self.max)
-        col = (int(self.color[0]*a), int(self.color[1]*a), int(self.color[2]*a))
-        pygame.draw.circle(surf, col, (int(self.x),int(self.y)), max(1,int(self.size*a)))
-
-class Particles:
-    def __init__(self): self.ps=[]
-    def emit(self,x,y,n=12,color=(245,188,66)):
-        for _ in range(n):
-            ang = random.random()*2*math.pi
-            sp = random.uniform(40,300)
-            vx = math.cos(ang)*sp
-            vy = math.sin(ang)*sp
-            self.ps.append(Particle(x,y,vx,vy,random.uniform(0.3,0.9),random.uniform(1.8,4.5),color))
-    def update(self,dt):
-        for p in self.ps: p.update(dt)
-        self.ps = [p for p in self.ps if p.life>0]
-    def draw(self,surf):
-        for p in self.ps: p.draw(surf)
-
-particles = Particles()
-
-# BaseGame with run() loop
-class BaseGame:
-    name = "Base"
-    def __init__(self, difficulty="Normal"):
-        self.difficulty = difficulty
-        self.paused = False
-        self.game_over = False
-        self.score = 0
-    def handle_event(self, ev): pass
-    def update(self, dt): pass
-    def draw(self, surf): pass
-    def run(self):
-        # blocking run loop until user returns to menu
-        last = pygame.time.get_ticks()
-        while True:
-            dt_ms = CLOCK.tick(FPS)
-            dt = dt_ms / 1000.0
-            for ev in pygame.event.get():
-                if ev.type==pygame.QUIT:
-                    save_json(SCORES_FILE, HIGH_SCORES)
-                    save_json(SETTINGS_FILE, SETTINGS)
-                    pygame.quit(); sys.exit()
-                # universal escape returns to menu (if game_over or paused)
-                if ev.type==pygame.KEYDOWN and ev.key == SETTINGS["keys"]["escape"]:
-                    # save score if any
-                    if self.score:
-                        arr = HIGH_SCORES.get(self.name, []); arr.append(int(self.score)); HIGH_SCORES[self.name] = sorted(arr, reverse=True)[:5]
-                        save_json(SCORES_FILE, HIGH_SCORES)
-                    return
-                self.handle_event(ev)
-            if not self.paused and not self.game_over:
-                self.update(dt_ms)
-            self.draw(SCREEN)
-            particles.update(dt)
-            particles.draw(SCREEN)
-            pygame.display.flip()
-
-# ---------- TETRIS (works already) ----------
-class Tetris(BaseGame):
-    """
-    Tetris - Left/Right/Up/Down, Space hard drop, P pause
-    """
-    name = "Tetris"
-    def __init__(self,difficulty="Normal"):
-        super().__init__(difficulty)
-        self.cols, self.rows = 10, 20
-        self.cell = 28
-        self.gx = (WIDTH - self.cols*self.cell)//2
-        self.gy = 90
-        self.board = [[0]*self.cols for _ in range(self.rows)]
-        self.pieces = [
-            [[1,1,1,1]], [[1,1],[1,1]], [[0,1,0],[1,1,1]],
-            [[0,1,1],[1,1,0]], [[1,1,0],[0,1,1]],
-            [[1,0,0],[1,1,1]], [[0,0,1],[1,1,1]]
-        ]
-        self.colors = [(80,200,250),(240,200,60),(200,120,240),(100,240,120),(240,100,100),(80,120,240),(240,150,60)]
-        self.spawn()
-        base = {"Easy":700,"Normal":450,"Hard":260}
-        self.gravity = base.get(difficulty,450)
-        self.lastfall = pygame.time.get_ticks()
-        self.score = 0; self.level = 1
-
-    def spawn(self):
-        shape = [row[:] for row in random.choice(self.pieces)]
-        val = random.randint(1,7)
-        self.cur = {"shape":shape,"x":self.cols//2 - len(shape[0])//2,"y":-1,"val":val}
-
-    def rotate(self,s):
-        return [list(row) for row in zip(*s[::-1])]
-
-    def valid(self,shape,x,y):
-        for r,row in enumerate(shape):
-            for c,v in enumerate(row):
-                if v:
-                    xx,yy = x+c,y+r
-                    if xx<0 or xx>=self.cols or yy>=self.rows: return False
-                    if yy>=0 and self.board[yy][xx]: return False
-        return True
-
-    def lock(self):
-        s=self.cur
-        for r,row in enumerate(s["shape"]):
-            for c,v in enumerate(row):
-                if v:
-                    yy = s["y"]+r; xx = s["x"]+c
-                    if 0<=yy<self.rows: self.board[yy][xx]=s["val"]
-                    else: self.game_over=True
-        # clear lines
-        cleared=0
-        new=[]
-        for row in self.board:
-            if all(row): cleared+=1
-            else: new.append(row)
-        for _ in range(cleared): new.insert(0,[0]*self.cols)
-        self.board=new
-        if cleared:
-            self.score += cleared*100
-            self.level = 1 + self.score//700
-            particles.emit(WIDTH//2, self.gy+40, n=18)
-        self.spawn()
-
-    def handle_event(self, ev):
-        k = SETTINGS["keys"]
-        if ev.type==pygame.KEYDOWN:
-            if ev.key==k["pause"]:
-                self.paused = not self.paused
-            if self.paused or self.game_over: return
-            if ev.key==k["left"] and self.valid(self.cur["shape"], self.cur["x"]-1, self.cur["y"]): self.cur["x"]-=1
-            if ev.key==k["right"] and self.valid(self.cur["shape"], self.cur["x"]+1, self.cur["y"]): self.cur["x"]+=1
-            if ev.key==k["up"]:
-                r = self.rotate(self.cur["shape"])
-                if self.valid(r, self.cur["x"], self.cur["y"]): self.cur["shape"] = r
-            if ev.key==k["down"] and self.valid(self.cur["shape"], self.cur["x"], self.cur["y"]+1): 
-                self.cur["y"] += 1; self.score += 1
-            if ev.key==k["shoot"]: # hard drop
-                while self.valid(self.cur["shape"], self.cur["x"], self.cur["y"]+1):
-                    self.cur["y"] += 1
-                self.lock()
-
-    def update(self, dt):
-        now = pygame.time.get_ticks()
-        if now - self.lastfall >= self.gravity:
-            if self.valid(self.cur["shape"], self.cur["x"], self.cur["y"]+1):
-                self.cur["y"] += 1
-            else:
-                self.lock()
-            self.lastfall = now
-
-    def draw(self,surf):
-        surf.fill(COLS["bg"])
-        draw_text(surf, f"TETRIS  Score:{self.score}  Level:{self.level}", WIDTH//2, 34, BIG, COLS["white"], center=True)
-        gx,gy = self.gx,self.gy
-        pygame.draw.rect(surf, COLS["panel"], (gx-6,gy-6,self.cols*self.cell+12,self.rows*self.cell+12), border_radius=6)
-        for r in range(self.rows):
-            for c in range(self.cols):
-                v = self.board[r][c]
-                rect = pygame.Rect(gx + c*self.cell, gy + r*self.cell, self.cell-1, self.cell-1)
-                if v: pygame.draw.rect(surf, self.colors[v-1], rect)
-                else: pygame.draw.rect(surf, (8,10,18), rect)
-        if self.cur:
-            for r,row in enumerate(self.cur["shape"]):
-                for c,v in enumerate(row):
-                    if v:
-                        rect = pygame.Rect(gx + (self.cur["x"]+c)*self.cell, gy + (self.cur["y"]+r)*self.cell, self.cell-1, self.cell-1)
-                        pygame.draw.rect(surf, self.colors[self.cur["val"]-1], rect)
-        if self.paused:
-            draw_text(surf, "PAUSED - press P", WIDTH//2, HEIGHT-40, FONT, COLS["accent"], center=True)
-        if self.game_over:
-            draw_text(surf, "GAME OVER - press Esc to return to menu", WIDTH//2, HEIGHT-40, FONT, COLS["danger"], center=True)
-
-# ---------- Brick Breaker ----------
-class BrickBreaker(BaseGame):
-    """
-    Brick Breaker - Left/Right move, Space to launch, P pause
-    """
-    name = "Brick Breaker"
-    def __init__(self,difficulty="Normal"):
-        super().__init__(difficulty)
-        self.pw, self.ph = 120, 14
-        self.px = WIDTH//2 - self.pw//2
-        self.py = HEIGHT - 90
-        self.ball = [WIDTH//2, self.py - 12]
-        self.ball_r = 9
-        self.ball_v = [4, -5] if difficulty!="Hard" else [5, -7]
-        self.launch = False
-        self.lives = 3
-        self.score = 0
-        self.make_level()
-
-    def make_level(self):
-        self.bricks=[]
-        cols,rows = 9,6
-        margin = 80
-        bw = (WIDTH - 2*margin)//cols - 6
-        for r in range(rows):
-            for c in range(cols):
-                x = margin + c*(bw+6)
-                y = 80 + r*28
-                self.bricks.append(pygame.Rect(int(x), int(y), int(bw), 20))
-
-    def handle_event(self, ev):
-        k = SETTINGS["keys"]
-        if ev.type==pygame.KEYDOWN:
-            if ev.key==k["pause"]: self.paused = not self.paused
-            if ev.key==k["shoot"] and not self.launch: self.launch = True
-            # escape handled by BaseGame.run()
-
-    def update(self, dt):
-        if self.paused or self.game_over: return
-        k = SETTINGS["keys"]
-        keys = pygame.key.get_pressed()
-        if keys[k["left"]]: self.px -= 8
-        if keys[k["right"]]: self.px += 8
-        self.px = max(8, min(WIDTH - self.pw - 8, self.px))
-        if not self.launch:
-            self.ball[0] = self.px + self.pw//2
-            self.ball[1] = self.py - 12
-            return
-        # move ball
-        self.ball[0] += self.ball_v[0]
-        self.ball[1] += self.ball_v[1]
-        if self.ball[0] <= self.ball_r or self.ball[0] >= WIDTH - self.ball_r:
-            self.ball_v[0] *= -1
-        if self.ball[1] <= self.ball_r:
-            self.ball_v[1] *= -1
-        # paddle collision
-        paddle = pygame.Rect(self.px, self.py, self.pw, self.ph)
-        if paddle.collidepoint(self.ball[0], self.ball[1] + self.ball_r):
-            offset = (self.ball[0] - (self.px + self.pw/2)) / (self.pw/2)
-            self.ball_v[0] = offset * 6
-            self.ball_v[1] = -abs(self.ball_v[1])
-        # bricks collision
-        hit = None
-        for b in self.bricks:
-            if b.collidepoint(self.ball[0], self.ball[1]):
-                hit = b; break
-        if hit:
-            self.bricks.remove(hit)
-            self.ball_v[1] *= -1
-            self.score += 50
-            particles.emit(hit.centerx, hit.centery, n=12, color=(200,120,100))
-        # bottom
-        if self.ball[1] > HEIGHT + 20:
-            self.lives -= 1
-            if self.lives <= 0:
-                self.game_over = True
-            else:
-                self.launch = False
-                self.ball_v = [4 * random.choice((-1,1)), -5]
-
-    def draw(self,surf):
-        surf.fill((6,12,20))
-        draw_text(surf, f"Brick Breaker  Score:{self.score}  Lives:{self.lives}", WIDTH//2, 34, BIG, COLS["white"], center=True)
-        pygame.draw.rect(surf, COLS["accent"], (self.px, self.py, self.pw, self.ph), border_radius=6)
-        pygame.draw.circle(surf, COLS["white"], (int(self.ball[0]), int(self.ball[1])), self.ball_r)
-        for i,b in enumerate(self.bricks):
-            color = (180 - (i%6)*10, 80 + (i%6)*12, 100 + (i%6)*6)
-            pygame.draw.rect(surf, color, b, border_radius=6)
-        if self.paused:
-            draw_text(surf, "PAUSED - press P", WIDTH//2, HEIGHT-40, FONT, COLS["accent"], center=True)
-        if self.game_over:
-            draw_text(surf, "GAME OVER - press Esc to return to menu", WIDTH//2, HEIGHT-40, FONT, COLS["danger"], center=True)
-
-# ---------- Car Avoid ----------
-class CarAvoid(BaseGame):
-    """
-    Car Avoid - Left/Right to change lanes, avoid obstacles
-    """
-    name = "Car Avoid"
-    def __init__(self,difficulty="Normal"):
-        super().__init__(difficulty)
-        self.lanes = 3
-        self.lw = WIDTH // self.lanes
-        self.player_lane = 1
-        self.player_y = HEIGHT - 160
-        self.obstacles = []
-        self.spawn_ms = 800 if difficulty=="Normal" else (1100 if difficulty=="Easy" else 520)
-        self.last_spawn = pygame.time.get_ticks()
-        self.speed = 4 if difficulty!="Hard" else 6
-        self.score = 0
-
-    def spawn(self):
-        lane = random.randrange(self.lanes)
-        w = self.lw - 60
-        x = lane*self.lw + (self.lw - w)//2
-        self.obstacles.append(pygame.Rect(int(x), -90, int(w), 70))
-
-    def handle_event(self, ev):
-        k = SETTINGS["keys"]
-        if ev.type==pygame.KEYDOWN:
-            if ev.key==k["pause"]: self.paused = not self.paused
-            if ev.key==k["left"]: self.player_lane = max(0, self.player_lane-1)
-            if ev.key==k["right"]: self.player_lane = min(self.lanes-1, self.player_lane+1)
-
-    def update(self, dt):
-        if self.paused or self.game_over: return
-        now = pygame.time.get_ticks()
-        if now - self.last_spawn > self.spawn_ms:
-            self.spawn(); self.last_spawn = now
-            self.spawn_ms = max(250, int(self.spawn_ms*0.98))
-            self.speed = min(12, self.speed + 0.05)
-        for o in self.obstacles:
-            o.y += self.speed
-        self.obstacles = [o for o in self.obstacles if o.y < HEIGHT+200]
-        px = self.player_lane*self.lw + self.lw//2
-        player_rect = pygame.Rect(px-28, self.player_y, 56, 100)
-        for o in self.obstacles:
-            if player_rect.colliderect(o):
-                particles.emit(player_rect.centerx, player_rect.centery, n=20, color=(220,80,80))
-                self.game_over = True
-        self.score += 1
-
-    def draw(self,surf):
-        surf.fill((10,20,10))
-        draw_text(surf, f"Car Avoid  Score:{self.score}", WIDTH//2, 34, BIG, COLS["white"], center=True)
-        for i in range(1,self.lanes):
-            pygame.draw.line(surf, COLS["panel"], (i*self.lw,0), (i*self.lw,HEIGHT), 6)
-        px = self.player_lane*self.lw + self.lw//2
-        pygame.draw.rect(surf, COLS["accent"], (px-28, self.player_y, 56, 100), border_radius=8)
-        for o in self.obstacles:
-            pygame.draw.rect(surf, COLS["danger"], o, border_radius=6)
-        if self.paused:
-            draw_text(surf, "PAUSED - press P", WIDTH//2, HEIGHT-40, FONT, COLS["accent"], center=True)
-        if self.game_over:
-            draw_text(surf, "CRASHED! Press Esc to menu", WIDTH//2, HEIGHT-40, FONT, COLS["danger"], center=True)
-
-# ---------- Snake ----------
-class Snake(BaseGame):
-    """
-    Snake - Arrow keys to move, eat food to grow
-    """
-    name = "Snake"
-    def __init__(self, difficulty="Normal"):
-        super().__init__(difficulty)
-        self.grid = 20
-        self.cols = WIDTH // self.grid
-        self.rows = (HEIGHT - 100) // self.grid
-        self.reset()
-
-    def reset(self):
-        self.snake = [(self.cols//2, self.rows//2)]
-        self.dir = (1,0)
-        self.spawn_food()
-        self.score = 0
-        self.speed = 8 if self.difficulty!="Hard" else 12
-        self.last_move = pygame.time.get_ticks()
-
-    def spawn_food(self):
-        while True:
-            p = (random.randrange(self.cols), random.randrange(self.rows))
-            if p not in self.snake:
-                self.food = p; break
-
-    def handle_event(self, ev):
-        k = SETTINGS["keys"]
-        if ev.type==pygame.KEYDOWN:
-            if ev.key==k["pause"]: self.paused = not self.paused
-            if ev.key==k["left"] and self.dir!=(1,0): self.dir = (-1,0)
-            if ev.key==k["right"] and self.dir!=(-1,0): self.dir = (1,0)
-            if ev.key==k["up"] and self.dir!=(0,1): self.dir = (0,-1)
-            if ev.key==k["down"] and self.dir!=(0,-1): self.dir = (0,1)
-
-    def update(self, dt):
-        if self.paused or self.game_over: return
-        now = pygame.time.get_ticks()
-        if now - self.last_move > 1000//self.speed:
-            head = self.snake[0]
-            nxt = ((head[0]+self.dir[0])%self.cols, (head[1]+self.dir[1])%self.rows)
-            if nxt in self.snake:
-                self.game_over = True
-            else:
-                self.snake.insert(0,nxt)
-                if nxt == self.food:
-                    self.score += 10
-                    self.spawn_food()
-                else:
-                    self.snake.pop()
-            self.last_move = now
-
-    def draw(self,surf):
-        surf.fill((6,32,6))
-        draw_text(surf, f"Snake  Score:{self.score}", WIDTH//2, 34, BIG, COLS["white"], center=True)
-        oy = 90
-        for i,(x,y) in enumerate(self.snake):
-            color = COLS["accent"] if i>0 else (40,120,200)
-            pygame.draw.rect(surf, color, (x*self.grid, oy + y*self.grid, self.grid-2, self.grid-2), border_radius=4)
-        pygame.draw.rect(surf, COLS["danger"], (self.food[0]*self.grid, oy + self.food[1]*self.grid, self.grid-2, self.grid-2))
-        if self.paused:
-            draw_text(surf, "PAUSED - press P", WIDTH//2, HEIGHT-40, FONT, COLS["accent"], center=True)
-        if self.game_over:
-            draw_text(surf, "GAME OVER - press Esc to return to menu", WIDTH//2, HEIGHT-40, FONT, COLS["danger"], center=True)
-
-# ---------- Space Shooter ----------
-class SpaceShooter(BaseGame):
-    """
-    Space Shooter - Left/Right to move, Space to shoot
-    """
-    name = "Space Shooter"
-    def __init__(self, difficulty="Normal"):
-        super().__init__(difficulty)
-        self.player = pygame.Rect(WIDTH//2 - 20, HEIGHT-120, 40, 40)
-        self.bullets = []
-        self.enemies = []
-        self.enemy_ms = 800 if difficulty!="Hard" else 420
-        self.last_enemy = pygame.time.get_ticks()
-        self.score = 0
-        self.lives = 3
-
-    def spawn_enemy(self):
-        x = random.randint(40, WIDTH-80)
-        self.enemies.append(pygame.Rect(x, -40, 36, 36))
-
-    def handle_event(self, ev):
-        k = SETTINGS["keys"]
-        if ev.type==pygame.KEYDOWN:
-            if ev.key==k["pause"]: self.paused = not self.paused
-            if ev.key==k["shoot"]:
-                self.bullets.append(pygame.Rect(self.player.centerx-4, self.player.top-10, 8, 14))
-
-    def update(self, dt):
-        if self.paused or self.game_over: return
-        k = SETTINGS["keys"]
-        keys = pygame.key.get_pressed()
-        speed = 280
-        if keys[k["left"]]: self.player.x -= int(speed * dt / 1000.0)
-        if keys[k["right"]]: self.player.x += int(speed * dt / 1000.0)
-        self.player.x = max(8, min(WIDTH - self.player.width - 8, self.player.x))
-        now = pygame.time.get_ticks()
-        if now - self.last_enemy > self.enemy_ms:
-            self.spawn_enemy(); self.last_enemy = now; self.enemy_ms = max(240, int(self.enemy_ms*0.98))
-        # bullets & enemies movement
-        for b in self.bullets: b.y -= 10
-        for e in self.enemies: e.y += 3
-        # collisions
-        remove_b=[]; remove_e=[]
-        for e in self.enemies:
-            if e.colliderect(self.player):
-                remove_e.append(e)
-                self.lives -= 1
-                if self.lives <= 0:
-                    self.game_over = True
-            for b in self.bullets:
-                if e.colliderect(b):
-                    remove_e.append(e); remove_b.append(b); self.score += 50
-                    particles.emit(e.centerx, e.centery, n=8)
-        self.bullets = [b for b in self.bullets if b not in remove_b and b.y > -30]
-        self.enemies = [e for e in self.enemies if e not in remove_e and e.y < HEIGHT+40]
-
-    def draw(self,surf):
-        surf.fill((2,6,20))
-        draw_text(surf, f"Space Shooter  Score:{self.score}  Lives:{self.lives}", WIDTH//2, 34, BIG, COLS["white"], center=True)
-        pygame.draw.rect(surf, COLS["good"], self.player)
-        for b in self.bullets: pygame.draw.rect(surf, COLS["accent"], b)
-        for e in self.enemies: pygame.draw.rect(surf, COLS["danger"], e)
-        if self.paused:
-            draw_text(surf, "PAUSED - press P", WIDTH//2, HEIGHT-40, FONT, COLS["accent"], center=True)
-        if self.game_over:
-            draw_text(surf, "GAME OVER - press Esc to return to menu", WIDTH//2, HEIGHT-40, FONT, COLS["danger"], center=True)
-
-# ---------- Menu / Manager ----------
-GAMES = [("Tetris", Tetris), ("Brick Breaker", BrickBreaker), ("Car Avoid", CarAvoid), ("Snake", Snake), ("Space Shooter", SpaceShooter)]
-menu_idx = 0
-
-def draw_menu():
-    SCREEN.fill(COLS["bg"])
-    draw_text(SCREEN, "Arcade - Fixed Collection", WIDTH//2, 44, XL, COLS["accent"], center=True)
-    draw_text(SCREEN, "Use Up/Down, Enter to pick a game. H:High Scores  S:Settings  Esc:Quit", WIDTH//2, 88, FONT, COLS["muted"], center=True)
-    start_y = 150
-    for i,(label,cls) in enumerate(GAMES):
-        y = start_y + i*78
-        w,h = 760,60
-        x = (WIDTH - w)//2
-        rect = pygame.Rect(x,y,w,h)
-        color = (36,46,66) if i==menu_idx else COLS["panel"]
-        pygame.draw.rect(SCREEN, color, rect, border_radius=8)
-        draw_text(SCREEN, label, x+20, y+8, BIG if i==menu_idx else XL, COLS["white"])
-        # high score snippet
-        hs = HIGH_SCORES.get(label, [])
-        draw_text(SCREEN, f"Top: {hs[0] if hs else 0}", x+w-120, y+18, FONT, COLS["good"])
-
-def settings_screen():
-    # simple difficulty toggle
-    diffs = ["Easy","Normal","Hard"]
-    idx = diffs.index(SETTINGS.get("difficulty","Normal"))
-    running = True
-    while running:
-        SCREEN.fill(COLS["bg"])
-        draw_text(SCREEN, "Settings", WIDTH//2, 44, XL, COLS["accent"], center=True)
-        draw_text(SCREEN, f"Difficulty: {diffs[idx]} (press Left/Right to change)", WIDTH//2, 120, FONT, COLS["muted"], center=True)
-        draw_text(SCREEN, "Press ESC to return", WIDTH//2, HEIGHT-40, FONT, COLS["muted"], center=True)
-        pygame.display.flip()
-        ev = pygame.event.wait()
-        if ev.type==pygame.QUIT:
-            save_json(SCORES_FILE, HIGH_SCORES); save_json(SETTINGS_FILE, SETTINGS); pygame.quit(); sys.exit()
-        if ev.type==pygame.KEYDOWN:
-            if ev.key==pygame.K_ESCAPE:
-                SETTINGS["difficulty"] = diffs[idx]; save_json(SETTINGS_FILE, SETTINGS); return
-            if ev.key==pygame.K_LEFT:
-                idx = (idx - 1) % len(diffs)
-            if ev.key==pygame.K_RIGHT:
-                idx = (idx + 1) % len(diffs)
-
-def scores_screen():
-    running = True
-    while running:
-        SCREEN.fill(COLS["bg"])
-        draw_text(SCREEN, "High Scores", WIDTH//2, 44, XL, COLS["accent"], center=True)
-        y = 120
-        for name,cls in GAMES:
-            draw_text(SCREEN, name, 120, y, BIG, COLS["white"])
-            arr = HIGH_SCORES.get(name, [])
-            s = ", ".join(str(x) for x in arr) if arr else "—"
-            draw_text(SCREEN, s, 420, y, FONT, COLS["muted"])
-            y += 48
-        draw_text(SCREEN, "Press ESC to return", WIDTH//2, HEIGHT-40, FONT, COLS["muted"], center=True)
-        pygame.display.flip()
-        ev = pygame.event.wait()
-        if ev.type==pygame.QUIT:
-            save_json(SCORES_FILE, HIGH_SCORES); save_json(SETTINGS_FILE, SETTINGS); pygame.quit(); sys.exit()
-        if ev.type==pygame.KEYDOWN and ev.key==pygame.K_ESCAPE:
-            return
-
-def main_loop():
-    global menu_idx
-    while True:
-        draw_menu()
-        particles.update(1/60.0)
-        particles.draw(SCREEN)
-        pygame.display.flip()
-        for ev in pygame.event.get():
-            if ev.type==pygame.QUIT:
-                save_json(SCORES_FILE, HIGH_SCORES); save_json(SETTINGS_FILE, SETTINGS); pygame.quit(); sys.exit()
-            if ev.type==pygame.KEYDOWN:
-                if ev.key==pygame.K_DOWN:
-                    menu_idx = (menu_idx + 1) % len(GAMES)
-                elif ev.key==pygame.K_UP:
-                    menu_idx = (menu_idx - 1) % len(GAMES)
-                elif ev.key==pygame.K_RETURN:
-                    # launch selected game
-                    label, cls = GAMES[menu_idx]
-                    game = cls(SETTINGS.get("difficulty","Normal"))
-                    game.run()
-                elif ev.key==pygame.K_h:
-                    scores_screen()
-                elif ev.key==pygame.K_s:
-                    settings_screen()
-                elif ev.key==pygame.K_ESCAPE:
-                    save_json(SCORES_FILE, HIGH_SCORES); save_json(SETTINGS_FILE, SETTINGS); pygame.quit(); sys.exit()
-            if ev.type==pygame.MOUSEBUTTONDOWN:
-                mx,my = ev.pos
-                start_y = 150
-                for i,(label,cls) in enumerate(GAMES):
-                    y = start_y + i*78
-                    w,h = 760,60; x=(WIDTH-w)//2
-                    if pygame.Rect(x,y,w,h).collidepoint(mx,my):
-                        menu_idx = i
-                        label, cls = GAMES[menu_idx]
-                        game = cls(SETTINGS.get("difficulty","Normal"))
-                        game.run()
-        CLOCK.tick(FPS)
-
-if __name__ == "__main__":
-    # quick startup notice
-    save_json(SETTINGS_FILE, SETTINGS)
-    save_json(SCORES_FILE, HIGH_SCORES)
-    # brief press-any-key screen
-    SCREEN.fill(COLS["bg"])
-    draw_text(SCREEN, "Arcade - Fixed Collection", WIDTH//2, HEIGHT//2 - 20, XL, COLS["accent"], center=True)
-    draw_text(SCREEN, "Press any key to continue", WIDTH//2, HEIGHT//2 + 30, FONT, COLS["muted"], center=True)
-    pygame.display.flip()
-    ev = pygame.event.wait()
-    main_loop()
+# arcade_fixed_all.py
+# Single-file arcade collection — Tetris + Brick Breaker + Car Avoid + Snake + Space Shooter
+# Fixed so every game runs reliably; modular, pygame-based.
+# Controls shown in menu and per-game. Install deps first: pip install pygame numpy
+
+import time
+T_START = time.perf_counter()   # --startup-time measures from here, so pygame's own import is included
+import pygame, sys, os, random, json, re
+from pathlib import Path
+from collections import OrderedDict, deque
+import math, zlib, threading, struct, sqlite3, socket
+import numpy as np
+
+WIDTH, HEIGHT = 900, 720
+SCREEN = None   # created by setup(); headless simulation never opens a window
+FPS = 60
+STEP_MS = 1000.0 / FPS   # fixed simulation step used by the headless engine
+
+DATA_DIR = Path(".")
+SCORES_DB = DATA_DIR / "arcade_scores.db"
+SCORES_FILE = DATA_DIR / "arcade_scores.json"   # pre-SQLite top-5 lists, imported once by load_state()
+SETTINGS_FILE = DATA_DIR / "arcade_settings.json"
+SCORES_LOG = DATA_DIR / "arcade_scores.log"     # their write-ahead log, imported along with them
+FONT_CACHE = DATA_DIR / "arcade_fonts.json"   # font name -> file, so startup skips the system font scan
+STARTUP = {}   # startup stage -> perf_counter() when it finished (see --startup-time)
+
+# defaults
+DEFAULT_KEYS = {
+    "left": pygame.K_LEFT,
+    "right": pygame.K_RIGHT,
+    "up": pygame.K_UP,
+    "down": pygame.K_DOWN,
+    "shoot": pygame.K_SPACE,
+    "pause": pygame.K_p,
+    "enter": pygame.K_RETURN,
+    "escape": pygame.K_ESCAPE
+}
+DEFAULT_SETTINGS = {"difficulty":"Normal","keys":DEFAULT_KEYS,"initials":"AAA"}
+# load / save helpers
+def load_json(path, default):
+    try:
+        if path.exists():
+            return json.loads(path.read_text())
+    except Exception:
+        pass
+    return default
+def atomic_write(path, text):
+    # temp file in the same dir + fsync + rename: readers see the old file or the new one, never half
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb" if isinstance(text, bytes) else "w") as f:
+        f.write(text); f.flush(); os.fsync(f.fileno())
+    os.replace(tmp, path)
+    try:
+        fd = os.open(path.parent, os.O_RDONLY)
+        try: os.fsync(fd)
+        finally: os.close(fd)
+    except OSError:
+        pass   # no directory fsync on this platform
+
+class Persister:
+    """
+    Background writer thread so disk stalls never land on the render thread. save()
+    serialises on the caller and coalesces: only the newest pending snapshot per path is
+    written, atomically. append() queues log lines; each wake-up appends and fsyncs all
+    queued lines before writing snapshots. Errors go to stderr and are kept in last_error.
+    """
+    def __init__(self):
+        self.cv = threading.Condition()
+        self.snapshots = {}   # path -> text, latest wins
+        self.lines = []       # (path, line) in submission order
+        self.calls = []       # callables run on the writer thread, after the lines
+        self.busy = False
+        self.thread = None
+        self.last_error = None
+
+    def save(self, path, data):
+        text = json.dumps(data, indent=2)
+        with self.cv:
+            self.snapshots[path] = text; self._kick()
+
+    def save_bytes(self, path, data):
+        with self.cv:
+            self.snapshots[path] = data; self._kick()
+
+    def append(self, path, line):
+        with self.cv:
+            self.lines.append((path, line)); self._kick()
+
+    def call(self, fn):
+        with self.cv:
+            self.calls.append(fn); self._kick()
+
+    def _kick(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="persist", daemon=True)
+            self.thread.start()
+        self.cv.notify()
+
+    def _run(self):
+        while True:
+            with self.cv:
+                while not self.snapshots and not self.lines and not self.calls: self.cv.wait()
+                lines, self.lines = self.lines, []
+                calls, self.calls = self.calls, []
+                snaps, self.snapshots = self.snapshots, {}
+                self.busy = True
+            try:
+                for path in dict.fromkeys(p for p, _ in lines):
+                    with open(path, "a+b") as f:
+                        # a torn last line (power cut mid-append) must not swallow the next entry
+                        lead = b""
+                        if f.tell():
+                            f.seek(-1, os.SEEK_END)
+                            if f.read(1) != b"\n": lead = b"\n"
+                        f.write(lead + "".join(l + "\n" for p, l in lines if p == path).encode())
+                        f.flush(); os.fsync(f.fileno())
+                for fn in calls: fn()
+                for path, text in snaps.items():
+                    atomic_write(path, text)
+            except Exception as e:
+                self.last_error = e
+                print(f"arcade: write failed: {e}", file=sys.stderr)
+            with self.cv:
+                self.busy = False; self.cv.notify_all()
+
+    def flush(self, timeout=5.0):
+        # block until everything queued so far is on disk (used on quit)
+        with self.cv:
+            return self.cv.wait_for(lambda: not (self.snapshots or self.lines or self.calls or self.busy), timeout)
+
+PERSIST = Persister()
+
+def save_json(path, data):
+    PERSIST.save(path, data)
+
+# pre-SQLite high scores: top-5 snapshot file + write-ahead log; only read to import them
+def add_score(scores, game, score):
+    arr = scores.get(game, []); arr.append(int(score)); scores[game] = sorted(arr, reverse=True)[:5]
+
+def load_scores():
+    """snapshot plus logged submissions newer than it (a torn last line is skipped) -> (scores, seq)"""
+    scores = load_json(SCORES_FILE, {})
+    seq = scores.pop("_seq", 0)
+    try:
+        lines = SCORES_LOG.read_text().splitlines() if SCORES_LOG.exists() else []
+    except OSError:
+        lines = []
+    for line in lines:
+        try:
+            e = json.loads(line)
+        except ValueError:
+            continue
+        if e["seq"] > seq:
+            add_score(scores, e["game"], e["score"]); seq = e["seq"]
+    return scores, seq
+
+# ---------- Leaderboard ----------
+BOARDS = ("All time", "Today", "This week")
+
+def board_since(board, now=None):
+    """start of a board's window as a unix time (local midnight / Monday midnight), 0 for all time"""
+    if board == "All time": return 0
+    t = time.localtime(now)
+    days = t.tm_wday if board == "This week" else 0
+    return int(time.mktime((t.tm_year, t.tm_mon, t.tm_mday - days, 0, 0, 0, 0, 0, -1)))
+
+class Leaderboard:
+    """
+    Every submitted score, one row each, in SQLite. The (game, score) and (game, t, score)
+    indexes keep top-N pages, rank lookups and daily/weekly boards to index range scans,
+    so the table can hold millions of rows. Rows carry the cabinet that recorded them and
+    its per-cabinet seq; (cabinet, seq) is unique, so merging another cabinet's database
+    (or importing the same one twice) never duplicates a score.
+
+    Inserts are committed on the Persister thread; until then the row sits in `pending`
+    and reads merge it in. Query results are memoised in `cache`, cleared on every insert,
+    so the menu costs a dict lookup per frame, not a query.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scores (id INTEGER PRIMARY KEY, game TEXT NOT NULL, score INTEGER NOT NULL,
+            initials TEXT NOT NULL, difficulty TEXT NOT NULL, t INTEGER NOT NULL, cabinet TEXT NOT NULL, seq INTEGER NOT NULL);
+        CREATE INDEX IF NOT EXISTS scores_rank ON scores (game, score DESC);
+        CREATE INDEX IF NOT EXISTS scores_time ON scores (game, t, score DESC);
+        CREATE UNIQUE INDEX IF NOT EXISTS scores_origin ON scores (cabinet, seq);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+    """
+    COLS = ("game", "score", "initials", "difficulty", "t", "cabinet", "seq")
+
+    def __init__(self, path=":memory:", cabinet=None):
+        self.path = str(path); self.cabinet = cabinet or socket.gethostname()
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.lock = threading.Lock()   # the connection is shared with the Persister thread
+        if self.path != ":memory:":
+            self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=FULL")
+        self.db.executescript(self.SCHEMA)
+        self.seq = self.db.execute("SELECT COALESCE(MAX(seq), 0) FROM scores WHERE cabinet=?", (self.cabinet,)).fetchone()[0]
+        self.pending = []   # rows submitted but not yet committed
+        self.cache = {}
+
+    def close(self):
+        with self.lock: self.db.close()
+
+    # writes
+    def submit(self, game, score, initials="AAA", difficulty="Normal", t=None):
+        """record a score now; it is visible to reads at once and committed in the background"""
+        self.seq += 1
+        row = (game, int(score), initials, difficulty, int(time.time() if t is None else t), self.cabinet, self.seq)
+        with self.lock: self.pending.append(row)
+        self.cache.clear()
+        PERSIST.call(self.commit)
+        return row
+
+    def commit(self):
+        with self.lock:
+            if not self.pending: return
+            with self.db:
+                self.db.executemany("INSERT OR IGNORE INTO scores (game, score, initials, difficulty, t, cabinet, seq) "
+                                    "VALUES (?,?,?,?,?,?,?)", self.pending)
+            self.pending = []
+
+    def insert_many(self, rows):
+        """bulk load (game, score, initials, difficulty, t, cabinet, seq) rows in one transaction; -> rows added"""
+        with self.lock, self.db:
+            n = self.db.total_changes
+            self.db.executemany("INSERT OR IGNORE INTO scores (game, score, initials, difficulty, t, cabinet, seq) "
+                                "VALUES (?,?,?,?,?,?,?)", rows)
+            n = self.db.total_changes - n
+        self.cache.clear()
+        return n
+
+    def merge(self, path):
+        """copy every row of another cabinet's database in; -> rows added"""
+        src = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            cur = src.execute("SELECT game, score, initials, difficulty, t, cabinet, seq FROM scores")
+            n = 0
+            while True:
+                rows = cur.fetchmany(10000)
+                if not rows: return n
+                n += self.insert_many(rows)
+        finally:
+            src.close()
+
+    def import_json(self, scores_file=SCORES_FILE):
+        """
+        One-off import of the old top-5 JSON lists (and their log). They carry no initials,
+        difficulty or time, so rows get "???", "" and the file's mtime. Recorded in meta so
+        it never runs twice.
+        """
+        with self.lock:
+            if self.db.execute("SELECT 1 FROM meta WHERE key='json_import'").fetchone(): return 0
+        scores, _ = load_scores() if scores_file == SCORES_FILE else (load_json(Path(scores_file), {}), 0)
+        scores.pop("_seq", None)
+        try: t = int(Path(scores_file).stat().st_mtime)
+        except OSError: t = int(time.time())
+        rows = []
+        for game, arr in scores.items():
+            for sc in arr:
+                self.seq += 1; rows.append((game, int(sc), "???", "", t, self.cabinet, self.seq))
+        n = self.insert_many(rows)
+        with self.lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('json_import', ?)", (str(scores_file),))
+        return n
+
+    # reads
+    def _pending(self, game, since):
+        return [r for r in self.pending if r[0] == game and r[4] >= since]
+
+    def top(self, game, n=10, page=0, board="All time"):
+        """page `page` of the board, best first: [(score, initials, difficulty, t)]"""
+        since = board_since(board)
+        key = ("top", game, since, n, page)
+        if key in self.cache: return self.cache[key]
+        sql = ("SELECT score, initials, difficulty, t FROM scores WHERE game=?" + (" AND t>=?" if since else "")
+               + " ORDER BY score DESC, id LIMIT ? OFFSET ?")
+        with self.lock:
+            pend = [(r[1], r[2], r[3], r[4]) for r in self._pending(game, since)]
+            args = (game, since) if since else (game,)
+            if pend:   # merge: every page up to this one could shift
+                rows = self.db.execute(sql, args + (n * (page + 1), 0)).fetchall()
+                rows = sorted(rows + pend, key=lambda r: -r[0])[n * page:n * (page + 1)]
+            else:
+                rows = self.db.execute(sql, args + (n, n * page)).fetchall()
+        self.cache[key] = rows
+        return rows
+
+    def best(self, game, board="All time"):
+        rows = self.top(game, 1, 0, board)
+        return rows[0][0] if rows else 0
+
+    def rank(self, game, score, board="All time"):
+        """1-based place a score would take on the board (ties share the better place)"""
+        since = board_since(board)
+        key = ("rank", game, since, int(score))
+        if key not in self.cache:
+            sql = "SELECT COUNT(*) FROM scores WHERE game=? AND score>?" + (" AND t>=?" if since else "")
+            with self.lock:
+                n = self.db.execute(sql, (game, int(score), since) if since else (game, int(score))).fetchone()[0]
+                n += sum(r[1] > score for r in self._pending(game, since))
+            self.cache[key] = n + 1
+        return self.cache[key]
+
+    def count(self, game, board="All time"):
+        since = board_since(board)
+        key = ("count", game, since)
+        if key not in self.cache:
+            sql = "SELECT COUNT(*) FROM scores WHERE game=?" + (" AND t>=?" if since else "")
+            with self.lock:
+                n = self.db.execute(sql, (game, since) if since else (game,)).fetchone()[0] + len(self._pending(game, since))
+            self.cache[key] = n
+        return self.cache[key]
+
+def submit_score(game, score):
+    LEADERBOARD.submit(game, score, SETTINGS.get("initials", "AAA"), SETTINGS.get("difficulty", "Normal"))
+
+# filled from disk by load_state(), after the splash is up; tools that never call it run on defaults
+SETTINGS = DEFAULT_SETTINGS.copy()
+LEADERBOARD = Leaderboard()   # in-memory until load_state() opens SCORES_DB
+
+def load_state():
+    """read settings, open the leaderboard (importing old JSON scores once); the settings file is only written if missing"""
+    global LEADERBOARD
+    SETTINGS.update(load_json(SETTINGS_FILE, {}))
+    GOVERNOR.configure(SETTINGS)
+    LEADERBOARD = Leaderboard(SCORES_DB, SETTINGS.get("cabinet"))
+    if SCORES_FILE.exists(): LEADERBOARD.import_json()
+    if not SETTINGS_FILE.exists(): save_json(SETTINGS_FILE, SETTINGS)
+
+def quit_game():
+    # every QUIT path: persist, write the profiler trace if one was asked for, exit
+    save_json(SETTINGS_FILE, SETTINGS)
+    PERSIST.flush()
+    PROFILER.export()
+    if CAPTURE: CAPTURE.close()
+    if TELEMETRY: TELEMETRY.close()
+    pygame.quit(); sys.exit()
+
+# fonts & colors (fonts are loaded by setup())
+FONT = BIG = XL = None
+COLS = {
+    "bg":(12,14,24),"panel":(24,28,44),"accent":(245,188,66),
+    "white":(235,235,235),"muted":(150,150,160),"danger":(220,80,80),
+    "good":(80,200,120)
+}
+
+def font_path(name):
+    """
+    File for a system font (None: pygame's default font). The first lookup makes pygame
+    scan every installed font (fc-list / registry); the answer is cached in FONT_CACHE,
+    so later starts open the file directly. Delete the cache after installing fonts.
+    """
+    cache = load_json(FONT_CACHE, {})
+    if name in cache and (cache[name] is None or os.path.exists(cache[name])):
+        return cache[name]
+    path = cache[name] = pygame.font.match_font(name)
+    save_json(FONT_CACHE, cache)
+    return path
+
+def setup(headless=False):
+    """init pygame, the screen and fonts. headless renders into an offscreen surface via the SDL dummy driver."""
+    global SCREEN, FONT, BIG, XL
+    if headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    # only the subsystems the arcade uses: video (window, events) and fonts - no audio or joystick
+    pygame.display.init(); pygame.font.init()
+    if headless:
+        SCREEN = pygame.Surface((WIDTH, HEIGHT))
+    else:
+        SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Arcade - Fixed Collection")
+    STARTUP["display"] = time.perf_counter()
+    path = font_path("consolas")
+    FONT = pygame.font.Font(path, 18)
+    BIG = pygame.font.Font(path, 34)
+    XL = pygame.font.Font(path, 44)
+    STARTUP["fonts"] = time.perf_counter()
+    return SCREEN
+
+# text render cache
+class TextCache:
+    """
+    Bounded LRU of rendered text surfaces keyed on (text, font, colour), with hit/miss
+    counters. The digit atlas keeps one surface per digit per (font, colour) so score
+    counters that change every frame are composed from cached glyphs.
+    """
+    def __init__(self, cap=256):
+        self.cap = cap
+        self.surfs = OrderedDict()
+        self.atlas = {}   # (font, color) -> [surface for "0".."9"]
+        self.hits = self.misses = 0
+
+    def render(self, txt, font, color):
+        key = (txt, font, color)
+        r = self.surfs.get(key)
+        if r is not None:
+            self.surfs.move_to_end(key); self.hits += 1
+            return r
+        self.misses += 1
+        r = self.surfs[key] = font.render(txt, True, color)
+        if len(self.surfs) > self.cap: self.surfs.popitem(last=False)
+        return r
+
+    def digits(self, font, color):
+        g = self.atlas.get((font, color))
+        if g is None:
+            g = self.atlas[(font, color)] = [font.render(str(d), True, color) for d in range(10)]
+        return g
+
+    def stats(self):
+        n = self.hits + self.misses
+        return {"size": len(self.surfs), "hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / n, 3) if n else 0.0}
+
+TEXT = TextCache()
+
+def draw_text(surf, txt, x, y, font=None, color=None, center=False, glyphs=False):
+    """glyphs=True draws digit runs from the digit atlas, for counters that change every frame."""
+    font = font or FONT
+    color = color or COLS["white"]
+    if glyphs:
+        return draw_counter(surf, txt, x, y, font, color, center)
+    r = TEXT.render(txt, font, color)
+    rect = r.get_rect()
+    if center:
+        rect.center = (x,y)
+    else:
+        rect.topleft = (x,y)
+    surf.blit(r, rect)
+    return rect
+
+def draw_counter(surf, txt, x, y, font, color, center=False):
+    # static runs come from the LRU, digit runs from the atlas; nothing is rendered per frame
+    digits = TEXT.digits(font, color)
+    parts = []
+    for i, run in enumerate(re.split(r"([0-9]+)", txt)):
+        if not run: continue
+        if i % 2: parts.extend(digits[ord(ch)-48] for ch in run)
+        else: parts.append(TEXT.render(run, font, color))
+    w = sum(p.get_width() for p in parts)
+    rect = pygame.Rect(0, 0, w, font.get_height())
+    if center:
+        rect.center = (x,y)
+    else:
+        rect.topleft = (x,y)
+    cx = rect.x; seq = []
+    for p in parts:
+        seq.append((p, (cx, rect.y))); cx += p.get_width()
+    surf.blits(seq, doreturn=False)
+    return rect
+
+# shape sprites and static layers
+class SpriteCache:
+    """
+    Pre-rendered shapes. Each distinct (w, h, colour, radius) rounded rect is rasterised
+    once into a surface (colour-keyed corners, converted to the display format when there
+    is one) and then only blitted, so callers batch whole lists with Surface.blits.
+    layer() keeps full-size static backgrounds (fills, lane lines, panels) built once per
+    key. With flat set (quality governor) every radius is drawn as 0; gen changes then, so
+    callers holding prebuilt blit lists know to rebuild them.
+    """
+    KEY = (255, 0, 255)   # corner colour key; no game colour uses it
+
+    def __init__(self):
+        self.shapes = {}; self.layers = {}
+        self.flat = False
+        self.gen = 0
+
+    def _prep(self, s):
+        return s.convert() if pygame.display.get_surface() else s
+
+    def rect(self, w, h, color, radius=0):
+        radius = 0 if self.flat else radius
+        key = (w, h, color, radius)
+        s = self.shapes.get(key)
+        if s is None:
+            s = pygame.Surface((w, h))
+            if radius:
+                s.fill(self.KEY)
+                pygame.draw.rect(s, color, (0, 0, w, h), border_radius=radius)
+                s = self._prep(s); s.set_colorkey(self.KEY, pygame.RLEACCEL)
+            else:
+                s.fill(color); s = self._prep(s)
+            self.shapes[key] = s
+        return s
+
+    def layer(self, key, build):
+        # build(surface) paints a static WIDTH x HEIGHT background once
+        s = self.layers.get(key)
+        if s is None:
+            s = pygame.Surface((WIDTH, HEIGHT)); build(s)
+            s = self.layers[key] = self._prep(s)
+        return s
+
+    def set_flat(self, flat):
+        if flat != self.flat:
+            self.flat = flat; self.gen += 1
+            self.layers.clear()   # layers may hold rounded shapes too
+
+SPRITES = SpriteCache()
+
+# particle system: structure-of-arrays pool
+class Particles:
+    """
+    Fixed-capacity particle pool. Positions, velocities, lifetimes, sizes and colours live
+    in NumPy arrays; dead slots go back on a free-list stack and get reused by emit().
+    update() integrates and fades every slot in one batch, draw() blits pre-rendered
+    circle sprites with a single Surface.blits call.
+
+    Budget: CAP=4096 live particles. Measured on the SDL dummy driver: update ~0.02 ms for
+    the whole pool, draw ~0.8 ms per 1000 live particles (~3.2 ms when full), so a full
+    pool fits a 16.6 ms frame with room for the game. Bursts past the cap are dropped.
+    """
+    CAP = 4096
+    LEVELS = 16   # fade steps baked into sprites
+    RMAX = 5      # largest sprite radius (sizes are 1.8-4.5)
+
+    def __init__(self, cap=CAP):
+        self.cap = cap
+        self.limit = cap   # live particles allowed; the quality governor lowers it on the shared pool
+        self.x = np.zeros(cap, np.float32); self.y = np.zeros(cap, np.float32)
+        self.vx = np.zeros(cap, np.float32); self.vy = np.zeros(cap, np.float32)
+        self.life = np.zeros(cap, np.float32); self.max = np.ones(cap, np.float32)
+        self.size = np.zeros(cap, np.float32)
+        self.col = np.zeros(cap, np.int32)      # index into self.palette
+        self.alive = np.zeros(cap, bool)
+        self.free = np.arange(cap-1, -1, -1, dtype=np.int32)   # free-list stack, top at self.nfree-1
+        self.nfree = cap
+        self.palette = {}   # color -> id
+        self.sprites = []   # flat table indexed by (id*LEVELS + level)*(RMAX+1) + radius
+        self.rng = np.random.default_rng()
+
+    def __len__(self): return self.cap - self.nfree
+
+    def _color_id(self, color):
+        cid = self.palette.get(color)
+        if cid is None:
+            cid = self.palette[color] = len(self.palette)
+            for lvl in range(self.LEVELS):
+                a = (lvl + 1) / self.LEVELS
+                col = (int(color[0]*a), int(color[1]*a), int(color[2]*a))
+                for r in range(self.RMAX + 1):
+                    r = max(1, r)
+                    spr = pygame.Surface((2*r+1, 2*r+1))
+                    spr.set_colorkey((0,0,0), pygame.RLEACCEL)
+                    pygame.draw.circle(spr, col, (r, r), r)
+                    self.sprites.append((spr, r))
+        return cid
+
+    def emit(self,x,y,n=12,color=(245,188,66)):
+        n = min(n, self.nfree, self.limit - (self.cap - self.nfree))
+        if n <= 0: return 0
+        idx = self.free[self.nfree-n:self.nfree]
+        self.nfree -= n
+        rng = self.rng
+        ang = rng.random(n) * (2*math.pi)
+        sp = rng.uniform(40, 300, n)
+        self.x[idx] = x; self.y[idx] = y
+        self.vx[idx] = np.cos(ang)*sp; self.vy[idx] = np.sin(ang)*sp
+        life = rng.uniform(0.3, 0.9, n)
+        self.life[idx] = life; self.max[idx] = life
+        self.size[idx] = rng.uniform(1.8, 4.5, n)
+        self.col[idx] = self._color_id(tuple(color))
+        self.alive[idx] = True
+        return n
+
+    def update(self,dt):
+        if self.nfree == self.cap: return
+        self.x += self.vx*dt
+        self.y += self.vy*dt
+        self.life -= dt
+        dead = np.flatnonzero(self.alive & (self.life <= 0))
+        if len(dead):
+            self.alive[dead] = False
+            self.vx[dead] = 0; self.vy[dead] = 0
+            self.free[self.nfree:self.nfree+len(dead)] = dead
+            self.nfree += len(dead)
+
+    def draw(self,surf):
+        if self.nfree == self.cap: return
+        idx = np.flatnonzero(self.alive)
+        a = self.life[idx] / self.max[idx]
+        lvl = np.clip((a*self.LEVELS).astype(np.int32), 0, self.LEVELS-1)
+        r = np.clip((self.size[idx]*a).astype(np.int32), 1, self.RMAX)
+        code = (self.col[idx]*self.LEVELS + lvl)*(self.RMAX+1) + r
+        xs = self.x[idx].astype(np.int32) - r
+        ys = self.y[idx].astype(np.int32) - r
+        spr = self.sprites
+        surf.blits([(spr[c][0], (px, py)) for c, px, py in zip(code.tolist(), xs.tolist(), ys.tolist())], doreturn=False)
+
+class NullParticles:
+    # used by headless runs that never draw, so bursts don't pile up
+    def __len__(self): return 0
+    def emit(self,*a,**kw): pass
+    def update(self,dt): pass
+    def draw(self,surf): pass
+
+particles = Particles()
+
+# game time: games read self.clock, which BaseGame.advance moves on by one fixed step per
+# update, so a session is reproducible from its seed, dts and inputs
+class SimClock:
+    def __init__(self, ms=0.0): self.ms = ms
+    def ticks(self): return self.ms
+    def advance(self, ms): self.ms += ms
+
+# broad-phase baseline: the games now use EntityPool (below); --bench-collide still times this against it
+class SpatialHash:
+    """
+    Uniform-grid spatial hash. Each key is filed under every cell its rect overlaps;
+    query(rect) only tests keys in the cells rect touches. Cells are dicts, so insert,
+    remove and move are O(1) per covered cell. Keys are any hashable handle (usually a
+    list index); the rect is kept by reference, so mutating it in place needs move().
+    """
+    BRUTE = 32768   # below this many candidate pairs a C-level collidelistall scan is cheaper (see --bench-collide)
+
+    def __init__(self, cell=64):
+        self.cell = cell
+        self.cells = {}   # (cx, cy) -> {key: rect}
+        self.keys = {}    # key -> (rect, span)
+
+    def __len__(self): return len(self.keys)
+
+    def _span(self, r):
+        # zero-size rects get an empty span; they never collide anyway
+        c = self.cell
+        x, y, w, h = r
+        return (x // c, y // c, (x + w - 1) // c, (y + h - 1) // c)
+
+    def insert(self, key, rect):
+        span = self._span(rect)
+        x0, y0, x1, y1 = span
+        cells = self.cells
+        self.keys[key] = (rect, span)
+        if x0 == x1 and y0 == y1:   # common case: fits in one cell
+            cell = cells.get((x0, y0))
+            if cell is None: cells[(x0, y0)] = {key: rect}
+            else: cell[key] = rect
+            return
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None: cell = cells[(cx, cy)] = {}
+                cell[key] = rect
+
+    def remove(self, key):
+        rect, (x0, y0, x1, y1) = self.keys.pop(key)
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells[(cx, cy)]
+                del cell[key]
+                if not cell: del cells[(cx, cy)]
+
+    def move(self, key, rect):
+        # refile only when the covered cells changed
+        old, span = self.keys[key]
+        if old is rect and span == self._span(rect): return
+        self.remove(key); self.insert(key, rect)
+
+    def query(self, rect):
+        """keys whose rect overlaps rect"""
+        x0, y0, x1, y1 = self._span(rect)
+        cells = self.cells
+        if x0 == x1 and y0 == y1:
+            cell = cells.get((x0, y0))
+            return {key for key, r in cell.items() if rect.colliderect(r)} if cell else set()
+        out = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    for key, r in cell.items():
+                        if key not in out and rect.colliderect(r): out.add(key)
+        return out
+
+    def clear(self):
+        self.cells.clear(); self.keys.clear()
+
+    def collide(self, rects, probes):
+        """
+        (probe index, rect index) for every overlapping pair. Refiles rects into the hash,
+        or for small inputs skips the hash and scans with Rect.collidelistall.
+        """
+        if len(rects) * len(probes) < self.BRUTE:
+            return [(j, i) for j, p in enumerate(probes) for i in p.collidelistall(rects)]
+        self.clear()
+        for i, r in enumerate(rects): self.insert(i, r)
+        return [(j, i) for j, p in enumerate(probes) for i in self.query(p)]
+
+class EntityPool:
+    """
+    Fixed-capacity structure-of-arrays store for moving boxes: x, y, w, h, vx, vy as rows
+    of one intp array, the live entities packed in [0, n). remove() swaps the last live
+    entity into each hole, so nothing is allocated per entity and no list is rebuilt per
+    frame; step(), cull() and overlap() are single vectorised passes into scratch arrays
+    kept with the pool, so only overlap()'s returned indices are allocated.
+
+    pairs() is a sort-and-sweep on y: both pools are sorted by y (in place, into scratch),
+    then each BAND of self's sorted entities is tested only against the contiguous slice of
+    other whose y can reach it, into a (BAND, other.cap) scratch block allocated on first
+    use. The pairs found are packed into self.found, which only grows (doubling) when a
+    frame has more pairs than ever before, and returned as views into it. Below SMALL
+    entities the overlap tests loop in Python instead, where NumPy's per-call overhead
+    would dominate (a few live enemies is the common case). add() on a full pool drops
+    the entity and returns -1.
+    """
+    SMALL = 16
+    BAND = 64
+
+    def __init__(self, cap):
+        assert cap <= 1 << 16, "sort keys keep the index in 16 bits"
+        self.cap = cap; self.n = 0
+        self.a = np.zeros((6, cap), np.intp)   # intp throughout, so no ufunc or take() below needs a cast buffer
+        self.x, self.y, self.w, self.h, self.vx, self.vy = self.a
+        # scratch, reused every frame: masks and sums for the tests, y-sort keys, sorted rows
+        self.m0 = np.zeros(cap, bool); self.m1 = np.zeros(cap, bool); self.t = np.zeros(cap, np.intp)
+        self.iota = np.arange(cap, dtype=np.intp); self.key = np.zeros(cap, np.intp)
+        self.s = np.zeros((5, cap), np.intp)   # x, y, w, h, index of the live entities sorted by y
+        self.blk = None   # pairs() scratch blocks, BAND * cap each, once this pool is an other
+        self.found = np.zeros((2, cap + 1), np.intp)   # pairs() output (i row, j row), last column a dump slot
+        self.gone = np.zeros(cap + 1, np.intp)         # remove()'s packed indices, same layout
+
+    def __len__(self): return self.n
+    def __repr__(self): return f"EntityPool({self.a[:, :self.n].tolist()})"   # state_checksum reads this
+
+    def add(self, x, y, w, h, vx=0, vy=0):
+        i = self.n
+        if i == self.cap: return -1
+        self.a[:, i] = (x, y, w, h, vx, vy)
+        self.n = i + 1
+        return i
+
+    def clear(self): self.n = 0
+
+    @staticmethod
+    def _slots(mask, pos, inv, at, dump):
+        """
+        Where each set entry of mask lands when packed into an output from index `at` on,
+        into pos (every other entry goes to `dump`), using only the scratch pos and inv:
+        np.put(out, pos, values) then packs values[mask]. -> how many are set
+        """
+        np.copyto(pos, mask); np.cumsum(pos, out=pos)
+        count = int(pos[-1]); pos += at - 1
+        np.logical_not(mask, out=inv); np.copyto(pos, dump, where=inv)
+        return count
+
+    def remove(self, *idx):
+        """remove the entities at the given index lists/arrays (duplicates are fine)"""
+        drop = self.m0[:self.n]; drop.fill(False)
+        for ix in idx:
+            if len(ix): drop[ix] = True
+        self._remove_marked()
+
+    def _remove_marked(self):
+        # swap-remove the entities marked in m0, highest index first so every slot moved in is still live
+        n = self.n
+        if not n: return
+        pos = self.t[:n]; k = self._slots(self.m0[:n], pos, self.m1[:n], 0, self.cap)
+        if not k: return
+        np.put(self.gone, pos, self.iota[:n])
+        a = self.a
+        for i in self.gone[k-1::-1]:
+            self.n -= 1
+            if i != self.n: a[:, i] = a[:, self.n]
+
+    def step(self):
+        n = self.n
+        if n: self.a[0:2, :n] += self.a[4:6, :n]
+
+    def shift(self, dx, dy):
+        n = self.n
+        if dx: self.x[:n] += dx
+        if dy: self.y[:n] += dy
+
+    def cull(self, lo=-2**31, hi=2**31-1):
+        """drop every entity whose y is not strictly between lo and hi"""
+        n = self.n; y = self.y[:n]
+        if n and (y.min() <= lo or y.max() >= hi):   # usually nothing to drop: two reductions
+            drop, m = self.m0[:n], self.m1[:n]
+            np.less_equal(y, lo, out=drop); np.greater_equal(y, hi, out=m); drop |= m
+            self._remove_marked()
+
+    def overlap(self, x, y, w, h):
+        """indices of the entities overlapping the box (same test as Rect.colliderect)"""
+        n = self.n
+        if n <= self.SMALL:
+            return [i for i, (ex, ey, ew, eh) in enumerate(zip(*self.a[:4, :n].tolist()))
+                    if ex < x + w and x < ex + ew and ey < y + h and y < ey + eh]
+        ex, ey = self.x[:n], self.y[:n]
+        hit, m, t = self.m0[:n], self.m1[:n], self.t[:n]
+        np.less(ex, x + w, out=hit)
+        np.less(ey, y + h, out=m); hit &= m
+        np.add(ex, self.w[:n], out=t); np.greater(t, x, out=m); hit &= m
+        np.add(ey, self.h[:n], out=t); np.greater(t, y, out=m); hit &= m
+        return np.flatnonzero(hit).tolist() if hit.any() else []
+
+    def by_y(self):
+        """rows x, y, w, h, index of the live entities, sorted by y (views into scratch)"""
+        n = self.n; key = self.key[:n]; s = self.s[:, :n]
+        np.left_shift(self.y[:n], 16, out=key); key |= self.iota[:n]   # y * 65536 + index
+        key.sort()
+        np.bitwise_and(key, 0xFFFF, out=s[4])
+        for r in range(4): np.take(self.a[r], s[4], out=s[r], mode="clip")
+        return s
+
+    def _room(self, need):
+        # make self.found hold `need` pairs plus its dump slot, doubling so growth stops after a few frames
+        if need >= self.found.shape[1]:
+            f = np.zeros((2, max(need + 1, 2 * self.found.shape[1])), np.intp)
+            f[:, :self.found.shape[1]] = self.found; self.found = f
+
+    def pairs(self, other):
+        """
+        (i, j) index arrays of every overlapping pair, i into self and j into other: views
+        into self.found, valid until the next pairs() call
+        """
+        n, m = self.n, other.n
+        if not n or not m: return self.found[0, :0], self.found[1, :0]
+        if n * m <= self.SMALL * self.SMALL:
+            bs = list(zip(*other.a[:4, :m].tolist()))
+            hits = [(i, j) for i, (ax, ay, aw, ah) in enumerate(zip(*self.a[:4, :n].tolist()))
+                    for j, (bx, by, bw, bh) in enumerate(bs) if ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah]
+            self._room(len(hits)); f = self.found
+            for t, (i, j) in enumerate(hits): f[0, t] = i; f[1, t] = j
+            return f[0, :len(hits)], f[1, :len(hits)]
+        a, b = self.by_y(), other.by_y()
+        if other.blk is None:
+            size = self.BAND * other.cap
+            other.blk = (np.zeros(size, bool), np.zeros(size, bool), np.zeros(size, np.intp), np.zeros(size, np.intp), np.zeros(size, np.intp))
+        tall_a, tall_b = int(a[3].max()), int(b[3].max())
+        ys = b[1]; total = 0
+        for i0 in range(0, n, self.BAND):
+            i1 = min(n, i0 + self.BAND)
+            # other's entities with y in (first y - tallest of other, last y + tallest of self)
+            j0 = int(ys.searchsorted(int(a[1, i0]) - tall_b, "right")); j1 = int(ys.searchsorted(int(a[1, i1-1]) + tall_a, "left"))
+            if j0 >= j1: continue
+            k, c = i1 - i0, j1 - j0
+            # whole (k, c) blocks: copyto spreads a column or a row into them without the
+            # buffer a broadcasting ufunc into a 2-D out would allocate
+            hit, cmp, A, B = (v[:k*c].reshape(k, c) for v in other.blk[:4])
+            ra, rb = self.t[:k], other.t[:c]
+            hit.fill(True)
+            for r in (0, 1):   # x, then y: a[r] < b[r] + b[r+2] and b[r] < a[r] + a[r+2]
+                np.add(b[r, j0:j1], b[r+2, j0:j1], out=rb)
+                np.copyto(A, a[r, i0:i1, None]); np.copyto(B, rb); np.less(A, B, out=cmp); hit &= cmp
+                np.add(a[r, i0:i1], a[r+2, i0:i1], out=ra)
+                np.copyto(A, ra[:, None]); np.copyto(B, b[r, j0:j1]); np.less(B, A, out=cmp); hit &= cmp
+            cnt = int(np.count_nonzero(hit))
+            if not cnt: continue
+            # pack the hits' indices into found[:, total:total+cnt], the rest into its dump slot
+            self._room(total + cnt); f = self.found; pos = other.blk[4][:k*c]
+            self._slots(hit.ravel(), pos, cmp.ravel(), total, f.shape[1] - 1)
+            np.copyto(A, a[4, i0:i1, None]); np.put(f[0], pos, A)
+            np.copyto(B, b[4, j0:j1]); np.put(f[1], pos, B)
+            total += cnt
+        return self.found[0, :total], self.found[1, :total]
+
+# frame-time instrumentation
+class FrameProfiler:
+    """
+    Per-frame timings of each phase of Director.frame while a game is on top, kept in a
+    rolling window for p50/p95/p99, plus counters for frames whose work overran the budget and frames
+    whose interval was over 1.5 budgets (a missed refresh). F3 toggles the overlay.
+    With trace_path set, every frame is also kept and export() writes it as .csv or
+    .json (per-game percentile summary + frames), once, from quit_game().
+
+    Input-to-present latency is kept per game (across sessions): from when each key event
+    was taken from SDL to the present of the frame that simulated it. pygame events carry
+    no timestamp, so an event that arrived while the previous frame was working is
+    under-measured by up to that frame's work time.
+    """
+    PHASES = ("events","update","draw","fx_update","fx_draw","overlay","present","capture")
+    def __init__(self, window=600, budget_ms=1000.0/FPS, trace_path=None):
+        self.window = window; self.budget = budget_ms
+        self.trace_path = trace_path; self.trace = []
+        self.latency = {}   # game -> deque of input-to-present ms
+        self.show = False
+        self.start("-")
+
+    def start(self, game):
+        # fresh rolling window for each game session
+        self.game = game
+        self.hist = {p: deque(maxlen=self.window) for p in self.PHASES + ("work","interval")}
+        self.hist["input"] = self.latency.setdefault(game, deque(maxlen=self.window))
+        self.frames = self.over = self.dropped = 0
+        self.lines = []; self.panel = None
+
+    def begin(self, interval_ms):
+        self.interval = interval_ms
+        self.cur = {}
+        self.t = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.cur[phase] = (now - self.t) * 1000.0
+        self.t = now
+
+    def inputs(self, stamps):
+        # the frame holding these input events was just presented
+        now = time.perf_counter()
+        self.hist["input"].extend((now - t) * 1000.0 for t in stamps)
+
+    def end(self):
+        cur = self.cur; hist = self.hist
+        work = sum(cur.values())
+        for p, v in cur.items(): hist[p].append(v)
+        hist["work"].append(work); hist["interval"].append(self.interval)
+        self.frames += 1
+        if work > self.budget:
+            self.over += 1
+            if TELEMETRY: TELEMETRY.emit("budget", self.game, round(work, 2), round(self.budget, 2))
+        if self.interval > self.budget * 1.5: self.dropped += 1
+        if self.trace_path:
+            self.trace.append((self.game, self.interval, work) + tuple(cur.get(p, 0.0) for p in self.PHASES))
+
+    @staticmethod
+    def pct(vals, *qs):
+        vals = sorted(vals)
+        if not vals: return [0.0]*len(qs)
+        return [vals[min(len(vals)-1, int(q/100.0*len(vals)))] for q in qs]
+
+    def draw(self, surf):
+        # text is rebuilt twice a second; the panel is repainted every frame
+        if self.frames % 30 == 0 or not self.lines:
+            self.lines = [f"{p:<10}{a:6.2f}{b:6.2f}{c:6.2f}" for p in ("interval","work") + self.PHASES + ("input",)
+                          for a, b, c in [self.pct(self.hist[p], 50, 95, 99)]]
+            self.lines.append(f"over {self.over}  dropped {self.dropped}  / {self.frames}")
+        lh = FONT.get_linesize()
+        self.panel = pygame.Rect(8, 60, 290, lh * (len(self.lines) + 1) + 8)
+        surf.fill((0,0,0), self.panel)
+        draw_text(surf, f"{self.game}  ms p50 p95 p99", 14, 64, FONT, COLS["accent"])
+        for i, line in enumerate(self.lines):
+            draw_text(surf, line, 14, 64 + lh*(i+1), FONT, COLS["white"], glyphs=True)
+        return self.panel
+
+    def export(self, path=None):
+        path = Path(path or self.trace_path or "")
+        if not self.trace or not path.name: return
+        cols = ("game","interval","work") + self.PHASES
+        try:
+            if path.suffix == ".csv":
+                with path.open("w") as f:
+                    f.write("frame," + ",".join(cols) + "\n")
+                    for i, row in enumerate(self.trace):
+                        f.write(f"{i},{row[0]}," + ",".join(f"{v:.3f}" for v in row[1:]) + "\n")
+            else:
+                summary = {}
+                for g in sorted({row[0] for row in self.trace}):
+                    rows = [row for row in self.trace if row[0] == g]
+                    summary[g] = {"frames": len(rows),
+                                  "over_budget": sum(1 for r in rows if r[2] > self.budget),
+                                  "dropped": sum(1 for r in rows if r[1] > self.budget * 1.5)}
+                    for j, c in enumerate(cols[1:], 1):
+                        summary[g][c] = dict(zip(("p50","p95","p99"), (round(v, 3) for v in self.pct([r[j] for r in rows], 50, 95, 99))))
+                for g, lat in self.latency.items():
+                    if lat and g in summary:
+                        summary[g]["input_latency"] = dict(zip(("p50","p95","p99"), (round(v, 3) for v in self.pct(lat, 50, 95, 99))))
+                path.write_text(json.dumps({"budget_ms": self.budget, "columns": cols, "summary": summary,
+                                            "frames": [[row[0]] + [round(v, 3) for v in row[1:]] for row in self.trace]}))
+        except Exception:
+            pass
+
+PROFILER = FrameProfiler()
+
+# adaptive quality: steps down through tiers when game frames run over budget
+class Governor:
+    """
+    Watches the work time (everything but the wait for the next frame) of game frames.
+    When the p90 of a window passes 90% of the budget it steps one tier down TIERS; after
+    three windows in a row under 50% it steps back up. Changes are printed to stderr and
+    kept in self.log. "quality_tier" in arcade_settings.json (a tier name or index) pins
+    the cabinet to one tier and turns the adapting off; any other value is warned about
+    and ignored.
+    """
+    # name, particle cap, flat shapes (no border radius), render fps (simulation stays at STEP_MS)
+    TIERS = (("full", Particles.CAP, False, FPS),
+             ("fewer-fx", 512, False, FPS),
+             ("flat", 128, True, FPS),
+             ("half-rate", 64, True, FPS // 2))
+
+    def __init__(self, window=60, budget_ms=1000.0/FPS):
+        self.window = window; self.budget = budget_ms
+        self.work = []; self.calm = 0
+        self.tier = 0; self.pinned = None
+        self.log = []   # (unix time, from tier, to tier, reason)
+
+    def configure(self, settings):
+        t = settings.get("quality_tier")
+        names = [tier[0] for tier in self.TIERS]
+        try:
+            self.pinned = None if t is None else names.index(t) if t in names else max(0, min(len(names)-1, int(t)))
+        except (TypeError, ValueError):
+            print(f"arcade: ignoring quality_tier {t!r} in settings (not one of {', '.join(names)} or 0-{len(names)-1}); adapting", file=sys.stderr)
+            self.pinned = t = None
+        self.set(self.pinned or 0, "pinned in settings" if t is not None else "default")
+
+    @property
+    def fps(self): return self.TIERS[self.tier][3]
+
+    def start(self):
+        # new game: fresh window, the tier carries over (same cabinet, same hardware)
+        self.work = []; self.calm = 0
+
+    def observe(self, work_ms):
+        if self.pinned is not None: return
+        self.work.append(work_ms)
+        if len(self.work) < self.window: return
+        p90 = FrameProfiler.pct(self.work, 90)[0]; self.work = []
+        if p90 > self.budget * 0.9 and self.tier < len(self.TIERS) - 1:
+            self.calm = 0; self.set(self.tier + 1, f"p90 work {p90:.1f} ms")
+        elif p90 < self.budget * 0.5 and self.tier:
+            self.calm += 1
+            if self.calm >= 3: self.calm = 0; self.set(self.tier - 1, f"p90 work {p90:.1f} ms")
+        else:
+            self.calm = 0
+
+    def set(self, tier, why):
+        name, cap, flat, fps = self.TIERS[tier]
+        particles.limit = cap
+        SPRITES.set_flat(flat)
+        if tier != self.tier:
+            self.log.append((int(time.time()), self.TIERS[self.tier][0], name, why))
+            print(f"arcade: quality {self.TIERS[self.tier][0]} -> {name} ({why})", file=sys.stderr)
+        self.tier = tier
+
+GOVERNOR = Governor()
+
+# ---------- Input ----------
+# Games see actions, not keys: BaseGame.feed() maps key events through an action map built
+# from SETTINGS["keys"] and calls action(name, down); BaseGame.held is the set of actions
+# down now, for games that poll. Recordings store the same actions (bit i = ACTIONS[i]).
+ACTIONS = ("left","right","up","down","shoot","pause","enter","escape")
+INPUT_EVENTS = (pygame.KEYDOWN, pygame.KEYUP)
+
+def action_map(keys=None):
+    """key code -> action name"""
+    keys = SETTINGS["keys"] if keys is None else keys
+    return {k: a for a, k in keys.items() if a in ACTIONS}
+
+class Repeat:
+    """
+    DAS/ARR auto-repeat of a held action on the game clock (so replays repeat it exactly):
+    the press acts at once, holding acts again `das` ms later and then every `arr` ms.
+    """
+    def __init__(self, das, arr):
+        self.das = das; self.arr = arr; self.next = None
+    def __repr__(self): return f"Repeat({self.next})"   # state_checksum reads this
+    def press(self, t): self.next = t + self.das
+    def release(self): self.next = None
+    def due(self, t):
+        """repeats owed by time t"""
+        if self.next is None or t < self.next: return 0
+        n = 1 + int((t - self.next) // self.arr)
+        self.next += n * self.arr
+        return n
+
+# ---------- Scenes ----------
+class Scene:
+    """
+    One screen on the Director's stack. Only the top scene runs: each frame it gets
+    begin(dt_ms), every event through event(), then tick(dt_ms) and draw(surf). draw
+    returns None to flip the whole frame, a list of dirty rects, or [] if nothing changed.
+    fps = 0 marks an idle scene: the Director sleeps until an event or wake_ms() runs out.
+    """
+    name = "Scene"
+    fps = FPS
+    profile = False   # time this scene's frames with PROFILER (F3 overlay)
+    particles = NullParticles()
+    def enter(self): pass    # pushed
+    def leave(self): pass    # popped, or the app is quitting
+    def resume(self): self.invalidate()   # uncovered again by a pop
+    def wake_ms(self): return None   # idle scenes: ms until a frame is wanted without input
+    def begin(self, dt_ms): pass
+    def event(self, ev): pass
+    def tick(self, dt_ms): pass
+    def draw(self, surf): return []
+    def invalidate(self):
+        # something outside draw() painted over the screen; retained renderers repaint in full
+        pass
+
+class Director:
+    """
+    The scene stack and the one frame loop. Pacing (pace(), or event.wait for idle
+    scenes), QUIT/F3/exposure handling, event dispatch, particles, the profiler overlay
+    and presenting the frame all happen here, for every scene.
+    """
+    wake_on_input = True   # pace() ends the frame wait early for input (off: fixed pacing, for bench_input)
+
+    def __init__(self):
+        self.stack = []
+        self.dt_ms = 0
+        self.t_frame = time.perf_counter() * 1000   # start of the current frame, ms
+
+    @property
+    def top(self): return self.stack[-1] if self.stack else None
+
+    def push(self, scene):
+        self.stack.append(scene); scene.enter()
+
+    def pop(self):
+        scene = self.stack.pop(); scene.leave()
+        if self.stack: self.stack[-1].resume()
+        return scene
+
+    def quit(self):
+        while self.stack: self.stack.pop().leave()
+        quit_game()
+
+    def run(self):
+        while self.stack: self.frame()
+
+    def pace(self, fps):
+        """
+        Wait for the next frame of a `fps` scene inside event.wait, so input is sampled
+        right before simulating: a key event ends the wait early (no sooner than half a
+        period after the last frame) and is simulated and presented at once instead of
+        sitting out the frame. -> [(event, perf_counter() when it was taken from SDL)]
+        """
+        period = 1000.0 / fps
+        due = self.t_frame + period; early = self.t_frame + period / 2
+        got = []; keyed = False
+        while True:
+            for ev in pygame.event.get():
+                got.append((ev, time.perf_counter())); keyed |= ev.type in INPUT_EVENTS
+            now = time.perf_counter() * 1000
+            until = early if keyed and self.wake_on_input else due
+            if now >= until: return got
+            ev = pygame.event.wait(max(1, int(until - now)))
+            if ev.type != pygame.NOEVENT:
+                got.append((ev, time.perf_counter())); keyed |= ev.type in INPUT_EVENTS
+
+    def clock(self):
+        # whole-ms frame time (what recordings store); the fraction carries into the next frame
+        dt = int(time.perf_counter() * 1000 - self.t_frame)
+        self.t_frame += dt
+        return dt
+
+    def frame(self):
+        top = self.stack[-1]
+        fps = min(top.fps, GOVERNOR.fps) if top.profile else top.fps
+        if fps:
+            events = self.pace(fps)
+        else:
+            wake = top.wake_ms()
+            ev = pygame.event.wait() if wake is None else pygame.event.wait(max(1, int(wake)))
+            t = time.perf_counter()
+            events = [] if ev.type==pygame.NOEVENT else [(e, t) for e in [ev] + pygame.event.get()]
+        dt_ms = self.clock()
+        t_work = time.perf_counter()
+        self.dt_ms = dt_ms
+        prof = PROFILER
+        timed = top.profile
+        mark = prof.mark if timed else (lambda phase: None)
+        if timed: prof.begin(dt_ms)
+        top.begin(dt_ms)
+        stamps = []
+        for ev, t in events:
+            if ev.type in INPUT_EVENTS: stamps.append(getattr(ev, "t", t))   # posted events may carry their own stamp
+            if ev.type==pygame.QUIT:
+                self.quit()
+            if ev.type==pygame.KEYDOWN and ev.key==pygame.K_F3:
+                prof.show = not prof.show; top.invalidate()
+                continue
+            if ev.type==pygame.KEYDOWN and ev.key==pygame.K_F9 and CAPTURE:
+                CAPTURE.save_clip(top.name.replace(" ", "_"))
+                continue
+            if ev.type==pygame.WINDOWEXPOSED: top.invalidate()
+            top.event(ev)
+            if self.top is not top: return   # pushed or popped: the rest of the frame is the new top's
+        mark("events")
+        top.tick(dt_ms)
+        if self.top is not top: return
+        mark("update")
+        rects = top.draw(SCREEN)
+        mark("draw")
+        top.particles.update(dt_ms / 1000.0)
+        mark("fx_update")
+        top.particles.draw(SCREEN)
+        mark("fx_draw")
+        if timed and prof.show:
+            panel = prof.draw(SCREEN)
+            if rects is not None: rects.append(panel)
+        mark("overlay")
+        if rects is None: pygame.display.flip()
+        elif rects: pygame.display.update(rects)
+        mark("present")
+        if timed and stamps: prof.inputs(stamps)
+        if CAPTURE and timed: CAPTURE.grab(SCREEN)
+        mark("capture")
+        if timed:
+            prof.end()
+            GOVERNOR.observe((time.perf_counter() - t_work) * 1000.0)
+
+DIRECTOR = Director()
+
+# BaseGame: a scene that plays one game
+class BaseGame(Scene):
+    name = "Base"
+    profile = True
+    fps = FPS        # render rate (--fps); the simulation always steps at STEP_MS
+    MAX_STEPS = 5    # catch-up steps per frame after a hitch; time beyond that is dropped
+    acc = 0.0        # simulated time owed, under one step
+    alpha = 1.0      # where this frame sits between the last two steps, for draw() to interpolate
+    rec = None   # InputRecorder while a recorded session is on the Director's stack
+    telemetry = None   # TELEMETRY while a played session is on the Director's stack (not demo or headless games)
+    def __init__(self, difficulty="Normal", clock=None, seed=None):
+        self.difficulty = difficulty
+        self.clock = clock or SimClock()
+        self.seed = seed if seed is not None else random.randrange(2**63)
+        self.rng = random.Random(self.seed)
+        self.particles = particles
+        self.keymap = action_map()
+        self.held = set()   # actions currently down, tracked from events instead of key.get_pressed()
+        self.paused = False
+        self.game_over = False
+        self.score = 0
+    def feed(self, ev):
+        a = self.keymap.get(getattr(ev, "key", None))
+        if a is None or ev.type not in (pygame.KEYDOWN, pygame.KEYUP): return
+        down = ev.type==pygame.KEYDOWN
+        if down and a in self.held: self.action(a, False)   # pressed again with no release seen: release first, as replays do
+        if down: self.held.add(a)
+        else: self.held.discard(a)
+        self.action(a, down)
+    def action(self, a, down): pass
+    def update(self, dt): pass
+    def draw(self, surf):
+        # return None to have the whole frame flipped, or a list of dirty rects for display.update()
+        pass
+
+    def advance(self, dt_ms):
+        """
+        Fixed-step simulation: one update(STEP_MS) per whole step in the time carried over
+        plus dt_ms, so game speed does not depend on the render rate. Moving things are
+        drawn between their last two positions by alpha (1.0 while nothing moves).
+        """
+        self.acc = min(self.acc + dt_ms, STEP_MS * self.MAX_STEPS)
+        while self.acc >= STEP_MS:
+            self.clock.advance(STEP_MS)
+            self.acc -= STEP_MS
+            if not self.paused and not self.game_over:
+                self.update(STEP_MS)
+        self.alpha = 1.0 if self.paused or self.game_over else self.acc / STEP_MS
+
+    def lerp(self, a, b):
+        return a + (b - a) * self.alpha
+
+    def note(self, kind, a=0, b=0):
+        if self.telemetry: self.telemetry.emit(kind, self.name, a, b)
+
+    # scene hooks: the Director drives a session through these
+    def enter(self):
+        PROFILER.start(self.name); GOVERNOR.start()
+        self.rec = InputRecorder(self) if RECORD_DIR else None
+        self.telemetry = TELEMETRY
+        self.note("start", self.difficulty, self.seed)
+    def leave(self):
+        if self.rec: self.rec.end(DIRECTOR.dt_ms); self.rec = None
+        self.note("end", self.score, round(self.clock.ms / 1000.0, 1)); self.telemetry = None
+    def event(self, ev):
+        # universal escape returns to menu; the score so far counts
+        if ev.type==pygame.KEYDOWN and self.keymap.get(ev.key) == "escape":
+            if self.score:
+                if CAPTURE and self.score > LEADERBOARD.best(self.name):   # new record: keep the run
+                    CAPTURE.save_clip(f"{self.name.replace(' ', '_')}-{self.score}")
+                submit_score(self.name, self.score)
+            DIRECTOR.pop()
+            return
+        if self.rec: self.rec.key(ev)
+        self.feed(ev)
+    def tick(self, dt_ms):
+        if self.rec: self.rec.frame(dt_ms)
+        self.advance(dt_ms)
+        if STREAM: STREAM.publish(self)
+
+# ---------- TETRIS (works already) ----------
+class TetrisView:
+    """
+    Retained-mode Tetris renderer. Background, panel and locked cells live on a cached
+    canvas and only cells that changed since the last frame are repainted onto it. Each
+    frame restores the area under the old falling piece, draws the new one and the HUD
+    if it changed, and returns just those rects. Falls back to a full frame (None) on
+    the first draw, on pause/game-over changes and while particles are on screen.
+    """
+    EMPTY = (8,10,18)
+    def __init__(self, game):
+        self.g = game
+        self.canvas = pygame.Surface((WIDTH, HEIGHT))
+        if pygame.display.get_surface(): self.canvas = self.canvas.convert()
+        self.shadow = None      # board as last painted onto the canvas
+        self.piece = None; self.piece_rect = None
+        self.hud = None; self.hud_rect = None
+        self.state = None
+        self.fx = False
+
+    def cell_rect(self, r, c):
+        g = self.g
+        return pygame.Rect(g.gx + c*g.cell, g.gy + r*g.cell, g.cell-1, g.cell-1)
+
+    def paint_cell(self, r, c, v):
+        pygame.draw.rect(self.canvas, self.g.colors[v-1] if v else self.EMPTY, self.cell_rect(r, c))
+
+    def paint_canvas(self):
+        g = self.g
+        self.canvas.fill(COLS["bg"])
+        pygame.draw.rect(self.canvas, COLS["panel"], (g.gx-6,g.gy-6,g.cols*g.cell+12,g.rows*g.cell+12), border_radius=6)
+        for r in range(g.rows):
+            for c in range(g.cols): self.paint_cell(r, c, g.board[r][c])
+        self.shadow = [row[:] for row in g.board]
+
+    def sync(self):
+        # repaint cells that differ from the canvas (lock, line clears); returns the changed area
+        dirty = None
+        for r, (row, old) in enumerate(zip(self.g.board, self.shadow)):
+            if row == old: continue
+            for c, (v, o) in enumerate(zip(row, old)):
+                if v != o:
+                    self.paint_cell(r, c, v)
+                    cr = self.cell_rect(r, c)
+                    dirty = cr if dirty is None else dirty.union(cr)
+            self.shadow[r] = row[:]
+        return dirty
+
+    def draw_piece(self, surf):
+        g = self.g; cur = g.cur; rect = None
+        for r,row in enumerate(cur["shape"]):
+            for c,v in enumerate(row):
+                if v:
+                    cr = self.cell_rect(cur["y"]+r, cur["x"]+c)
+                    pygame.draw.rect(surf, g.colors[cur["val"]-1], cr)
+                    rect = cr if rect is None else rect.union(cr)
+        return rect
+
+    def draw_hud(self, surf):
+        g = self.g
+        return draw_text(surf, f"TETRIS  Score:{g.score}  Level:{g.level}", WIDTH//2, 34, BIG, COLS["white"], center=True, glyphs=True)
+
+    def draw(self, surf):
+        g = self.g
+        if self.shadow is None: self.paint_canvas(); changed = None
+        else: changed = self.sync()
+        cur = g.cur
+        piece = (cur["x"], cur["y"], cur["val"], tuple(map(tuple, cur["shape"])))
+        hud = (g.score, g.level)
+        state = (g.paused, g.game_over)
+        fx = len(g.particles) > 0
+        if self.state != state or fx or self.fx:
+            # full frame
+            self.state = state; self.fx = fx
+            surf.blit(self.canvas, (0,0))
+            self.hud = hud; self.hud_rect = self.draw_hud(surf)
+            self.piece = piece; self.piece_rect = self.draw_piece(surf)
+            if g.paused:
+                draw_text(surf, "PAUSED - press P", WIDTH//2, HEIGHT-40, FONT, COLS["accent"], center=True)
+            if g.game_over:
+                draw_text(surf, "GAME OVER - press Esc to return to menu", WIDTH//2, HEIGHT-40, FONT, COLS["danger"], center=True)
+            return None
+        dirty = []
+        if changed:
+            surf.blit(self.canvas, changed, changed); dirty.append(changed)
+        if changed or piece != self.piece:
+            if self.piece_rect:
+                surf.blit(self.canvas, self.piece_rect, self.piece_rect); dirty.append(self.piece_rect)
+            self.piece = piece; self.piece_rect = self.draw_piece(surf)
+            if self.piece_rect: dirty.append(self.piece_rect)
+        if hud != self.hud:
+            surf.blit(self.canvas, self.hud_rect, self.hud_rect); dirty.append(self.hud_rect)
+            self.hud = hud; self.hud_rect = self.draw_hud(surf); dirty.append(self.hud_rect)
+        return dirty
+
+class Tetris(BaseGame):
+    """
+    Tetris - Left/Right/Up/Down, Space hard drop, P pause
+    """
+    name = "Tetris"
+    def __init__(self,difficulty="Normal",clock=None,seed=None):
+        super().__init__(difficulty,clock,seed)
+        self.cols, self.rows = 10, 20
+        self.cell = 28
+        self.gx = (WIDTH - self.cols*self.cell)//2
+        self.gy = 90
+        self.board = [[0]*self.cols for _ in range(self.rows)]
+        self.pieces = [
+            [[1,1,1,1]], [[1,1],[1,1]], [[0,1,0],[1,1,1]],
+            [[0,1,1],[1,1,0]], [[1,1,0],[0,1,1]],
+            [[1,0,0],[1,1,1]], [[0,0,1],[1,1,1]]
+        ]
+        self.colors = [(80,200,250),(240,200,60),(200,120,240),(100,240,120),(240,100,100),(80,120,240),(240,150,60)]
+        self.view = None   # TetrisView, created on first draw
+        self.spawn()
+        base = {"Easy":700,"Normal":450,"Hard":260}
+        self.gravity = base.get(difficulty,450)
+        self.lastfall = self.clock.ticks()
+        self.score = 0; self.level = 1
+        self.shift_dir = None   # left/right auto-repeating (the one pressed last)
+        self.das = Repeat(170, 50); self.drop_rep = Repeat(50, 50)
+
+    def spawn(self):
+        shape = [row[:] for row in self.rng.choice(self.pieces)]
+        val = self.rng.randint(1,7)
+        self.cur = {"shape":shape,"x":self.cols//2 - len(shape[0])//2,"y":-1,"val":val}
+
+    def rotate(self,s):
+        return [list(row) for row in zip(*s[::-1])]
+
+    def valid(self,shape,x,y):
+        for r,row in enumerate(shape):
+            for c,v in enumerate(row):
+                if v:
+                    xx,yy = x+c,y+r
+                    if xx<0 or xx>=self.cols or yy>=self.rows: return False
+                    if yy>=0 and self.board[yy][xx]: return False
+        return True
+
+    # piece moves; BitTetris overrides these with mask operations
+    def fits(self, dx, dy):
+        return self.valid(self.cur["shape"], self.cur["x"]+dx, self.cur["y"]+dy)
+
+    def try_rotate(self):
+        r = self.rotate(self.cur["shape"])
+        if self.valid(r, self.cur["x"], self.cur["y"]): self.cur["shape"] = r
+
+    def drop_distance(self):
+        d = 0
+        while self.fits(0, d+1): d += 1
+        return d
+
+    def lock(self):
+        s=self.cur
+        for r,row in enumerate(s["shape"]):
+            for c,v in enumerate(row):
+                if v:
+                    yy = s["y"]+r; xx = s["x"]+c
+                    if 0<=yy<self.rows: self.board[yy][xx]=s["val"]
+                    else: self.game_over=True
+        if self.game_over: self.note("death", s["x"], s["y"])
+        # clear lines
+        cleared=0
+        new=[]
+        for row in self.board:
+            if all(row): cleared+=1
+            else: new.append(row)
+        for _ in range(cleared): new.insert(0,[0]*self.cols)
+        self.board=new
+        if cleared:
+            self.score += cleared*100
+            self.level = 1 + self.score//700
+            self.note("lines", cleared, self.score)
+            self.particles.emit(WIDTH//2, self.gy+40, n=18)
+        self.spawn()
+
+    def shift(self, dx):
+        if self.fits(dx, 0): self.cur["x"] += dx
+
+    def soft_drop(self):
+        if self.fits(0, 1): self.cur["y"] += 1; self.score += 1
+
+    def action(self, a, down):
+        now = self.clock.ticks()
+        if not down:
+            # releasing one direction hands auto-repeat back to the other if it is still held
+            if a in ("left", "right") and a == self.shift_dir:
+                other = "right" if a == "left" else "left"
+                self.shift_dir = other if other in self.held else None
+                if self.shift_dir: self.das.press(now)
+            if a == "down": self.drop_rep.release()
+            return
+        if a=="pause":
+            self.paused = not self.paused
+        if self.paused or self.game_over: return
+        if a in ("left", "right"):
+            self.shift(-1 if a=="left" else 1); self.shift_dir = a; self.das.press(now)
+        if a=="up": self.try_rotate()
+        if a=="down": self.soft_drop(); self.drop_rep.press(now)
+        if a=="shoot": # hard drop
+            self.cur["y"] += self.drop_distance()
+            self.lock()
+
+    def update(self, dt):
+        now = self.clock.ticks()
+        if self.shift_dir:
+            for _ in range(self.das.due(now)): self.shift(-1 if self.shift_dir=="left" else 1)
+        if "down" in self.held:
+            for _ in range(self.drop_rep.due(now)): self.soft_drop()
+        if now - self.lastfall >= self.gravity:
+            if self.fits(0, 1):
+                self.cur["y"] += 1
+            else:
+                self.lock()
+            self.lastfall = now
+
+    def draw(self,surf):
+        if self.view is None: self.view = TetrisView(self)
+        return self.view.draw(surf)
+
+    def invalidate(self):
+        if self.view: self.view.state = None
+
+class BitTetris(Tetris):
+    """
+    Tetris on a bitboard: one int per row (bit c = column c filled) and all 7 pieces x 4
+    rotations precomputed as per-row masks, so collision, drop distance and line clears
+    are bitwise ops. self.board keeps the colours for drawing and is only touched on lock.
+    Same RNG draws, same rotations, same scoring as Tetris for the same inputs.
+    """
+    tables = None   # per piece kind: 4 x (shape, row masks, width)
+
+    def __init__(self,difficulty="Normal",clock=None,seed=None):
+        super().__init__(difficulty,clock,seed)
+        self.bits = [0]*self.rows
+        self.full = (1 << self.cols) - 1
+
+    @classmethod
+    def build_tables(cls, pieces):
+        tables = []
+        for shape in pieces:
+            rots = []
+            for _ in range(4):
+                masks = tuple(sum(1 << c for c,v in enumerate(row) if v) for row in shape)
+                rots.append((shape, masks, len(shape[0])))
+                shape = [list(row) for row in zip(*shape[::-1])]
+            tables.append(rots)
+        cls.tables = tables
+
+    def spawn(self):
+        if BitTetris.tables is None: BitTetris.build_tables(self.pieces)
+        kind = self.rng.choice(range(len(self.pieces)))   # same draw as rng.choice(self.pieces)
+        val = self.rng.randint(1,7)
+        shape = self.tables[kind][0][0]
+        self.cur = {"shape":shape,"x":self.cols//2 - len(shape[0])//2,"y":-1,"val":val,"kind":kind,"rot":0}
+
+    def hits(self, masks, w, x, y):
+        if x < 0 or x + w > self.cols: return True
+        bits = self.bits
+        for i, m in enumerate(masks):
+            yy = y + i
+            if yy >= self.rows: return True
+            if yy >= 0 and bits[yy] & (m << x): return True
+        return False
+
+    def valid(self, shape, x, y):
+        masks = [sum(1 << c for c,v in enumerate(row) if v) for row in shape]
+        return not self.hits(masks, len(shape[0]), x, y)
+
+    def fits(self, dx, dy):
+        cur = self.cur
+        _, masks, w = self.tables[cur["kind"]][cur["rot"]]
+        return not self.hits(masks, w, cur["x"]+dx, cur["y"]+dy)
+
+    def try_rotate(self):
+        cur = self.cur
+        rot = (cur["rot"] + 1) % 4
+        shape, masks, w = self.tables[cur["kind"]][rot]
+        if not self.hits(masks, w, cur["x"], cur["y"]):
+            cur["rot"] = rot; cur["shape"] = shape
+
+    def lock(self):
+        s = self.cur
+        _, masks, _ = self.tables[s["kind"]][s["rot"]]
+        x, y, val = s["x"], s["y"], s["val"]
+        bits, board = self.bits, self.board
+        for i, m in enumerate(masks):
+            yy = y + i
+            if 0 <= yy < self.rows:
+                bits[yy] |= m << x
+                row = board[yy]
+                for c,v in enumerate(s["shape"][i]):
+                    if v: row[x+c] = val
+            else: self.game_over = True
+        if self.game_over: self.note("death", x, y)
+        # clear lines: only rows the piece touched can have filled up
+        cleared = sum(1 for yy in range(max(0, y), min(self.rows, y + len(masks))) if bits[yy] == self.full)
+        if cleared:
+            keep = [r for r in range(self.rows) if bits[r] != self.full]
+            self.bits = [0]*cleared + [bits[r] for r in keep]
+            self.board = [[0]*self.cols for _ in range(cleared)] + [board[r] for r in keep]
+            self.score += cleared*100
+            self.level = 1 + self.score//700
+            self.note("lines", cleared, self.score)
+            self.particles.emit(WIDTH//2, self.gy+40, n=18)
+        self.spawn()
+
+# ---------- Brick Breaker ----------
+class BrickBreaker(BaseGame):
+    """
+    Brick Breaker - Left/Right move, Space to launch, P pause
+    """
+    name = "Brick Breaker"
+    BRICK_COLORS = [(180 - i*10, 80 + i*12, 100 + i*6) for i in range(6)]
+    def __init__(self,difficulty="Normal",clock=None,seed=None):
+        super().__init__(difficulty,clock,seed)
+        self.pw, self.ph = 120, 14
+        self.px = WIDTH//2 - self.pw//2
+        self.py = HEIGHT - 90
+        self.ball = [WIDTH//2, self.py - 12]
+        self.ball_r = 9
+        self.ball_v = [4, -5] if difficulty!="Hard" else [5, -7]
+        self.launch = False
+        self.lives = 3
+        self.score = 0
+        self.prev = None   # (paddle x, ball x, ball y) before the last update, for interpolation
+        self.drawn = (None, [])   # (key, brick blit list) cached between frames
+        self.make_level()
+
+    def make_level(self, cols=9, rows=6, bh=20, gap=6, pitch_y=28):
+        # bricks sit on a regular grid, so self.bricks is keyed by (row, col) and a point maps
+        # straight to its cell; big cols/rows give the stress levels (see stress_bricks)
+        self.bricks = {}
+        self.bcols, self.brows = cols, rows
+        margin = 80
+        bw = (WIDTH - 2*margin)//cols - gap
+        self.bx0, self.by0 = margin, 80
+        self.bpx, self.bpy = bw + gap, pitch_y
+        self.bsize = (int(bw), bh)
+        for r in range(rows):
+            for c in range(cols):
+                x = margin + c*(bw+gap)
+                y = 80 + r*pitch_y
+                self.bricks[(r, c)] = pygame.Rect(int(x), int(y), int(bw), bh)
+
+    def sweep(self, x, y, dx, dy):
+        """
+        Earliest brick the ball hits moving (dx, dy) from (x, y), as (t, key, axis) with
+        t in [0, 1] and axis 0 for a side hit, 1 for top/bottom. Ray vs each brick grown by
+        the ball radius, only for bricks in the cells the swept box covers, so the cost
+        depends on ball speed and not on how many bricks the level has.
+        """
+        rad = self.ball_r
+        c0 = max(0, int((min(x, x+dx) - rad - self.bx0) // self.bpx))
+        c1 = min(self.bcols-1, int((max(x, x+dx) + rad - self.bx0) // self.bpx))
+        r0 = max(0, int((min(y, y+dy) - rad - self.by0) // self.bpy))
+        r1 = min(self.brows-1, int((max(y, y+dy) + rad - self.by0) // self.bpy))
+        best = None; bricks = self.bricks; inf = float("inf")
+        for row in range(r0, r1+1):
+            for col in range(c0, c1+1):
+                b = bricks.get((row, col))
+                if b is None: continue
+                if dx:
+                    t1 = (b.left - rad - x) / dx; t2 = (b.right + rad - x) / dx
+                    tx0, tx1 = min(t1, t2), max(t1, t2)
+                elif b.left - rad <= x <= b.right + rad: tx0, tx1 = -inf, inf
+                else: continue
+                if dy:
+                    t1 = (b.top - rad - y) / dy; t2 = (b.bottom + rad - y) / dy
+                    ty0, ty1 = min(t1, t2), max(t1, t2)
+                elif b.top - rad <= y <= b.bottom + rad: ty0, ty1 = -inf, inf
+                else: continue
+                t0 = max(tx0, ty0); t1 = min(tx1, ty1)
+                if t0 > t1 or t1 < 0 or t0 > 1: continue
+                axis = 0 if tx0 > ty0 else 1
+                if t0 < 0: t0, axis = 0.0, 1   # already touching: bounce vertically like before
+                if best is None or (t0, row, col) < best[:3]: best = (t0, row, col, axis)
+        return None if best is None else (best[0], (best[1], best[2]), best[3])
+
+    def action(self, a, down):
+        if not down: return
+        if a=="pause": self.paused = not self.paused
+        if a=="shoot" and not self.launch: self.launch = True
+        # escape handled by BaseGame.event()
+
+    def update(self, dt):
+        if self.paused or self.game_over: return
+        self.prev = (self.px, self.ball[0], self.ball[1])
+        if "left" in self.held: self.px -= 8
+        if "right" in self.held: self.px += 8
+        self.px = max(8, min(WIDTH - self.pw - 8, self.px))
+        if not self.launch:
+            self.ball[0] = self.px + self.pw//2
+            self.ball[1] = self.py - 12
+            return
+        # move ball, stopping at and bouncing off every brick on the way
+        y0 = self.ball[1]
+        left = 1.0
+        for _ in range(4):
+            dx, dy = self.ball_v[0]*left, self.ball_v[1]*left
+            hit = self.sweep(self.ball[0], self.ball[1], dx, dy)
+            if hit is None:
+                self.ball[0] += dx; self.ball[1] += dy
+                break
+            t, key, axis = hit
+            self.ball[0] += dx*t; self.ball[1] += dy*t
+            self.ball_v[axis] *= -1
+            b = self.bricks.pop(key)
+            self.score += 50
+            self.particles.emit(b.centerx, b.centery, n=12, color=(200,120,100))
+            left *= 1 - t
+        if self.ball[0] <= self.ball_r or self.ball[0] >= WIDTH - self.ball_r:
+            self.ball_v[0] *= -1
+        if self.ball[1] <= self.ball_r:
+            self.ball_v[1] *= -1
+        # paddle collision: the ball's bottom crossed or sits in the paddle band this frame
+        bottom = self.ball[1] + self.ball_r
+        if (self.px <= self.ball[0] < self.px + self.pw and y0 + self.ball_r < self.py + self.ph
+                and bottom >= self.py):
+            offset = (self.ball[0] - (self.px + self.pw/2)) / (self.pw/2)
+            self.ball_v[0] = offset * 6
+            self.ball_v[1] = -abs(self.ball_v[1])
+        # bottom
+        if self.ball[1] > HEIGHT + 20:
+            self.lives -= 1
+            self.note("death", int(self.ball[0]), int(self.py))
+            if self.lives <= 0:
+                self.game_over = True
+            else:
+                self.launch = False
+                self.ball_v = [4 * self.rng.choice((-1,1)), -5]
+
+    def draw(self,surf):
+        surf.fill((6,12,20))
+        draw_text(surf, f"Brick Breaker  Score:{self.score}  Lives:{self.lives}", WIDTH//2, 34, BIG, COLS["white"], center=True, glyphs=True)
+        px, bx, by = self.px, self.ball[0], self.ball[1]
+        if self.prev and abs(bx - self.prev[1]) < 64 and abs(by - self.prev[2]) < 64:   # no lerp across a respawn
+            px, bx, by = (self.lerp(a, b) for a, b in zip(self.prev, (px, bx, by)))
+        surf.blit(SPRITES.rect(self.pw, self.ph, COLS["accent"], 6), (int(px), self.py))
+        pygame.draw.circle(surf, COLS["white"], (int(bx), int(by)), self.ball_r)
+        # brick blit list: rebuilt only when a brick goes, the level changes or the sprites do
+        key = (id(self.bricks), len(self.bricks), SPRITES.gen)
+        if self.drawn[0] != key:
+            spr = [SPRITES.rect(*self.bsize, col, 6) for col in self.BRICK_COLORS]
+            self.drawn = (key, [(spr[(r*self.bcols + c) % 6], b) for (r,c),b in self.bricks.items()])
+        surf.blits(self.drawn[1], doreturn=False)
+        if self.paused:
+            draw_text(surf, "PAUSED - press P", WIDTH//2, HEIGHT-40, FONT, COLS["accent"], center=True)
+        if self.game_over:
+            draw_text(surf, "GAME OVER - press Esc to return to menu", WIDTH//2, HEIGHT-40, FONT, COLS["danger"], center=True)
+
+# ---------- Car Avoid ----------
+class CarAvoid(BaseGame):
+    """
+    Car Avoid - Left/Right to change lanes, avoid obstacles
+    """
+    name = "Car Avoid"
+    def __init__(self,difficulty="Normal",clock=None,seed=None):
+        super().__init__(difficulty,clock,seed)
+        self.lanes = 3
+        self.lw = WIDTH // self.lanes
+        self.player_lane = 1
+        self.player_y = HEIGHT - 160
+        self.obstacles = EntityPool(256)
+        self.spawn_ms = 800 if difficulty=="Normal" else (1100 if difficulty=="Easy" else 520)
+        self.last_spawn = self.clock.ticks()
+        self.speed = 4 if difficulty!="Hard" else 6
+        self.score = 0
+
+    def spawn(self):
+        lane = self.rng.randrange(self.lanes)
+        w = self.lw - 60
+        x = lane*self.lw + (self.lw - w)//2
+        self.obstacles.add(int(x), -90, int(w), 70)
+
+    def action(self, a, down):
+        if not down: return
+        if a=="pause": self.paused = not self.paused
+        if a=="left": self.player_lane = max(0, self.player_lane-1)
+        if a=="right": self.player_lane = min(self.lanes-1, self.player_lane+1)
+
+    def update(self, dt):
+        if self.paused or self.game_over: return
+        now = self.clock.ticks()
+        if now - self.last_spawn > self.spawn_ms:
+            self.spawn(); self.last_spawn = now
+            self.spawn_ms = max(250, int(self.spawn_ms*0.98))
+            self.speed = min(12, self.speed + 0.05)
+        self.obstacles.shift(0, int(self.speed + 0.5))   # whole pixels per step, as the Rects rounded
+        self.obstacles.cull(hi=HEIGHT+200)
+        px = self.player_lane*self.lw + self.lw//2
+        for _ in self.obstacles.overlap(px-28, self.player_y, 56, 100):
+            self.particles.emit(px, self.player_y + 50, n=20, color=(220,80,80))
+            self.game_over = True
+        if self.game_over: self.note("death", self.player_lane, self.player_y)
+        self.score += 1
+
+    def paint_road(self, surf):
+        surf.fill((10,20,10))
+        for i in range(1,self.lanes):
+            pygame.draw.line(surf, COLS["panel"], (i*self.lw,0), (i*self.lw,HEIGHT), 6)
+
+    def draw(self,surf):
+        surf.blit(SPRITES.layer(("road", self.lanes), self.paint_road), (0, 0))
+        draw_text(surf, f"Car Avoid  Score:{self.score}", WIDTH//2, 34, BIG, COLS["white"], center=True, glyphs=True)
+        px = self.player_lane*self.lw + self.lw//2
+        surf.blit(SPRITES.rect(56, 100, COLS["accent"], 8), (px-28, self.player_y))
+        oy = round(self.lerp(-self.speed, 0))   # obstacles all moved speed px in the last step
+        spr = SPRITES.rect(self.lw - 60, 70, COLS["danger"], 6)   # every obstacle is this size (see spawn)
+        n = self.obstacles.n
+        surf.blits([(spr, p) for p in zip(self.obstacles.x[:n].tolist(), (self.obstacles.y[:n] + oy).tolist())], doreturn=False)
+        if self.paused:
+            draw_text(surf, "PAUSED - press P", WIDTH//2, HEIGHT-40, FONT, COLS["accent"], center=True)
+        if self.game_over:
+            draw_text(surf, "CRASHED! Press Esc to menu", WIDTH//2, HEIGHT-40, FONT, COLS["danger"], center=True)
+
+# ---------- Snake ----------
+class FreeCells:
+    """
+    The free cells of a grid as a dense array plus a cell -> slot index. take/give swap
+    a cell across the free/used boundary, so occupancy checks, updates and sampling a
+    uniformly random free cell are all O(1) with no rejection loop.
+    """
+    def __init__(self, n):
+        self.cells = list(range(n))   # cells[:n] free, cells[n:] occupied
+        self.pos = list(range(n))
+        self.n = n
+    def __len__(self): return self.n
+    def is_free(self, c): return self.pos[c] < self.n
+    def _swap(self, c, i):
+        j = self.pos[c]; d = self.cells[i]
+        self.cells[i] = c; self.pos[c] = i
+        self.cells[j] = d; self.pos[d] = j
+    def take(self, c):
+        self.n -= 1; self._swap(c, self.n)
+    def give(self, c):
+        self._swap(c, self.n); self.n += 1
+    def sample(self, rng): return self.cells[rng.randrange(self.n)]
+
+class Snake(BaseGame):
+    """
+    Snake - Arrow keys to move, eat food to grow
+    """
+    name = "Snake"
+    def __init__(self, difficulty="Normal", clock=None, seed=None):
+        super().__init__(difficulty, clock, seed)
+        self.grid = 20
+        self.cols = WIDTH // self.grid
+        self.rows = (HEIGHT - 100) // self.grid
+        self.reset()
+
+    def reset(self):
+        self.snake = deque([(self.cols//2, self.rows//2)])
+        self.free = FreeCells(self.cols*self.rows)   # doubles as the body occupancy index
+        self.free.take(self.snake[0][1]*self.cols + self.snake[0][0])
+        self.dir = (1,0)
+        self.turns = deque()   # buffered turns, applied one per move
+        self.spawn_food()
+        self.score = 0
+        self.speed = 8 if self.difficulty!="Hard" else 12
+        self.last_move = self.clock.ticks()
+
+    def spawn_food(self):
+        if not self.free:   # board full - nothing left to eat
+            self.food = None; self.game_over = True
+            return
+        c = self.free.sample(self.rng)
+        self.food = (c % self.cols, c // self.cols)
+
+    TURNS = {"left": (-1,0), "right": (1,0), "up": (0,-1), "down": (0,1)}
+
+    def action(self, a, down):
+        if not down: return
+        if a=="pause": self.paused = not self.paused
+        d = self.TURNS.get(a)
+        if d is None: return
+        # buffer turns, one per move: two quick presses inside a tick (right, up, left) play
+        # out as two turns instead of the second reversing into the body
+        last = self.turns[-1] if self.turns else self.dir
+        if d != last and d != (-last[0], -last[1]) and len(self.turns) < 3: self.turns.append(d)
+
+    def update(self, dt):
+        if self.paused or self.game_over: return
+        now = self.clock.ticks()
+        if now - self.last_move > 1000//self.speed:
+            if self.turns: self.dir = self.turns.popleft()
+            head = self.snake[0]
+            nxt = ((head[0]+self.dir[0])%self.cols, (head[1]+self.dir[1])%self.rows)
+            c = nxt[1]*self.cols + nxt[0]
+            if not self.free.is_free(c):
+                self.game_over = True
+                self.note("death", nxt[0], nxt[1])
+            else:
+                self.snake.appendleft(nxt); self.free.take(c)
+                if nxt == self.food:
+                    self.score += 10
+                    self.spawn_food()
+                else:
+                    tx, ty = self.snake.pop()
+                    self.free.give(ty*self.cols + tx)
+            self.last_move = now
+
+    def draw(self,surf):
+        surf.fill((6,32,6))
+        draw_text(surf, f"Snake  Score:{self.score}", WIDTH//2, 34, BIG, COLS["white"], center=True, glyphs=True)
+        oy = 90; g = self.grid
+        body = SPRITES.rect(g-2, g-2, COLS["accent"], 4)
+        surf.blits([(body, (x*g, oy + y*g)) for x,y in self.snake], doreturn=False)
+        x, y = self.snake[0]
+        surf.blit(SPRITES.rect(g-2, g-2, (40,120,200), 4), (x*g, oy + y*g))   # head
+        if self.food:
+            pygame.draw.rect(surf, COLS["danger"], (self.food[0]*self.grid, oy + self.food[1]*self.grid, self.grid-2, self.grid-2))
+        if self.paused:
+            draw_text(surf, "PAUSED - press P", WIDTH//2, HEIGHT-40, FONT, COLS["accent"], center=True)
+        if self.game_over:
+            draw_text(surf, "GAME OVER - press Esc to return to menu", WIDTH//2, HEIGHT-40, FONT, COLS["danger"], center=True)
+
+# ---------- Space Shooter ----------
+class SpaceShooter(BaseGame):
+    """
+    Space Shooter - Left/Right to move, Space to shoot
+    """
+    name = "Space Shooter"
+    def __init__(self, difficulty="Normal", clock=None, seed=None):
+        super().__init__(difficulty, clock, seed)
+        self.player = pygame.Rect(WIDTH//2 - 20, HEIGHT-120, 40, 40)
+        self.bullets = EntityPool(512)
+        self.enemies = EntityPool(1024)
+        self.enemy_ms = 800 if difficulty!="Hard" else 420
+        self.last_enemy = self.clock.ticks()
+        self.prev_x = self.player.x   # player x before the last update, for interpolation
+        self.score = 0
+        self.lives = 3
+
+    def spawn_enemy(self):
+        x = self.rng.randint(40, WIDTH-80)
+        self.enemies.add(x, -40, 36, 36, vy=3)
+
+    def action(self, a, down):
+        if not down: return
+        if a=="pause": self.paused = not self.paused
+        if a=="shoot":
+            self.bullets.add(self.player.centerx-4, self.player.top-10, 8, 14, vy=-10)
+
+    def update(self, dt):
+        if self.paused or self.game_over: return
+        self.prev_x = self.player.x
+        speed = 280
+        if "left" in self.held: self.player.x -= int(speed * dt / 1000.0)
+        if "right" in self.held: self.player.x += int(speed * dt / 1000.0)
+        self.player.x = max(8, min(WIDTH - self.player.width - 8, self.player.x))
+        now = self.clock.ticks()
+        if now - self.last_enemy > self.enemy_ms:
+            self.spawn_enemy(); self.last_enemy = now; self.enemy_ms = max(240, int(self.enemy_ms*0.98))
+        # bullets & enemies movement
+        en, bu = self.enemies, self.bullets
+        bu.step(); en.step()
+        # collisions: every enemy touching the player costs a life, every enemy/bullet pair scores
+        crash = en.overlap(*self.player)
+        if crash:
+            self.lives -= len(crash)
+            self.note("death", int(self.player[0]), int(self.player[1]))
+            if self.lives <= 0:
+                self.game_over = True
+        ei, bj = en.pairs(bu)
+        if len(ei):
+            self.score += 50 * len(ei)
+            for i in ei:
+                self.particles.emit(int(en.x[i]) + 18, int(en.y[i]) + 18, n=8)
+        if crash or len(ei):
+            en.remove(crash, ei); bu.remove(bj)
+        bu.cull(lo=-30)
+        en.cull(hi=HEIGHT+40)
+
+    def draw(self,surf):
+        surf.fill((2,6,20))
+        draw_text(surf, f"Space Shooter  Score:{self.score}  Lives:{self.lives}", WIDTH//2, 34, BIG, COLS["white"], center=True, glyphs=True)
+        pygame.draw.rect(surf, COLS["good"], self.player.move(round(self.lerp(self.prev_x, self.player.x)) - self.player.x, 0))
+        by = round(self.lerp(10, 0)); ey = round(self.lerp(-3, 0))   # per-step moves, drawn part way
+        for pool, spr, dy in ((self.bullets, SPRITES.rect(8, 14, COLS["accent"]), by),
+                              (self.enemies, SPRITES.rect(36, 36, COLS["danger"]), ey)):
+            n = pool.n
+            surf.blits([(spr, p) for p in zip(pool.x[:n].tolist(), (pool.y[:n] + dy).tolist())], doreturn=False)
+        if self.paused:
+            draw_text(surf, "PAUSED - press P", WIDTH//2, HEIGHT-40, FONT, COLS["accent"], center=True)
+        if self.game_over:
+            draw_text(surf, "GAME OVER - press Esc to return to menu", WIDTH//2, HEIGHT-40, FONT, COLS["danger"], center=True)
+
+# ---------- Autoplayer ----------
+# Bots for the attract demo. act(game) is called once per frame and returns the action to
+# press (a SETTINGS["keys"] name) or None; all thinking is bounded by budget_ms per call.
+TETRIS_W = {"lines": 0.760666, "height": -0.510066, "holes": -0.35663, "bump": -0.184483}
+
+def tetris_drop(bits, masks, w, x, rows):
+    """row a piece (row masks, width) lands on when hard-dropped at column x from spawn; None if it can't enter"""
+    def hits(y):
+        for i, m in enumerate(masks):
+            yy = y + i
+            if yy >= rows: return True
+            if yy >= 0 and bits[yy] & (m << x): return True
+        return False
+    y = -1
+    if hits(y): return None
+    while not hits(y + 1): y += 1
+    return y
+
+def tetris_value(bits, rows, cols, full):
+    """heuristic value of a board: lines cleared, aggregate height, covered holes, bumpiness"""
+    keep = [b for b in bits if b != full]
+    lines = len(bits) - len(keep)
+    heights = [0] * cols; seen = 0; holes = 0
+    top = rows - len(keep)   # cleared rows drop in as empty rows on top
+    for r, row in enumerate(keep):
+        holes += bin(seen & ~row).count("1")
+        new = row & ~seen
+        while new:
+            low = new & -new; heights[low.bit_length() - 1] = rows - top - r; new ^= low
+        seen |= row
+    bump = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+    w = TETRIS_W
+    return w["lines"] * lines + w["height"] * sum(heights) + w["holes"] * holes + w["bump"] * bump
+
+class TetrisBot:
+    """
+    Plays BitTetris. For each new piece it tries every distinct rotation at every column,
+    hard-drops it on a copy of the bitboard and keeps the placement tetris_value() likes
+    best, then steers there one key every move_ms and hard-drops. Decisions are memoised in
+    an LRU transposition cache keyed by (board, piece kind), at most `cap` entries. The
+    search is a generator resumed each frame and stopped at budget_ms, so a slow machine
+    only decides later, never drops a frame.
+    """
+    def __init__(self, budget_ms=1.0, move_ms=60, cap=4096):
+        self.budget = budget_ms / 1000.0; self.move_ms = move_ms; self.cap = cap
+        self.cache = OrderedDict()
+        self.hits = self.misses = self.evals = 0
+        self.piece = self.gen = self.plan = None
+        self.last_move = -1e9; self.last = None
+
+    def search(self, g):
+        kind = g.cur["kind"]; key = (tuple(g.bits), kind)
+        plan = self.cache.get(key)
+        if plan is not None:
+            self.cache.move_to_end(key); self.hits += 1
+            yield plan; return
+        self.misses += 1
+        best = (-math.inf, 0, g.cur["x"]); seen = set()
+        for rot, (_, masks, w) in enumerate(g.tables[kind]):
+            if masks in seen: continue   # O, and S/Z/I half-turns, repeat earlier rotations
+            seen.add(masks)
+            for x in range(g.cols - w + 1):
+                y = tetris_drop(g.bits, masks, w, x, g.rows)
+                self.evals += 1
+                if y is None or y < 0: continue
+                bits = list(g.bits)
+                for i, m in enumerate(masks): bits[y + i] |= m << x
+                v = tetris_value(bits, g.rows, g.cols, g.full)
+                if v > best[0]: best = (v, rot, x)
+                yield None
+        plan = best[1:]
+        self.cache[key] = plan
+        if len(self.cache) > self.cap: self.cache.popitem(last=False)
+        yield plan
+
+    def decide(self, g, budget=None):
+        """advance the search for the current piece; the (rot, x) plan once it is done"""
+        if g.cur is not self.piece:
+            self.piece = g.cur; self.plan = None; self.gen = self.search(g); self.last = None
+        if self.plan is None:
+            end = time.perf_counter() + (self.budget if budget is None else budget)
+            for r in self.gen:
+                if r is not None: self.plan = r; break
+                if time.perf_counter() > end: break
+        return self.plan
+
+    def act(self, g):
+        plan = self.decide(g)
+        now = g.clock.ticks()
+        if plan is None or now - self.last_move < self.move_ms: return None
+        self.last_move = now
+        rot, x = plan; cur = g.cur
+        if self.last and (cur["rot"], cur["x"]) == self.last[1]:
+            # the last key did nothing (rotation against a wall, column blocked): step to the middle, else give up
+            if self.last[0] == "up" and cur["x"] != g.cols // 2: self.last = None; return "left" if cur["x"] > g.cols // 2 else "right"
+            self.plan = (cur["rot"], cur["x"])
+            return "shoot"
+        a = "up" if cur["rot"] != rot else "left" if cur["x"] > x else "right" if cur["x"] < x else "shoot"
+        self.last = (a, (cur["rot"], cur["x"]))
+        return a
+
+class SnakeBot:
+    """
+    Plays Snake. Each time the head moves it picks among the non-reversing free moves: one
+    BFS from the food gives every move its distance to the food, and a move whose region
+    (flood fill, tail counted as body) is smaller than the snake is only taken if nothing
+    safer exists. Out of budget it falls back to the move with the most free neighbours.
+    """
+    DIRS = {(1, 0): "right", (-1, 0): "left", (0, -1): "up", (0, 1): "down"}
+    nbrs = {}   # (cols, rows) -> per cell, the 4 wrapped neighbour cells
+
+    def __init__(self, budget_ms=3.0):
+        self.budget = budget_ms / 1000.0
+        self.head = None; self.timeouts = 0
+
+    def neighbours(self, cols, rows):
+        t = self.nbrs.get((cols, rows))
+        if t is None:
+            t = self.nbrs[(cols, rows)] = [tuple(((c % cols + dx) % cols) + ((c // cols + dy) % rows) * cols for dx, dy in self.DIRS)
+                                          for c in range(cols * rows)]
+        return t
+
+    def flood(self, cells, nb, start, end):
+        """{cell: steps} over free cells from start (start itself may be taken); None past `end`"""
+        pos, n = cells.pos, cells.n
+        dist = {start: 0}; q = [start]; d = 0
+        while q:   # one BFS level per pass, checking the clock between levels
+            d += 1; nxt = []
+            for c in q:
+                for m in nb[c]:
+                    if pos[m] < n and m not in dist: dist[m] = d; nxt.append(m)
+            q = nxt
+            if time.perf_counter() > end: return None
+        return dist
+
+    def act(self, g):
+        head = g.snake[0]
+        if head == self.head or g.game_over: return None
+        self.head = head
+        cols, rows = g.cols, g.rows; nb = self.neighbours(cols, rows); free = g.free.is_free
+        h = head[1] * cols + head[0]
+        moves = [(d, n) for d, n in zip(self.DIRS, nb[h]) if d != (-g.dir[0], -g.dir[1]) and free(n)]
+        if not moves: return None
+        end = time.perf_counter() + self.budget
+        dist = self.flood(g.free, nb, g.food[1] * cols + g.food[0], end) if g.food else {}
+        best = None
+        for d, n in moves:
+            if dist is None: break
+            region = dist if n in dist else self.flood(g.free, nb, n, end)
+            if region is None: dist = None; break
+            key = (len(region) > len(g.snake), -dist.get(n, math.inf), len(region))
+            if best is None or key > best[0]: best = (key, d)
+        if dist is None:
+            self.timeouts += 1
+            best = (0, max(moves, key=lambda m: sum(map(free, nb[m[1]])))[0])
+        d = best[1]
+        return None if d == g.dir else self.DIRS[d]
+
+AUTOPLAYERS = {"Tetris": TetrisBot, "Snake": SnakeBot}
+
+def bench_autoplay(pieces=2000, snake_games=5, seed=0):
+    """
+    Headless autoplayer benchmark. Tetris: the bot places `pieces` pieces directly (no
+    steering), reporting placements evaluated per second, search time per piece and cache
+    hit rate. Snake: the bot plays snake_games games, reporting food eaten and think time.
+    """
+    out = {}
+    bot = TetrisBot(); g = None; games = lines = 0; times = []
+    t0 = time.perf_counter()
+    for _ in range(pieces):
+        if g is None or g.game_over:
+            if g: lines += g.score // 100
+            g = BitTetris(clock=SimClock(), seed=seed + games); g.particles = NullParticles(); games += 1
+        p0 = time.perf_counter()
+        rot, x = bot.decide(g, budget=math.inf)
+        times.append(time.perf_counter() - p0)
+        cur = g.cur; cur["rot"] = rot; cur["shape"] = g.tables[cur["kind"]][rot][0]; cur["x"] = x
+        cur["y"] += g.drop_distance(); g.lock()
+    secs = time.perf_counter() - t0; times.sort()
+    lines += g.score // 100
+    out["tetris"] = {"pieces": pieces, "games": games, "lines": lines, "evals": bot.evals,
+                     "evals_per_s": int(bot.evals / secs), "decide_ms_p50": round(times[len(times)//2] * 1000, 3),
+                     "decide_ms_max": round(times[-1] * 1000, 3), "cache_hit_rate": round(bot.hits / pieces, 3)}
+    scores = []; times = []; timeouts = 0
+    for i in range(snake_games):
+        g = Snake(clock=SimClock(), seed=seed + i); g.particles = NullParticles(); bot = SnakeBot()
+        keys = {a: pygame.event.Event(pygame.KEYDOWN, key=SETTINGS["keys"][a]) for a in ("left", "right", "up", "down")}
+        for _ in range(200000):
+            p0 = time.perf_counter(); a = bot.act(g); times.append(time.perf_counter() - p0)
+            if a: g.feed(keys[a])
+            g.clock.advance(STEP_MS); g.update(STEP_MS)
+            if g.game_over: break
+        scores.append(len(g.snake)); timeouts += bot.timeouts
+    times.sort()
+    out["snake"] = {"games": snake_games, "mean_length": round(sum(scores) / len(scores), 1), "max_length": max(scores),
+                    "think_ms_p99": round(times[int(len(times) * 0.99)] * 1000, 3), "think_ms_max": round(times[-1] * 1000, 3),
+                    "timeouts": timeouts}
+    return out
+
+# ---------- Menu / Manager ----------
+GAMES = [("Tetris", BitTetris), ("Brick Breaker", BrickBreaker), ("Car Avoid", CarAvoid), ("Snake", Snake), ("Space Shooter", SpaceShooter)]
+menu_idx = 0
+
+def draw_menu():
+    SCREEN.fill(COLS["bg"])
+    draw_text(SCREEN, "Arcade - Fixed Collection", WIDTH//2, 44, XL, COLS["accent"], center=True)
+    draw_text(SCREEN, "Use Up/Down, Enter to pick a game. H:High Scores  S:Settings  Esc:Quit", WIDTH//2, 88, FONT, COLS["muted"], center=True)
+    start_y = 150
+    for i,(label,cls) in enumerate(GAMES):
+        y = start_y + i*78
+        w,h = 760,60
+        x = (WIDTH - w)//2
+        rect = pygame.Rect(x,y,w,h)
+        color = (36,46,66) if i==menu_idx else COLS["panel"]
+        SCREEN.blit(SPRITES.rect(w, h, color, 8), rect)
+        draw_text(SCREEN, label, x+20, y+8, BIG if i==menu_idx else XL, COLS["white"])
+        # high score snippet
+        draw_text(SCREEN, f"Top: {LEADERBOARD.best(label)}", x+w-120, y+18, FONT, COLS["good"])
+
+class SettingsScene(Scene):
+    """difficulty toggle and the initials new scores are entered under"""
+    name = "Settings"; fps = 0
+    diffs = ["Easy","Normal","Hard"]
+    def __init__(self):
+        self.idx = self.diffs.index(SETTINGS.get("difficulty","Normal"))
+        self.initials = SETTINGS.get("initials", "AAA")
+        self.dirty = True
+    def invalidate(self): self.dirty = True
+    def event(self, ev):
+        if ev.type in MENU_REDRAW: self.dirty = True
+        if ev.type==pygame.KEYDOWN:
+            if ev.key==pygame.K_ESCAPE:
+                SETTINGS["difficulty"] = self.diffs[self.idx]
+                SETTINGS["initials"] = (self.initials + "AAA")[:3]; save_json(SETTINGS_FILE, SETTINGS)
+                DIRECTOR.pop()
+            elif ev.key==pygame.K_LEFT:
+                self.idx = (self.idx - 1) % len(self.diffs)
+            elif ev.key==pygame.K_RIGHT:
+                self.idx = (self.idx + 1) % len(self.diffs)
+            elif ev.key==pygame.K_BACKSPACE:
+                self.initials = self.initials[:-1]
+            elif ev.unicode.isalnum() and ev.unicode.isascii():
+                self.initials = (self.initials if len(self.initials) < 3 else "") + ev.unicode.upper()
+    def draw(self, surf):
+        if not self.dirty: return []
+        self.dirty = False
+        surf.fill(COLS["bg"])
+        draw_text(surf, "Settings", WIDTH//2, 44, XL, COLS["accent"], center=True)
+        draw_text(surf, f"Difficulty: {self.diffs[self.idx]} (press Left/Right to change)", WIDTH//2, 120, FONT, COLS["muted"], center=True)
+        draw_text(surf, f"Initials: {self.initials:_<3} (type to change)", WIDTH//2, 160, FONT, COLS["muted"], center=True)
+        draw_text(surf, "Press ESC to return", WIDTH//2, HEIGHT-40, FONT, COLS["muted"], center=True)
+
+class ScoresScene(Scene):
+    """top five per game on the all-time, daily or weekly board; Left/Right switches board"""
+    name = "High Scores"; fps = 0
+    def __init__(self): self.board = 0; self.dirty = True
+    def invalidate(self): self.dirty = True
+    def event(self, ev):
+        if ev.type in MENU_REDRAW: self.dirty = True
+        if ev.type==pygame.KEYDOWN:
+            if ev.key==pygame.K_ESCAPE:
+                DIRECTOR.pop()
+            elif ev.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                self.board = (self.board + (1 if ev.key==pygame.K_RIGHT else -1)) % len(BOARDS)
+    def draw(self, surf):
+        if not self.dirty: return []
+        self.dirty = False
+        board = BOARDS[self.board]
+        surf.fill(COLS["bg"])
+        draw_text(surf, "High Scores", WIDTH//2, 44, XL, COLS["accent"], center=True)
+        draw_text(surf, f"< {board} >", WIDTH//2, 88, FONT, COLS["muted"], center=True)
+        y = 120
+        for name,cls in GAMES:
+            draw_text(surf, name, 120, y, BIG, COLS["white"])
+            arr = LEADERBOARD.top(name, 5, 0, board)
+            s = "   ".join(f"{ini} {sc}" for sc, ini, _, _ in arr) if arr else "—"
+            draw_text(surf, s, 420, y, FONT, COLS["muted"])
+            y += 48
+        draw_text(surf, "Left/Right: board   ESC: return", WIDTH//2, HEIGHT-40, FONT, COLS["muted"], center=True)
+
+ATTRACT_MS = 30000   # menu idle time before the attract-mode demo starts (0: never)
+DEMO_MS = 20000      # longest a single game plays in the demo
+MENU_REDRAW = (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.WINDOWEXPOSED, pygame.WINDOWSHOWN,
+               pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED)
+
+class AttractScene(Scene):
+    """
+    Demo loop: the games take turns (DEMO_MS each, or until game over). Games with an
+    AUTOPLAYERS bot are played by it, the rest by random key mashing. Any key or click
+    returns to the menu; nothing is recorded and no score is submitted.
+    """
+    name = "Demo"
+    def __init__(self):
+        self.mash = random.Random(); self.i = 0
+        self.next_game()
+    def next_game(self):
+        label, cls = GAMES[self.i % len(GAMES)]; self.i += 1
+        self.game = cls(SETTINGS.get("difficulty","Normal"), seed=self.mash.randrange(2**31))
+        self.game.particles = self.particles = Particles()
+        self.bot = AUTOPLAYERS[label]() if label in AUTOPLAYERS else None
+        self.t0 = pygame.time.get_ticks()
+    def invalidate(self): self.game.invalidate()
+    def event(self, ev):
+        if ev.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN): DIRECTOR.pop()
+    def tick(self, dt_ms):
+        g = self.game; mash = self.mash
+        if g.game_over or pygame.time.get_ticks() - self.t0 > DEMO_MS:
+            self.next_game(); return
+        if self.bot:
+            a = self.bot.act(g)
+            if a:
+                key = SETTINGS["keys"][a]
+                g.feed(pygame.event.Event(pygame.KEYDOWN, key=key)); g.feed(pygame.event.Event(pygame.KEYUP, key=key))
+        elif mash.random() < 0.15:
+            key = SETTINGS["keys"][mash.choice(FUZZ_ACTIONS)]
+            g.feed(pygame.event.Event(pygame.KEYDOWN, key=key))
+            if mash.random() < 0.5: g.feed(pygame.event.Event(pygame.KEYUP, key=key))
+        g.advance(dt_ms)
+    def draw(self, surf):
+        self.game.draw(surf)
+        draw_text(surf, "DEMO - press any key to play", WIDTH//2, HEIGHT-16, FONT, COLS["accent"], center=True)
+
+class MenuScene(Scene):
+    """
+    Game list. Draws only when something changed (input, window exposure, particles still
+    fading) and is otherwise idle, so the Director sleeps in event.wait and an idle cabinet
+    costs next to no CPU. After ATTRACT_MS without input the attract demo is pushed.
+    """
+    name = "Menu"
+    def __init__(self):
+        self.particles = particles
+        self.dirty = True; self.idle_since = pygame.time.get_ticks()
+    @property
+    def fps(self): return FPS if len(self.particles) else 0
+    def resume(self):
+        self.dirty = True; self.idle_since = pygame.time.get_ticks()
+    def invalidate(self): self.dirty = True
+    def wake_ms(self):
+        return ATTRACT_MS - (pygame.time.get_ticks() - self.idle_since) if ATTRACT_MS else None
+    def play(self, i):
+        global menu_idx
+        menu_idx = i
+        label, cls = GAMES[menu_idx]
+        DIRECTOR.push(cls(SETTINGS.get("difficulty","Normal")))
+    def event(self, ev):
+        global menu_idx
+        if ev.type in MENU_REDRAW: self.dirty = True
+        if ev.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN): self.idle_since = pygame.time.get_ticks()
+        if ev.type==pygame.KEYDOWN:
+            if ev.key==pygame.K_DOWN:
+                menu_idx = (menu_idx + 1) % len(GAMES)
+            elif ev.key==pygame.K_UP:
+                menu_idx = (menu_idx - 1) % len(GAMES)
+            elif ev.key==pygame.K_RETURN:
+                # launch selected game
+                self.play(menu_idx)
+            elif ev.key==pygame.K_h:
+                DIRECTOR.push(ScoresScene())
+            elif ev.key==pygame.K_s:
+                DIRECTOR.push(SettingsScene())
+            elif ev.key==pygame.K_ESCAPE:
+                DIRECTOR.quit()
+        if ev.type==pygame.MOUSEBUTTONDOWN:
+            mx,my = ev.pos
+            start_y = 150
+            for i,(label,cls) in enumerate(GAMES):
+                y = start_y + i*78
+                w,h = 760,60; x=(WIDTH-w)//2
+                if pygame.Rect(x,y,w,h).collidepoint(mx,my):
+                    self.play(i); return
+    def tick(self, dt_ms):
+        if ATTRACT_MS and pygame.time.get_ticks() - self.idle_since >= ATTRACT_MS:
+            DIRECTOR.push(AttractScene())
+    def draw(self, surf):
+        if not (self.dirty or len(self.particles)): return []
+        self.dirty = False
+        draw_menu()
+
+def main_loop():
+    DIRECTOR.push(MenuScene())
+    DIRECTOR.run()
+
+# ---------- Input recording / replay ----------
+# .arcin file: b"ARCI", u8 version, u64 seed, game and difficulty as u8-length utf-8,
+# u32 payload length, zlib payload of one <HH record per frame (dt ms, action edges fed this
+# frame) followed by that many u8 edges in the order they were fed (ACTIONS index, bit 7
+# set for a press), trailer u32 frames, u8 last frame ended early (Esc/quit before update),
+# i64 score, u32 state checksum at session end.
+REC_MAGIC, REC_VERSION = b"ARCI", 3   # 2: action layer (Tetris DAS/ARR, Snake turn buffer); 3: ordered edges
+REC_FRAME = struct.Struct("<HH")
+REC_TRAILER = struct.Struct("<IBqI")
+RECORD_DIR = None   # set by --record; every game session is then written there
+STREAM = None       # StreamServer started by --serve; games publish a snapshot each frame
+CAPTURE = None      # Capture started by --capture; the Director grabs each game frame
+TELEMETRY = None    # Telemetry for played sessions; off for --no-telemetry and headless tools
+
+class InputRecorder:
+    """Collects a session's per-frame dt and action edges, in order; written through PERSIST at the end."""
+    def __init__(self, game):
+        self.game = game
+        self.buf = bytearray()
+        self.frames = 0
+        self.edges = bytearray()   # this frame's edges so far
+        self.index = {a: i for i, a in enumerate(ACTIONS)}
+
+    def key(self, ev):
+        i = self.index.get(self.game.keymap.get(getattr(ev, "key", None)))
+        if i is not None and ev.type in (pygame.KEYDOWN, pygame.KEYUP):
+            self.edges.append(i | 0x80 if ev.type == pygame.KEYDOWN else i)
+
+    def frame(self, dt_ms):
+        self.buf += REC_FRAME.pack(min(dt_ms, 0xFFFF), len(self.edges)); self.buf += self.edges
+        self.edges = bytearray()
+        self.frames += 1
+
+    def end(self, dt_ms):
+        # the session ended mid-frame: keep the events fed so far, mark that no update followed
+        self.frame(dt_ms)
+        g = self.game
+        pstr = lambda t: bytes([len(t.encode())]) + t.encode()
+        body = zlib.compress(bytes(self.buf), 9)
+        data = (REC_MAGIC + struct.pack("<BQ", REC_VERSION, g.seed) + pstr(g.name) + pstr(g.difficulty)
+                + struct.pack("<I", len(body)) + body
+                + REC_TRAILER.pack(self.frames, 1, int(g.score), state_checksum(g)))
+        path = Path(RECORD_DIR) / f"{g.name.replace(' ', '_')}-{time.strftime('%Y%m%d-%H%M%S')}-{g.seed % 10**6:06d}.arcin"
+        PERSIST.save_bytes(path, data)
+        return path
+
+def read_recording(path):
+    raw = Path(path).read_bytes()
+    if raw[:4] != REC_MAGIC: raise ValueError(f"{path}: not an input recording")
+    version, seed = struct.unpack_from("<BQ", raw, 4)
+    if version != REC_VERSION: raise ValueError(f"{path}: unsupported version {version}")
+    i = 13
+    name = raw[i+1:i+1+raw[i]].decode(); i += 1 + raw[i]
+    difficulty = raw[i+1:i+1+raw[i]].decode(); i += 1 + raw[i]
+    (n,) = struct.unpack_from("<I", raw, i); i += 4
+    body = zlib.decompress(raw[i:i+n]); i += n
+    frames, partial, score, checksum = REC_TRAILER.unpack_from(raw, i)
+    out = []; j = 0   # [(dt, [(action, down), ...])]
+    while j < len(body):
+        dt, k = REC_FRAME.unpack_from(body, j); j += REC_FRAME.size
+        out.append((dt, [(ACTIONS[e & 0x7F], bool(e & 0x80)) for e in body[j:j+k]])); j += k
+    return {"seed": seed, "game": name, "difficulty": difficulty, "frames": out,
+            "partial": bool(partial), "score": score, "checksum": checksum}
+
+def replay(path, render=False):
+    """
+    Re-run a recording. Without render it steps as fast as Python allows, with no display;
+    render=True opens the window and plays back at the recorded frame pacing. Reports
+    whether the final score and state checksum match what the cabinet saw.
+    """
+    rec = read_recording(path)
+    cls = {c.name: c for _, c in GAMES}[rec["game"]]
+    if render: setup()
+    h = Headless(cls, rec["difficulty"], rec["seed"])
+    if render: h.game.particles = particles
+    frames = rec["frames"]; last = len(frames) - 1
+    t0 = time.perf_counter(); due = t0
+    for f, (dt, ev) in enumerate(frames):
+        h.step(ev, dt, update=not (rec["partial"] and f == last))
+        if render:
+            if any(e.type == pygame.QUIT for e in pygame.event.get()): break
+            rects = h.game.draw(SCREEN)
+            h.game.particles.update(dt / 1000.0); h.game.particles.draw(SCREEN)
+            if rects is None: pygame.display.flip()
+            elif rects: pygame.display.update(rects)
+            due += dt / 1000.0
+            wait = due - time.perf_counter()
+            if wait > 0: time.sleep(wait)
+    secs = time.perf_counter() - t0
+    g = h.game
+    return {"file": str(path), "game": rec["game"], "frames": len(frames), "score": g.score,
+            "match": g.score == rec["score"] and state_checksum(g) == rec["checksum"],
+            "seconds": round(secs, 3), "speedup": round(sum(f[0] for f in frames) / 1000.0 / secs, 1) if secs else 0}
+
+def check_replays(frames=300, seed=0):
+    """
+    Records a key-mashing session of every game through the real frame loop (dummy
+    display) on a cabinet whose key map is moved off the defaults, then replays each
+    recording on the default keys, as --replay does. Frames often carry presses of
+    several different actions, so their order within the frame must survive too. All
+    must match: recordings hold actions, so nothing in a replay may depend on the
+    cabinet's key bindings.
+    -> one replay() row per game
+    """
+    import tempfile
+    global RECORD_DIR
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    setup()
+    keys = SETTINGS["keys"]; rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as d:
+        SETTINGS["keys"] = dict(keys, left=pygame.K_a, right=pygame.K_d, up=pygame.K_w, down=pygame.K_s)
+        RECORD_DIR = d
+        try:
+            for _, cls in GAMES:
+                g = cls(seed=rng.randrange(2**32)); DIRECTOR.push(g)
+                for _ in range(frames):
+                    if rng.random() < 0.3:
+                        for a in rng.sample(FUZZ_ACTIONS, rng.randint(1, 3)):   # up to three actions, any order
+                            key = SETTINGS["keys"][a]
+                            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+                            if rng.random() < 0.5: pygame.event.post(pygame.event.Event(pygame.KEYUP, key=key))
+                    DIRECTOR.frame()
+                while DIRECTOR.stack: DIRECTOR.pop()
+            PERSIST.flush()
+        finally:
+            SETTINGS["keys"] = keys; RECORD_DIR = None
+        return [replay(f) for f in sorted(Path(d).glob("*.arcin"))]
+
+# ---------- Gameplay capture ----------
+def _capture_worker(shm_name, slots, size, shape, order, fps, seconds, q, free, done):
+    """
+    Capture process: takes frames out of the shared ring (releasing each slot at once),
+    keeps the last `seconds` of them zlib-compressed in memory and writes clips on request:
+    an .mp4 through ffmpeg when it is on PATH, else a numbered PNG sequence.
+    """
+    from multiprocessing import shared_memory
+    import shutil, subprocess
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray((slots, size), np.uint8, shm.buf)
+    clip = deque(maxlen=max(1, int(fps * seconds)))
+    w, h, pitch = shape
+    def rgb(raw):
+        # native surface bytes (rows of `pitch`, 4 bytes a pixel) -> h x w x 3 RGB
+        px = np.frombuffer(raw, np.uint8).reshape(h, pitch)[:, :w * 4].reshape(h, w, 4)
+        return px[:, :, list(order)]
+    def save(path):
+        frames = list(clip)
+        ff = shutil.which("ffmpeg")
+        if ff and not path.endswith("/"):
+            p = subprocess.Popen([ff, "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{w}x{h}",
+                                  "-r", str(fps), "-i", "-", "-pix_fmt", "yuv420p", path + ".mp4"], stdin=subprocess.PIPE)
+            for f in frames: p.stdin.write(rgb(zlib.decompress(f)).tobytes())
+            p.stdin.close(); p.wait()
+            return path + ".mp4"
+        out = Path(path.rstrip("/")); out.mkdir(parents=True, exist_ok=True)
+        for i, f in enumerate(frames):
+            pygame.image.save(pygame.surfarray.make_surface(rgb(zlib.decompress(f)).swapaxes(0, 1)), str(out / f"{i:05d}.png"))
+        return str(out)
+    try:
+        while True:
+            msg = q.get()
+            if msg is None: return
+            if msg[0] == "frame":
+                raw = zlib.compress(ring[msg[1]].tobytes(), 1); free.release()
+                clip.append(raw)
+            elif msg[0] == "save":
+                try: done.put(save(msg[1]))
+                except Exception as e: done.put(f"error: {e}")
+    finally:
+        del ring; shm.close()
+
+class Capture:
+    """
+    Gameplay capture off the render thread. grab(surface) copies the frame's pixel buffer
+    (one memcpy from the surface's own view, no conversion) into a free slot of a ring in
+    shared memory and queues the slot for _capture_worker; when the worker is behind and
+    every slot is taken the frame is dropped, never waited for. The worker keeps the last
+    `seconds` at `fps` compressed in memory, so save_clip() can write a run after it ended.
+    """
+    def __init__(self, out_dir, surface, fps=30, seconds=15.0, slots=8):
+        import multiprocessing as mp
+        from multiprocessing import shared_memory
+        self.out_dir = Path(out_dir); self.fps = fps; self.interval = 1000.0 / fps
+        w, h = surface.get_size(); pitch = surface.get_pitch()
+        if surface.get_bytesize() != 4: raise ValueError("capture needs a 32-bit display surface")
+        # channel order of the native pixel bytes: byte index of R, G and B
+        order = tuple(s // 8 for s in surface.get_shifts()[:3])
+        self.size = pitch * h; self.slots = slots
+        self.shm = shared_memory.SharedMemory(create=True, size=self.size * slots)
+        self.ring = np.ndarray((slots, self.size), np.uint8, self.shm.buf)
+        self.ring.fill(0)   # fault the pages in now, not on the first grabs
+        self.q = mp.Queue(); self.done = mp.Queue(); self.free = mp.Semaphore(slots)
+        self.proc = mp.Process(target=_capture_worker, name="capture", daemon=True,
+                               args=(self.shm.name, slots, self.size, (w, h, pitch), order, fps, seconds, self.q, self.free, self.done))
+        self.proc.start()
+        self.i = 0; self.last = -1e9
+        self.grabbed = self.dropped = 0
+
+    def grab(self, surface, now_ms=None):
+        now = pygame.time.get_ticks() if now_ms is None else now_ms
+        if now - self.last < self.interval - 1: return
+        self.last = now
+        if not self.free.acquire(False):
+            self.dropped += 1; return
+        view = surface.get_view("0")
+        self.ring[self.i] = np.frombuffer(view, np.uint8, self.size)
+        del view   # the view locks the surface
+        self.q.put(("frame", self.i)); self.i = (self.i + 1) % self.slots
+        self.grabbed += 1
+
+    def save_clip(self, name):
+        """write the buffered last seconds as OUT_DIR/name(.mp4 or a PNG directory); returns at once"""
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.q.put(("save", str(self.out_dir / f"{name}-{time.strftime('%Y%m%d-%H%M%S')}")))
+
+    def close(self, timeout=30.0):
+        # lets a clip still being written finish
+        self.q.put(None); self.proc.join(timeout)
+        if self.proc.is_alive(): self.proc.terminate()
+        del self.ring; self.shm.close(); self.shm.unlink()
+
+def bench_capture(seconds=5.0, out_dir="capture-bench", game="Space Shooter", fps=30, seed=0):
+    """
+    Renders a fuzzed game headless at real-time 60 FPS with capture on, then saves the
+    buffered clip. Reports the grab cost on the render thread, frames dropped and how long
+    the worker took to write the clip.
+    """
+    h = Headless(dict(GAMES)[game], seed=seed, render=True)
+    cap = Capture(out_dir, h.surf, fps, seconds)
+    mash = random.Random(seed); times = []
+    t0 = time.perf_counter(); frames = int(seconds * FPS)
+    for f in range(frames):
+        ev = [(mash.choice(FUZZ_ACTIONS), True)] if mash.random() < 0.15 else []
+        h.step(ev)
+        if h.game.game_over: h.reset(h.seed + 1)
+        g0 = time.perf_counter(); cap.grab(h.surf, f * STEP_MS); times.append(time.perf_counter() - g0)
+        time.sleep(max(0.0, t0 + (f + 1) * STEP_MS / 1000 - time.perf_counter()))
+    s0 = time.perf_counter(); cap.save_clip(game.replace(" ", "_"))
+    path = cap.done.get(timeout=300); save_s = time.perf_counter() - s0
+    cap.close(); times.sort()
+    return {"game": game, "frames": frames, "grabbed": cap.grabbed, "dropped": cap.dropped,
+            "grab_ms_p50": round(times[len(times)//2] * 1000, 3), "grab_ms_max": round(times[-1] * 1000, 3),
+            "clip": path, "save_s": round(save_s, 2)}
+
+# ---------- Telemetry ----------
+# Session events: (unix time, kind, game, a, b), where a and b mean TELEMETRY_FIELDS[kind].
+TELEMETRY_FIELDS = {"start": ("difficulty", "seed"), "end": ("score", "seconds"), "death": ("x", "y"),
+                    "lines": ("lines", "score"), "budget": ("work_ms", "budget_ms")}
+
+class Telemetry:
+    """
+    Structured session events. emit() runs on the game thread and only stores a tuple in a
+    preallocated ring (a few hundred ns); a background thread drains the ring every
+    flush_s, writes each batch as one gzip member appended to a rotating NDJSON file under
+    out_dir (a new file past rotate_bytes or at midnight, the oldest deleted past `keep`)
+    and, with url set, POSTs the same gzipped batch there. Batches the collector refused
+    are retried next flush, up to `retry` of them. If the game thread laps the flusher the
+    oldest events are overwritten and counted in `dropped`.
+    """
+    def __init__(self, out_dir, url=None, cabinet=None, size=1 << 14, flush_s=2.0, rotate_bytes=1 << 20, keep=50, retry=20):
+        self.out_dir = Path(out_dir); self.url = url; self.cabinet = cabinet or socket.gethostname()
+        self.size = size; self.mask = size - 1
+        assert size & self.mask == 0, "ring size must be a power of two"
+        self.buf = [None] * size
+        self.head = 0   # events emitted; written by the game thread only
+        self.tail = 0   # events drained; written by the flush thread only
+        self.dropped = self.sent = self.failed = 0
+        self.flush_s = flush_s; self.rotate_bytes = rotate_bytes; self.keep = keep
+        self.pending = deque(maxlen=retry)   # gzipped batches the collector has not taken yet
+        self.path = None
+        self.lock = threading.Lock()   # flush() from the thread and from close()
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def emit(self, kind, game, a=0, b=0):
+        i = self.head
+        self.buf[i & self.mask] = (time.time(), kind, game, a, b)
+        self.head = i + 1
+
+    def drain(self):
+        head, size = self.head, self.size
+        tail = max(self.tail, head - size)   # anything older was overwritten before we got here
+        out = [self.buf[i & self.mask] for i in range(tail, head)]
+        # slots the game thread reused while they were copied hold newer events: drop them
+        lost = max(0, self.head - size - tail)
+        out = out[lost:]
+        self.dropped += tail - self.tail + lost
+        self.tail = head
+        return out
+
+    @staticmethod
+    def _order(f):
+        # (day, index) of events-YYYYMMDD-NNN.ndjson.gz; numeric, as indices outgrow the padding past 999
+        day, _, n = f.name[len("events-"):-len(".ndjson.gz")].partition("-")
+        return day, int(n) if n.isdigit() else -1
+
+    def _file(self):
+        day = time.strftime("%Y%m%d")
+        p = self.path
+        if p is None or not p.name.startswith(f"events-{day}-") or (p.exists() and p.stat().st_size > self.rotate_bytes):
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            # one past today's highest index: counting the files stalls once `keep` of them are left
+            n = max((self._order(f)[1] for f in self.out_dir.glob(f"events-{day}-*.ndjson.gz")), default=-1) + 1
+            p = self.path = self.out_dir / f"events-{day}-{n:03d}.ndjson.gz"
+            olds = sorted(self.out_dir.glob("events-*.ndjson.gz"), key=self._order)
+            for old in olds[:max(0, len(olds) - self.keep + 1)]: old.unlink()   # the new file, not written yet, makes `keep`
+        return p
+
+    def flush(self):
+        import gzip
+        with self.lock:
+            events = self.drain()
+            if events:
+                cab = self.cabinet
+                lines = []
+                for t, kind, game, a, b in events:
+                    fa, fb = TELEMETRY_FIELDS.get(kind, ("a", "b"))
+                    lines.append(json.dumps({"t": round(t, 3), "event": kind, "game": game, fa: a, fb: b, "cabinet": cab}))
+                batch = gzip.compress(("\n".join(lines) + "\n").encode(), 6)
+                try:
+                    with open(self._file(), "ab") as f: f.write(batch)
+                except OSError as e:
+                    print(f"arcade: telemetry write failed: {e}", file=sys.stderr)
+                if self.url: self.pending.append(batch)
+            if self.url: self._post()
+
+    def _post(self):
+        import urllib.request
+        while self.pending:
+            req = urllib.request.Request(self.url, data=self.pending[0], method="POST",
+                                         headers={"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"})
+            try:
+                with urllib.request.urlopen(req, timeout=5) as r: r.read()
+            except OSError:
+                self.failed += 1; return   # collector down: keep the batch for the next flush
+            self.pending.popleft(); self.sent += 1
+
+    def _run(self):
+        while not self.stop.wait(self.flush_s):
+            try: self.flush()
+            except Exception as e: print(f"arcade: telemetry flush failed: {e}", file=sys.stderr)
+
+    def close(self):
+        self.stop.set(); self.thread.join(10)
+        self.flush()
+
+def telemetry_stub(port=8765, out="telemetry-stub.ndjson"):
+    """local stand-in for the HTTP collector: appends every POSTed batch, unzipped, to `out`"""
+    import gzip
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    lock = threading.Lock()
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.headers.get("Content-Encoding") == "gzip": body = gzip.decompress(body)
+            with lock, open(out, "ab") as f: f.write(body)
+            self.send_response(204); self.end_headers()
+        def log_message(self, *a): pass
+    srv = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    print(json.dumps({"stub": f"http://127.0.0.1:{srv.server_address[1]}/", "out": out}), flush=True)
+    return srv
+
+def telemetry_report(paths):
+    """
+    Offline aggregation of telemetry logs (.ndjson.gz files, plain .ndjson from the stub,
+    or directories of them) -> per game: sessions, difficulty mix, session length and score
+    percentiles, deaths with their most common places, line clears and frame-budget misses.
+    """
+    import gzip
+    files = []
+    for p in map(Path, paths):
+        files += sorted(p.glob("*.ndjson*")) if p.is_dir() else [p]
+    games = {}; pct = lambda v, q: sorted(v)[min(len(v) - 1, int(q / 100 * len(v)))] if v else 0
+    events = 0
+    for f in files:
+        with (gzip.open(f, "rt") if f.suffix == ".gz" else open(f)) as fh:
+            for line in fh:
+                try: e = json.loads(line)
+                except ValueError: continue
+                events += 1
+                g = games.setdefault(e.get("game"), {"starts": 0, "difficulty": {}, "seconds": [], "scores": [], "deaths": 0,
+                                                     "places": {}, "lines": 0, "budget_misses": 0, "cabinets": set()})
+                g["cabinets"].add(e.get("cabinet")); kind = e.get("event")
+                if kind == "start":
+                    g["starts"] += 1; d = e.get("difficulty"); g["difficulty"][d] = g["difficulty"].get(d, 0) + 1
+                elif kind == "end":
+                    g["seconds"].append(e.get("seconds", 0)); g["scores"].append(e.get("score", 0))
+                elif kind == "death":
+                    g["deaths"] += 1
+                    place = (e.get("x", 0) // 100 * 100, e.get("y", 0) // 100 * 100) if e.get("game") in ("Brick Breaker", "Space Shooter") else (e.get("x"), e.get("y"))
+                    g["places"][str(place)] = g["places"].get(str(place), 0) + 1
+                elif kind == "lines":
+                    g["lines"] += e.get("lines", 0)
+                elif kind == "budget":
+                    g["budget_misses"] += 1
+    out = {"files": len(files), "events": events, "games": {}}
+    for name, g in sorted(games.items(), key=lambda kv: -kv[1]["starts"]):
+        secs, scores, n = g["seconds"], g["scores"], len(g["seconds"])
+        out["games"][name] = {"sessions": g["starts"], "ended": n, "cabinets": len(g["cabinets"]), "difficulty": g["difficulty"],
+                              "seconds": {"total": round(sum(secs), 1), "p50": pct(secs, 50), "p90": pct(secs, 90)},
+                              "score": {"mean": round(sum(scores) / n, 1) if n else 0, "p50": pct(scores, 50), "max": max(scores, default=0)},
+                              "deaths": g["deaths"], "deaths_per_session": round(g["deaths"] / n, 2) if n else 0,
+                              "death_places": dict(sorted(g["places"].items(), key=lambda kv: -kv[1])[:5]),
+                              "lines": g["lines"], "budget_misses": g["budget_misses"],
+                              "budget_misses_per_min": round(g["budget_misses"] / (sum(secs) / 60), 2) if sum(secs) else 0}
+    return out
+
+def bench_telemetry(events=1000000, out_dir="telemetry-bench"):
+    """emit() cost per event on the game thread, and the flush cost of the resulting batches"""
+    t = Telemetry(out_dir, flush_s=3600)
+    emit = t.emit; per = t.size // 2
+    t0 = time.perf_counter(); flush = 0.0
+    for i in range(events):
+        emit("death", "Snake", i, 7)
+        if i % per == per - 1:
+            f0 = time.perf_counter(); t.flush(); flush += time.perf_counter() - f0
+    secs = time.perf_counter() - t0 - flush
+    f0 = time.perf_counter(); t.close(); flush += time.perf_counter() - f0
+    return {"events": events, "emit_ns": round(secs / events * 1e9, 1), "flush_us_per_event": round(flush / events * 1e6, 2),
+            "dropped": t.dropped, "bytes_per_event": round(sum(p.stat().st_size for p in Path(out_dir).glob("*.gz")) / events, 2)}
+
+def check_telemetry_rotation(flushes=40, rotate_bytes=256, keep=4):
+    """
+    Flushes small batches through a Telemetry with a tiny rotate_bytes and keep, so its
+    files rotate many more than `keep` times. ok when exactly the `keep` newest files are
+    left and no file grew past rotate_bytes by more than one batch.
+    """
+    import tempfile
+    with tempfile.TemporaryDirectory() as d:
+        t = Telemetry(d, flush_s=3600, rotate_bytes=rotate_bytes, keep=keep)
+        seen = []; batch = 0; biggest = 0
+        for i in range(flushes):
+            for k in range(20): t.emit("death", "Snake", i, k)
+            before = t.path.stat().st_size if t.path and t.path.exists() else 0
+            t.flush()
+            if t.path.name not in seen: seen.append(t.path.name); before = 0
+            size = t.path.stat().st_size; batch = max(batch, size - before); biggest = max(biggest, size)
+        t.close()
+        left = sorted((f.name for f in Path(d).glob("events-*.ndjson.gz")), key=lambda n: Telemetry._order(Path(n)))
+    ok = len(seen) > keep and left == seen[-keep:] and biggest <= rotate_bytes + batch
+    return {"flushes": flushes, "files_written": len(seen), "files_left": len(left), "keep": keep,
+            "biggest_file": biggest, "rotate_bytes": rotate_bytes, "biggest_batch": batch, "ok": ok}
+
+# ---------- Headless engine ----------
+def state_checksum(game):
+    # crc of a game's plain state; equal checksums at equal frames means two runs match.
+    # caches, indexes and raw key codes (cabinet key maps differ) are left out
+    skip = ("clock","rng","particles","view","free","held","keymap","rec","drawn","telemetry")
+    st = {k:v for k,v in vars(game).items() if k not in skip}
+    return zlib.crc32(repr(sorted(st.items())).encode())
+
+FUZZ_ACTIONS = ("left","right","up","down","shoot")
+
+class Headless:
+    """
+    Steps a game on a fixed-timestep simulated clock with a seeded RNG and no display.
+    Same seed + same inputs -> same run, bit for bit. render=True also draws each frame
+    into an offscreen surface (SDL dummy driver) so draw() gets exercised.
+    """
+    def __init__(self, cls, difficulty="Normal", seed=0, step_ms=STEP_MS, render=False):
+        self.cls = cls; self.difficulty = difficulty; self.seed = seed; self.step_ms = step_ms
+        self.surf = setup(headless=True) if render else None
+        self.frame = 0
+        self.reset()
+
+    def reset(self, seed=None):
+        if seed is not None: self.seed = seed
+        self.clock = SimClock()
+        self.game = self.cls(self.difficulty, clock=self.clock, seed=self.seed)
+        self.game.particles = Particles() if self.surf else NullParticles()
+        return self.game
+
+    def press(self, action, down=True):
+        key = SETTINGS["keys"][action]
+        self.game.feed(pygame.event.Event(pygame.KEYDOWN if down else pygame.KEYUP, key=key))
+
+    def step(self, inputs=(), dt_ms=None, update=True):
+        # same order as Director.frame: apply inputs [(action, down), ...], then the steps dt_ms covers
+        g = self.game
+        dt_ms = self.step_ms if dt_ms is None else dt_ms
+        for action, down in inputs: self.press(action, down)
+        if update: g.advance(dt_ms)
+        if self.surf is not None:
+            g.draw(self.surf)
+            g.particles.update(dt_ms / 1000.0)
+            g.particles.draw(self.surf)
+        self.frame += 1
+        return g
+
+    def checksum(self):
+        return state_checksum(self.game)
+
+    def run(self, frames, inputs=None, fuzz=False, restart=True):
+        """
+        inputs: {frame: [(action, down), ...]}. fuzz mashes random keys from a stream seeded
+        by self.seed; restart starts a fresh game (seed+1) whenever one ends.
+        """
+        inputs = inputs or {}
+        mash = random.Random(self.seed ^ 0x5EED)
+        games = 1; best = 0
+        t0 = time.perf_counter()
+        for _ in range(frames):
+            ev = list(inputs.get(self.frame, ()))
+            if fuzz and mash.random() < 0.15:
+                a = mash.choice(FUZZ_ACTIONS)
+                ev.append((a, True))
+                if mash.random() < 0.5: ev.append((a, False))
+            self.step(ev)
+            if self.game.game_over and restart:
+                best = max(best, self.game.score)
+                self.reset(self.seed + 1); games += 1
+        secs = time.perf_counter() - t0
+        best = max(best, self.game.score)
+        return {"game": self.cls.name, "frames": frames, "games": games, "best": best,
+                "checksum": self.checksum(), "seconds": round(secs, 3),
+                "fps": int(frames / secs) if secs else 0}
+
+def bench_tetris(pieces=20000, seed=0):
+    """
+    Micro-benchmark: list core (Tetris) vs bitboard core (BitTetris) on the same seeded
+    key stream of shifts, rotations, soft and hard drops. Checks both end identically.
+    """
+    k = SETTINGS["keys"]
+    ev = lambda key: pygame.event.Event(pygame.KEYDOWN, key=key)
+    moves = [ev(k["left"]), ev(k["right"]), ev(k["up"]), ev(k["down"])]
+    mash = random.Random(seed)
+    script = [[mash.choice(moves) for _ in range(mash.randrange(6))] + [ev(k["shoot"])] for _ in range(pieces)]
+    out = {}
+    for cls in (Tetris, BitTetris):
+        games = 0; trace = []
+        g = None; t0 = time.perf_counter()
+        for evs in script:
+            if g is None or g.game_over:
+                if g: trace.append((g.score, g.board))
+                g = cls(clock=SimClock(), seed=seed + games); g.particles = NullParticles(); games += 1
+            for e in evs: g.feed(e)
+        n = len(script)
+        secs = time.perf_counter() - t0
+        trace.append((g.score, g.board))
+        out[cls.__name__] = {"pieces": n, "games": games, "seconds": round(secs, 3),
+                             "pieces_per_s": int(n / secs), "digest": zlib.crc32(repr(trace).encode())}
+    a, b = out["Tetris"], out["BitTetris"]
+    out["identical"] = a["digest"] == b["digest"]
+    out["speedup"] = round(a["seconds"] / b["seconds"], 2)
+    return out
+
+def snake_cycle(g):
+    # Hamiltonian cycle over the board's top rows (all but the last when rows is odd)
+    cols, rows = g.cols, g.rows - (g.rows % 2)
+    cycle = []
+    for y in range(rows):   # serpentine over columns 1.., back up column 0
+        xs = range(1, cols) if y % 2 == 0 else range(cols-1, 0, -1)
+        cycle.extend((x, y) for x in xs)
+    cycle.extend((0, y) for y in range(rows-1, -1, -1))
+    return cycle
+
+def stress_snake(seed=0, bucket=100):
+    """
+    Plays Snake along a Hamiltonian cycle over the top rows (all but the last row when
+    rows is odd), feeding it every tick until the body fills ~97% of the board. Reports
+    the mean update() time per length bucket; it should stay flat as the snake grows.
+    """
+    g = Snake(clock=SimClock(), seed=seed); g.particles = NullParticles()
+    cycle = snake_cycle(g)
+    g.snake = deque([cycle[0]])
+    g.free = FreeCells(g.cols*g.rows); g.free.take(cycle[0][1]*g.cols + cycle[0][0])
+    step = 1000//g.speed + 1
+    times = {}
+    for i in range(1, len(cycle) - 1):
+        nxt = cycle[i]; head = g.snake[0]
+        g.dir = (nxt[0]-head[0], nxt[1]-head[1])
+        g.food = nxt
+        g.clock.advance(step)
+        t0 = time.perf_counter()
+        g.update(step)
+        times.setdefault(len(g.snake)//bucket*bucket, []).append(time.perf_counter() - t0)
+        if g.game_over: break
+    return {"cells": g.cols*g.rows, "length": len(g.snake), "game_over": g.game_over,
+            "us_per_tick": {n: round(sum(t)/len(t)*1e6, 2) for n, t in sorted(times.items())}}
+
+def stress_bricks(frames=3000, seed=0, speed=(17, -23)):
+    """
+    BrickBreaker on generated levels from the stock 9x6 up to 80x60 (4800 bricks) with a
+    fast ball and a paddle that tracks it. Reports mean update() time per level and counts
+    tunnels: brick-free frames whose straight path still overlapped a surviving brick.
+    """
+    def touching(g, x, y):
+        rad = g.ball_r
+        for row in range(int((y - rad - g.by0) // g.bpy), int((y + rad - g.by0) // g.bpy) + 1):
+            for col in range(int((x - rad - g.bx0) // g.bpx), int((x + rad - g.bx0) // g.bpx) + 1):
+                b = g.bricks.get((row, col))
+                if b and (x - max(b.left, min(x, b.right)))**2 + (y - max(b.top, min(y, b.bottom)))**2 < rad*rad:
+                    return True
+        return False
+    rng = random.Random(seed); out = []
+    for level in ((9, 6, 20, 6, 28), (40, 30, 10, 2, 14), (80, 60, 5, 2, 8)):
+        g = BrickBreaker(clock=SimClock(), seed=seed); g.particles = NullParticles()
+        g.make_level(*level)
+        bricks = len(g.bricks); tunnels = 0; total = 0.0; n = 0
+        for _ in range(frames):
+            if g.game_over or not g.bricks: break
+            if not g.launch: g.launch = True; g.ball_v = list(speed)
+            if g.ball_v[1] > 0: g.px = int(g.ball[0]) - g.pw//2 + rng.randint(-50, 50)   # vary the bounce angle
+            x0, y0 = g.ball; before = len(g.bricks)
+            t0 = time.perf_counter()
+            g.update(STEP_MS)
+            total += time.perf_counter() - t0; n += 1
+            if len(g.bricks) == before:
+                x1, y1 = g.ball
+                steps = int(math.hypot(x1 - x0, y1 - y0)) + 1
+                if any(touching(g, x0 + (x1-x0)*i/steps, y0 + (y1-y0)*i/steps) for i in range(steps + 1)):
+                    tunnels += 1
+        out.append({"bricks": bricks, "frames": n, "broken": bricks - len(g.bricks), "tunnels": tunnels,
+                    "us_per_update": round(total / max(1, n) * 1e6, 2)})
+    return out
+
+def bench_collisions(counts=(250, 500, 1000, 2000, 4000), seed=0, reps=5):
+    """
+    Broad-phase benchmark: n enemy-sized rects vs n//2 bullet-sized probes spread over the
+    screen. Times the old nested colliderect loop (up to 2000 entities), a C-level
+    collidelistall scan, SpatialHash.collide (hash path forced) and the games' EntityPool
+    sort-and-sweep; all must agree.
+    """
+    rng = random.Random(seed); out = []
+    for n in counts:
+        rects = [pygame.Rect(rng.randrange(WIDTH), rng.randrange(HEIGHT), 36, 36) for _ in range(n)]
+        probes = [pygame.Rect(rng.randrange(WIDTH), rng.randrange(HEIGHT), 8, 14) for _ in range(n//2)]
+        def nested(): return [(j, i) for j, p in enumerate(probes) for i, r in enumerate(rects) if r.colliderect(p)]
+        def scan(): return [(j, i) for j, p in enumerate(probes) for i in p.collidelistall(rects)]
+        h = SpatialHash(64); h.BRUTE = 0
+        def hashed(): return h.collide(rects, probes)
+        ea, eb = EntityPool(n), EntityPool(n//2)
+        for r in rects: ea.add(*r)
+        for p in probes: eb.add(*p)
+        def swept(): i, j = ea.pairs(eb); return list(zip(j.tolist(), i.tolist()))
+        row = {"entities": n + n//2}; ref = None
+        for name, fn in (("nested", nested), ("collidelistall", scan), ("spatial_hash", hashed), ("sort_sweep", swept)):
+            if name == "nested" and n > 2000: continue
+            t0 = time.perf_counter()
+            for _ in range(reps): pairs = fn()
+            row[name + "_ms"] = round((time.perf_counter() - t0) / reps * 1000, 3)
+            pairs = sorted(pairs)
+            if ref is None: ref = pairs; row["pairs"] = len(pairs)
+            elif pairs != ref: raise AssertionError(f"{name} disagrees at n={n}")
+        out.append(row)
+    return out
+
+def bench_input(game="Tetris", seconds=5.0, rate=8.0, seed=0):
+    """
+    Input-to-present latency through the real frame loop (dummy display): a thread posts
+    key presses at ~rate per second, each stamped with its post time, so the numbers
+    include time spent queued. Runs once with the wake-on-input pacer and once with fixed
+    pacing; reports p50/p95/max ms for each.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    setup()
+    cls = dict(GAMES)[game]; out = {"game": game, "fps": BaseGame.fps}
+    for wake in (True, False):
+        DIRECTOR.wake_on_input = wake
+        g = cls(SETTINGS.get("difficulty", "Normal")); PROFILER.latency.pop(g.name, None)
+        DIRECTOR.push(g)
+        stop = threading.Event()
+        def poster(rng=random.Random(seed)):
+            while not stop.wait(rng.expovariate(rate)):
+                key = SETTINGS["keys"][rng.choice(FUZZ_ACTIONS)]
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, t=time.perf_counter()))
+                pygame.event.post(pygame.event.Event(pygame.KEYUP, key=key, t=time.perf_counter()))
+        t = threading.Thread(target=poster, daemon=True); t.start()
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end and DIRECTOR.top is g: DIRECTOR.frame()
+        stop.set(); t.join()
+        while DIRECTOR.stack: DIRECTOR.pop()
+        lat = FrameProfiler.pct(PROFILER.latency.get(g.name, ()), 50, 95, 100)
+        out["wake" if wake else "fixed"] = {"events": len(PROFILER.latency.get(g.name, ())),
+                                            **dict(zip(("p50_ms", "p95_ms", "max_ms"), (round(v, 2) for v in lat)))}
+    DIRECTOR.wake_on_input = True
+    return out
+
+# ---------- Benchmark suite ----------
+# Worst-case scenes for every hot path. A scene builder returns (update, draw, reset):
+# update(dt_ms) and draw(surf) are timed, reset() runs between frames outside the timers
+# and puts the scene back at its worst case (refill entities, revive the game, ...).
+def _bench_game(cls, seed):
+    g = cls(clock=SimClock(), seed=seed); g.particles = NullParticles()
+    return g
+
+def scene_tetris(seed):
+    # board filled up to row 2 with one hole per row, a piece falling every frame and the
+    # retained view invalidated so each draw is a full repaint
+    g = _bench_game(BitTetris, seed); rng = random.Random(seed)
+    g.gravity = 0
+    rows = {}
+    for r in range(2, g.rows):
+        hole = rng.randrange(g.cols)
+        rows[r] = ([0 if c == hole else rng.randint(1,7) for c in range(g.cols)], g.full & ~(1 << hole))
+    def reset():
+        if g.game_over or not g.bits[2]:
+            g.game_over = False
+            for r, (row, bits) in rows.items(): g.board[r] = row[:]; g.bits[r] = bits
+            g.board[0] = [0]*g.cols; g.board[1] = [0]*g.cols; g.bits[0] = g.bits[1] = 0
+        g.invalidate()
+    reset()
+    return g.update, g.draw, reset
+
+def scene_bricks(seed):
+    # 80x60 generated level (4800 bricks) with a fast ball; refilled once a tenth is gone
+    g = _bench_game(BrickBreaker, seed)
+    g.make_level(80, 60, 5, 2, 8)
+    full = dict(g.bricks); n = len(full)
+    def reset():
+        if len(g.bricks) < n*0.9: g.bricks = dict(full)
+        g.lives = 3; g.game_over = False
+        if not g.launch: g.launch = True; g.ball_v = [17, -23]
+        g.px = int(g.ball[0]) - g.pw//2
+    reset()
+    return g.update, g.draw, reset
+
+def scene_cars(seed, n=150):
+    # n obstacles spread over all lanes, crashes ignored
+    g = _bench_game(CarAvoid, seed); rng = random.Random(seed)
+    w = g.lw - 60
+    for lane in (rng.randrange(g.lanes) for _ in range(n)):
+        g.obstacles.add(lane*g.lw + (g.lw - w)//2, rng.randrange(-90, HEIGHT), w, 70)
+    spots = g.obstacles.a.copy(); full = g.obstacles.n
+    def reset():
+        g.obstacles.a[:] = spots; g.obstacles.n = full
+        g.game_over = False
+    reset()
+    return g.update, g.draw, reset
+
+def scene_snake(seed, length=1000):
+    # a length-segment snake chasing its tail round a Hamiltonian cycle, moving every frame
+    g = _bench_game(Snake, seed)
+    cycle = snake_cycle(g); pos = {c: i for i, c in enumerate(cycle)}
+    g.snake = deque(reversed(cycle[:length]))
+    g.free = FreeCells(g.cols*g.rows)
+    for x, y in g.snake: g.free.take(y*g.cols + x)
+    off = [(x, y) for y in range(g.rows) for x in range(g.cols) if (x, y) not in pos]
+    g.food = off[0] if off else None   # never eaten, so the length stays put
+    step = 1000//g.speed + 1
+    def reset():
+        head = g.snake[0]; nxt = cycle[(pos[head] + 1) % len(cycle)]
+        g.dir = (nxt[0]-head[0], nxt[1]-head[1])
+        g.last_move = g.clock.ticks() - step
+    reset()
+    return g.update, g.draw, reset
+
+def scene_shooter(seed, enemies=500, bullets=200):
+    # enemies and bullets scattered over the screen, restored every frame
+    g = _bench_game(SpaceShooter, seed); rng = random.Random(seed)
+    for _ in range(enemies): g.enemies.add(rng.randint(40, WIDTH-80), rng.randrange(-40, HEIGHT-160), 36, 36, vy=3)
+    for _ in range(bullets): g.bullets.add(rng.randrange(WIDTH), rng.randrange(60, HEIGHT-140), 8, 14, vy=-10)
+    es, bs = g.enemies.a.copy(), g.bullets.a.copy()
+    def reset():
+        g.enemies.a[:] = es; g.enemies.n = enemies
+        g.bullets.a[:] = bs; g.bullets.n = bullets
+        g.lives = 3; g.game_over = False
+    reset()
+    return g.update, g.draw, reset
+
+def scene_particles(seed, n=5000):
+    # a pool topped back up to n live particles every frame
+    p = Particles(cap=max(Particles.CAP, n)); p.rng = np.random.default_rng(seed)
+    rng = random.Random(seed); cols = [COLS["accent"], COLS["danger"], COLS["good"], (245,188,66)]
+    def reset():
+        while len(p) < n:
+            p.emit(rng.randrange(WIDTH), rng.randrange(HEIGHT), n=min(50, n - len(p)), color=rng.choice(cols))
+    reset()
+    return (lambda dt: p.update(dt / 1000.0)), p.draw, reset
+
+def scene_text(seed):
+    # every game's HUD line with a score that changes each frame, plus the menu labels
+    st = {"score": 0}
+    def update(dt): st["score"] += 37
+    def draw(surf):
+        s = st["score"]
+        surf.fill(COLS["bg"])
+        for i, (name, _) in enumerate(GAMES):
+            draw_text(surf, f"{name}  Score:{s}  Lives:{s % 4}", WIDTH//2, 34 + i*40, BIG, COLS["white"], center=True, glyphs=True)
+            draw_text(surf, name, 140, 300 + i*60, BIG, COLS["accent"])
+        draw_text(surf, "Difficulty: Normal", 120, HEIGHT-40, FONT, COLS["muted"])
+        draw_text(surf, "Arcade - Fixed Collection", WIDTH//2, 36, XL, COLS["accent"], center=True)
+    return update, draw, (lambda: None)
+
+BENCH_SCENES = {"tetris_full": scene_tetris, "bricks_4800": scene_bricks, "cars_150": scene_cars,
+                "snake_1000": scene_snake, "shooter_500x200": scene_shooter,
+                "particles_5k": scene_particles, "draw_text": scene_text}
+BENCH_LIMITS = {"time": 1.25, "time_slack_ms": 0.05, "alloc": 1.5, "alloc_slack_kb": 1.0}
+
+def bench_scene(name, frames=300, seed=0, alloc_frames=60):
+    """
+    Runs one scene: a timed pass (update and draw each timed separately) and a shorter
+    tracemalloc pass that records the bytes allocated per frame (peak above the start)
+    and how much traced memory the pass as a whole left behind, per frame.
+    """
+    import gc, tracemalloc
+    surf = setup(headless=True)
+    update, draw, reset = BENCH_SCENES[name](seed)
+    for _ in range(10): update(STEP_MS); draw(surf); reset()   # warm caches
+    gc.collect()
+    up = []; dr = []; pc = time.perf_counter
+    for _ in range(frames):
+        t0 = pc(); update(STEP_MS); t1 = pc(); draw(surf); t2 = pc()
+        up.append((t1 - t0)*1000); dr.append((t2 - t1)*1000)
+        reset()
+    churn = []
+    tracemalloc.start()
+    update(STEP_MS); draw(surf); reset()   # so per-frame state replaced in place nets out
+    start = tracemalloc.get_traced_memory()[0]
+    for _ in range(alloc_frames):
+        tracemalloc.reset_peak(); base = tracemalloc.get_traced_memory()[0]
+        update(STEP_MS); draw(surf)
+        churn.append(tracemalloc.get_traced_memory()[1] - base)
+        reset()
+    kept = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    u50, u95 = FrameProfiler.pct(up, 50, 95); d50, d95 = FrameProfiler.pct(dr, 50, 95)
+    return {"scene": name, "frames": frames,
+            "update_ms_p50": round(u50, 4), "update_ms_p95": round(u95, 4),
+            "draw_ms_p50": round(d50, 4), "draw_ms_p95": round(d95, 4),
+            "alloc_kb": round(sum(churn) / len(churn) / 1024, 2),
+            "kept_b_per_frame": round(kept / alloc_frames, 1)}
+
+def bench_compare(row, base, limits):
+    # metrics of row that regressed past the baseline's limits, as readable strings
+    bad = []
+    for k, v in row.items():
+        if k not in base or not k.endswith(("_ms_p50", "_ms_p95", "alloc_kb")): continue
+        t = "alloc" if k == "alloc_kb" else "time"
+        cap = base[k]*limits[t] + limits[t + ("_slack_kb" if t == "alloc" else "_slack_ms")]
+        if v > cap: bad.append(f"{row['scene']}.{k} {v} > {round(cap, 4)} (baseline {base[k]})")
+    return bad
+
+def bench_suite(names=None, frames=300, seed=0, baseline=None, save=None):
+    """
+    Runs the named scenes (default all), prints one JSON row each and, given a baseline
+    file, checks every timing and allocation figure against it. save writes the rows as a
+    new baseline with the default limits (edit "limits" in the file to loosen them).
+    Returns the list of regressions, empty when everything is within limits.
+    """
+    import platform
+    base = load_json(Path(baseline), None) if baseline else None
+    if baseline and base is None: raise SystemExit(f"no baseline at {baseline}")
+    limits = dict(BENCH_LIMITS, **(base or {}).get("limits", {}))
+    rows = {}; bad = []
+    for name in names or BENCH_SCENES:
+        if name not in BENCH_SCENES: raise SystemExit(f"unknown scene {name!r}; pick from {', '.join(BENCH_SCENES)}")
+        row = rows[name] = bench_scene(name, frames, seed)
+        if base and name in base["scenes"]:
+            miss = bench_compare(row, base["scenes"][name], limits)
+            if miss:   # one retry, keeping the better figure, so a noisy neighbour isn't a regression
+                again = bench_scene(name, frames, seed)
+                row = rows[name] = {k: min(v, again[k]) if isinstance(v, float) else v for k, v in row.items()}
+                bad += bench_compare(row, base["scenes"][name], limits)
+        print(json.dumps(row))
+    if save:
+        atomic_write(Path(save), json.dumps({"machine": platform.machine(), "python": platform.python_version(),
+                                       "pygame": pygame.version.ver, "numpy": np.__version__,
+                                       "frames": frames, "seed": seed, "limits": limits, "scenes": rows}, indent=2))
+    for b in bad: print("REGRESSION", b, file=sys.stderr)
+    return bad
+
+def bench_leaderboard(rows=1000000, seed=0, path=None, reps=200):
+    """
+    Fill a leaderboard with `rows` random scores from 20 cabinets over the last year, then
+    time the reads the UI and tools make with the cache bypassed (ms per call, mean of reps).
+    """
+    rng = random.Random(seed); now = int(time.time())
+    lb = Leaderboard(path or ":memory:", "bench")
+    games = [name for name, _ in GAMES]
+    t0 = time.perf_counter()
+    for start in range(0, rows, 100000):
+        lb.insert_many([(rng.choice(games), int(rng.expovariate(1/2000)), "BEN", "Normal", now - rng.randrange(365*86400),
+                         f"cab{i % 20}", i) for i in range(start, min(rows, start + 100000))])
+    out = {"rows": rows, "load_s": round(time.perf_counter() - t0, 2)}
+    calls = {"top10": lambda: lb.top("Tetris", 10), "top10_page100": lambda: lb.top("Tetris", 10, 100),
+             "today": lambda: lb.top("Tetris", 10, 0, "Today"), "week": lambda: lb.top("Tetris", 10, 0, "This week"),
+             "rank_median": lambda: lb.rank("Tetris", 1400), "rank_top": lambda: lb.rank("Tetris", 20000)}
+    for name, fn in calls.items():
+        t0 = time.perf_counter()
+        for _ in range(reps): lb.cache.clear(); fn()
+        out[name + "_ms"] = round((time.perf_counter() - t0) / reps * 1000, 3)
+    t0 = time.perf_counter()
+    for _ in range(reps): lb.best("Tetris")
+    out["cached_us"] = round((time.perf_counter() - t0) / reps * 1e6, 2)
+    lb.close()
+    return out
+
+# ---------- Training environments ----------
+# observations: one fixed-shape NumPy array per game, built from game state only
+def obs_tetris(g):
+    o = (np.array(g.board, np.int8) != 0).astype(np.int8)
+    cur = g.cur
+    for r, row in enumerate(cur["shape"]):
+        for c, v in enumerate(row):
+            if v and 0 <= cur["y"] + r < g.rows: o[cur["y"] + r, cur["x"] + c] = 2
+    return o
+
+def obs_snake(g):
+    o = np.zeros((g.rows, g.cols), np.int8)
+    body = np.array(g.snake, np.int32)
+    o[body[:, 1], body[:, 0]] = 1
+    o[body[0, 1], body[0, 0]] = 2
+    if g.food: o[g.food[1], g.food[0]] = 3
+    return o
+
+def obs_cars(g, cell=40):
+    # lanes x rows of cell px: 1 obstacle, 2 player
+    o = np.zeros((HEIGHT // cell, g.lanes), np.int8)
+    ob = g.obstacles; n = ob.n
+    for x, y, w, h in zip(ob.x[:n].tolist(), ob.y[:n].tolist(), ob.w[:n].tolist(), ob.h[:n].tolist()):
+        o[max(0, y // cell):max(0, (y + h - 1) // cell + 1), (x + w//2) // g.lw] = 1
+    o[g.player_y // cell:(g.player_y + 99) // cell + 1, g.player_lane] = 2
+    return o
+
+def obs_bricks(g):
+    # paddle x, ball x/y, ball velocity (scaled to ~[-1, 1]), then one flag per brick cell
+    head = np.array([g.px / WIDTH, g.ball[0] / WIDTH, g.ball[1] / HEIGHT, g.ball_v[0] / 10, g.ball_v[1] / 10], np.float32)
+    cells = np.zeros(g.brows * g.bcols, np.float32)
+    if g.bricks: cells[[r * g.bcols + c for r, c in g.bricks]] = 1
+    return np.concatenate([head, cells])
+
+def obs_shooter(g, cell=40):
+    # screen in cell px squares: 1 enemy, 2 bullet, 3 player
+    o = np.zeros((HEIGHT // cell, WIDTH // cell), np.int8)
+    rows, cols = o.shape
+    for v, pool in ((1, g.enemies), (2, g.bullets)):
+        for x, y, w, h in zip(*pool.a[:4, :pool.n].tolist()):
+            y = (y + h//2) // cell; x = (x + w//2) // cell
+            if 0 <= y < rows and 0 <= x < cols: o[y, x] = v
+    o[g.player.centery // cell, g.player.centerx // cell] = 3
+    return o
+
+OBSERVERS = {"Tetris": obs_tetris, "Snake": obs_snake, "Car Avoid": obs_cars,
+             "Brick Breaker": obs_bricks, "Space Shooter": obs_shooter}
+
+class ArcadeEnv:
+    """
+    Gym-style env over one game: reset(seed) -> obs, step(action) -> (obs, reward, done,
+    info). The env owns its game, SimClock, RNG and a NullParticles and never draws, so
+    any number can run in one process. An action is an index into ACTIONS, held for
+    frame_skip fixed steps; reward is the score gained, done is game over (or max_steps).
+    """
+    ACTIONS = ("noop", "left", "right", "up", "down", "shoot")
+
+    def __init__(self, game, difficulty="Normal", seed=0, frame_skip=1, max_steps=None):
+        self.cls = dict(GAMES)[game]; self.observe = OBSERVERS[game]
+        self.difficulty = difficulty; self.frame_skip = frame_skip; self.max_steps = max_steps
+        self.seed = seed
+        k = SETTINGS["keys"]
+        self.events = [None] + [(pygame.event.Event(pygame.KEYDOWN, key=k[a]), pygame.event.Event(pygame.KEYUP, key=k[a]))
+                                for a in self.ACTIONS[1:]]
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        if seed is not None: self.seed = seed
+        self.game = self.cls(self.difficulty, clock=SimClock(), seed=self.seed)
+        self.game.particles = NullParticles()
+        self.steps = 0
+        return self.observe(self.game)
+
+    def step(self, action):
+        g = self.game; ev = self.events[action]; before = g.score
+        for _ in range(self.frame_skip):
+            if ev: g.feed(ev[0])
+            g.advance(STEP_MS)
+            if ev: g.feed(ev[1])
+            if g.game_over: break
+        self.steps += 1
+        truncated = self.max_steps is not None and self.steps >= self.max_steps
+        return (self.observe(g), float(g.score - before), g.game_over or truncated,
+                {"score": g.score, "steps": self.steps, "truncated": truncated and not g.game_over})
+
+def _vec_worker(conn, game, seeds, stride, difficulty, frame_skip, max_steps):
+    envs = [ArcadeEnv(game, difficulty, s, frame_skip, max_steps) for s in seeds]
+    while True:
+        cmd, data = conn.recv()
+        if cmd == "step":
+            obs = []; rew = np.zeros(len(envs), np.float32); done = np.zeros(len(envs), bool); scores = []
+            for i, (env, a) in enumerate(zip(envs, data)):
+                o, rew[i], done[i], info = env.step(int(a))
+                if done[i]:
+                    scores.append(info["score"]); o = env.reset(env.seed + stride)
+                obs.append(o)
+            conn.send((np.stack(obs), rew, done, scores))
+        elif cmd == "reset":
+            conn.send(np.stack([e.reset() for e in envs]))
+        else:
+            conn.close(); return
+
+class VecEnv:
+    """
+    n ArcadeEnvs stepped in lockstep, split across worker processes (one Pipe each).
+    step(actions[n]) -> (obs[n, ...], reward[n], done[n], finished episode scores); an
+    env that finishes is reset straight away on seed + n, so runs are reproducible.
+    workers=0 steps everything in this process.
+    """
+    def __init__(self, game, n, workers=None, seed=0, difficulty="Normal", frame_skip=1, max_steps=None):
+        import multiprocessing as mp
+        self.n = n
+        workers = min(n, os.cpu_count() or 1) if workers is None else min(workers, n)
+        seeds = [seed + i for i in range(n)]
+        self.conns = []; self.procs = []
+        if not workers:
+            self.envs = [ArcadeEnv(game, difficulty, s, frame_skip, max_steps) for s in seeds]
+            return
+        self.envs = None
+        parts = [seeds[i::workers] for i in range(workers)]
+        self.order = np.argsort(np.concatenate(parts) - seed)   # worker-major -> env order
+        for part in parts:
+            a, b = mp.Pipe()
+            p = mp.Process(target=_vec_worker, args=(b, game, part, n, difficulty, frame_skip, max_steps), daemon=True)
+            p.start(); b.close()
+            self.conns.append(a); self.procs.append(p)
+
+    def reset(self):
+        if self.envs is not None: return np.stack([e.reset(e.seed) for e in self.envs])
+        for c in self.conns: c.send(("reset", None))
+        return np.concatenate([c.recv() for c in self.conns])[self.order]
+
+    def step(self, actions):
+        if self.envs is not None:
+            obs = []; rew = np.zeros(self.n, np.float32); done = np.zeros(self.n, bool); scores = []
+            for i, (env, a) in enumerate(zip(self.envs, actions)):
+                o, rew[i], done[i], info = env.step(int(a))
+                if done[i]:
+                    scores.append(info["score"]); o = env.reset(env.seed + self.n)
+                obs.append(o)
+            return np.stack(obs), rew, done, scores
+        w = len(self.conns)
+        actions = np.asarray(actions)
+        for i, c in enumerate(self.conns): c.send(("step", actions[i::w].tolist()))
+        obs, rew, done, scores = [], [], [], []
+        for c in self.conns:
+            o, r, d, s = c.recv()
+            obs.append(o); rew.append(r); done.append(d); scores += s
+        k = self.order
+        return np.concatenate(obs)[k], np.concatenate(rew)[k], np.concatenate(done)[k], scores
+
+    def close(self):
+        for c in self.conns:
+            c.send(("close", None)); c.close()
+        for p in self.procs: p.join(timeout=5)
+
+def bench_env(game, n=64, workers=None, steps=2000, seed=0, frame_skip=1):
+    """Random-action throughput of VecEnv in env steps per second (one env step = frame_skip updates)."""
+    rng = np.random.default_rng(seed)
+    v = VecEnv(game, n, workers, seed, frame_skip=frame_skip)
+    try:
+        obs = v.reset(); episodes = 0
+        t0 = time.perf_counter()
+        for _ in range(steps):
+            obs, rew, done, scores = v.step(rng.integers(len(ArcadeEnv.ACTIONS), size=n))
+            episodes += len(scores)
+        secs = time.perf_counter() - t0
+    finally:
+        v.close()
+    return {"game": game, "envs": n, "workers": len(v.conns), "frame_skip": frame_skip, "obs_shape": list(obs.shape[1:]),
+            "episodes": episodes, "steps_per_s": int(n * steps / secs)}
+
+# ---------- Spectator streaming ----------
+# Wire format, little-endian. The server greets with STREAM_MAGIC + u8 version, then sends
+# frames: u32 payload length, u32 frame id, u32 base id (0: keyframe), u32 crc32 of the full
+# snapshot, then zlib(snapshot) for a keyframe or zlib(snapshot XOR base) for a delta (the
+# base zero-padded or cut to the snapshot's length). Viewers answer each frame they have
+# rebuilt with a u32 ack of its id.
+STREAM_MAGIC = b"ARCS"; STREAM_VERSION = 1
+STREAM_HDR = struct.Struct("<IIII")
+STREAM_ACK = struct.Struct("<I")
+SNAP_HEAD = struct.Struct("<BiB")   # game index in GAMES, score, game over
+
+def snap_tetris(g):
+    # board cells (colour 0-7) row-major, then the falling piece: x, y, colour, h, w, cells
+    cur = g.cur; shape = cur["shape"]
+    return (bytes(v for row in g.board for v in row) + struct.pack("<bbBBB", cur["x"], cur["y"], cur["val"], len(shape), len(shape[0]))
+            + bytes(1 if v else 0 for row in shape for v in row))
+
+def snap_snake(g):
+    # a grid rather than the body list: the body shifts one cell a tick, a grid changes in two
+    grid = bytearray(g.rows * g.cols)
+    for x, y in g.snake: grid[y * g.cols + x] = 1
+    x, y = g.snake[0]; grid[y * g.cols + x] = 2
+    if g.food: grid[g.food[1] * g.cols + g.food[0]] = 3
+    return bytes(grid)
+
+def snap_shooter(g):
+    # player x, y, then per pool (enemies, bullets) u16 count and int16 x, y pairs
+    out = [struct.pack("<hh", g.player.x, g.player.y)]
+    for pool in (g.enemies, g.bullets):
+        out.append(struct.pack("<H", pool.n)); out.append(pool.a[:2, :pool.n].T.astype("<i2").tobytes())
+    return b"".join(out)
+
+SNAPSHOTS = {"Tetris": snap_tetris, "Snake": snap_snake, "Space Shooter": snap_shooter}
+
+def snapshot(g):
+    """compact binary state of a streamable game (None for the others)"""
+    fn = SNAPSHOTS.get(g.name)
+    if fn is None: return None
+    return SNAP_HEAD.pack([n for n, _ in GAMES].index(g.name), g.score, g.game_over) + fn(g)
+
+def snapshot_head(snap):
+    """(game name, score, game over) of a snapshot"""
+    i, score, over = SNAP_HEAD.unpack_from(snap)
+    return GAMES[i][0], score, bool(over)
+
+def xor_bytes(a, b):
+    # a XOR b, with b zero-padded or cut to len(a); applying it twice gives a back
+    out = np.frombuffer(a, np.uint8).copy()
+    m = min(len(a), len(b))
+    out[:m] ^= np.frombuffer(b, np.uint8, m)
+    return out.tobytes()
+
+class StreamViewer:
+    """server-side state of one spectator connection"""
+    def __init__(self, writer, rate):
+        self.writer = writer
+        self.ack = 0                 # newest frame id the viewer has rebuilt
+        self.inflight = deque()      # ids sent but not acked yet
+        self.last = -1e9             # loop time of the last send
+        self.tokens = rate; self.refill = 0.0
+        self.stalled = 0.0           # loop time the send buffer went over HIGH_WATER (0: it isn't)
+        self.sent = 0
+
+class StreamServer:
+    """
+    Streams the live game to any number of spectators over asyncio TCP. publish(game) runs
+    on the game thread once per frame and only builds the snapshot; the event loop thread
+    does the rest. Each viewer gets a delta against the newest snapshot it acknowledged, or
+    a keyframe once that has fallen out of the last HISTORY; a delta is encoded once per base
+    and shared by every viewer on that base, so CPU grows with distinct acks, not viewers.
+
+    Per viewer, sends are capped at `hz` and by a `rate` bytes/s token bucket, and skipped
+    while WINDOW frames are unacknowledged or more than HIGH_WATER bytes are still unsent
+    (a slow viewer; the window catches it even when the socket buffers are huge). Skipping
+    never queues anything: the next frame that goes out is a delta from the viewer's ack.
+    A viewer held back that way for STALL_S is disconnected, as are viewers past max_viewers.
+    """
+    HISTORY = 64; WINDOW = 8; HIGH_WATER = 64 * 1024; STALL_S = 5.0
+
+    def __init__(self, host="127.0.0.1", port=0, hz=30, rate=64 * 1024, max_viewers=1024):
+        self.host = host; self.port = port; self.hz = hz; self.rate = rate; self.max_viewers = max_viewers
+        self.viewers = set()
+        self.history = OrderedDict()   # frame id -> snapshot
+        self.fid = 0
+        self.stats = {"frames": 0, "keyframes": 0, "deltas": 0, "bytes": 0, "skip_rate": 0, "skip_slow": 0,
+                      "dropped": 0, "frame_ms": deque(maxlen=1000)}
+        self.loop = None; self.thread = None
+
+    def start(self):
+        """serve on a daemon thread; returns the bound port"""
+        import asyncio
+        ready = threading.Event()
+        async def main():
+            self.server = await asyncio.start_server(self._viewer, self.host, self.port)
+            self.port = self.server.sockets[0].getsockname()[1]
+            ready.set()
+            async with self.server: await self.server.serve_forever()
+        def run():
+            self.loop = asyncio.new_event_loop()
+            try: self.loop.run_until_complete(main())
+            except BaseException: pass   # cancelled by stop()
+        self.thread = threading.Thread(target=run, name="stream", daemon=True)
+        self.thread.start(); ready.wait(5)
+        return self.port
+
+    def stop(self):
+        import asyncio
+        if self.loop:
+            for v in list(self.viewers): self.loop.call_soon_threadsafe(v.writer.close)
+            self.loop.call_soon_threadsafe(lambda: [t.cancel() for t in asyncio.all_tasks(self.loop)])
+            self.thread.join(5); self.loop = None
+
+    def publish(self, game):
+        if self.loop is None or not self.viewers: return
+        snap = snapshot(game)
+        if snap is not None:
+            self.fid += 1
+            self.loop.call_soon_threadsafe(self._frame, self.fid, snap)
+
+    async def _viewer(self, reader, writer):
+        import asyncio
+        if len(self.viewers) >= self.max_viewers:
+            self.stats["dropped"] += 1; writer.close(); return
+        v = StreamViewer(writer, self.rate); v.refill = self.loop.time()
+        self.viewers.add(v)
+        writer.write(STREAM_MAGIC + bytes([STREAM_VERSION]))
+        try:
+            while True:
+                fid, = STREAM_ACK.unpack(await reader.readexactly(STREAM_ACK.size))
+                if fid > v.ack: v.ack = fid
+                while v.inflight and v.inflight[0] <= fid: v.inflight.popleft()
+        except (OSError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.viewers.discard(v); writer.close()
+
+    def _frame(self, fid, snap):
+        t0 = time.perf_counter()
+        self.history[fid] = snap
+        while len(self.history) > self.HISTORY: self.history.popitem(last=False)
+        now = self.loop.time(); encoded = {}
+        for v in list(self.viewers): self._offer(v, fid, snap, now, encoded)
+        self.stats["frames"] += 1
+        self.stats["frame_ms"].append((time.perf_counter() - t0) * 1000)
+
+    def _offer(self, v, fid, snap, now, encoded):
+        st = self.stats
+        if now - v.last < 0.9 / self.hz:   # a little slack so frame jitter doesn't halve the rate
+            st["skip_rate"] += 1; return
+        if len(v.inflight) >= self.WINDOW or v.writer.transport.get_write_buffer_size() > self.HIGH_WATER:
+            v.stalled = v.stalled or now
+            if now - v.stalled > self.STALL_S:
+                st["dropped"] += 1; self.viewers.discard(v); v.writer.transport.abort()
+            else:
+                st["skip_slow"] += 1
+            return
+        v.stalled = 0.0
+        v.tokens = min(self.rate, v.tokens + (now - v.refill) * self.rate); v.refill = now
+        if v.tokens <= 0:
+            st["skip_rate"] += 1; return
+        base = v.ack if v.ack in self.history and v.ack != fid else 0
+        data = encoded.get(base)
+        if data is None:
+            body = zlib.compress(xor_bytes(snap, self.history[base]) if base else snap, 1)
+            data = encoded[base] = STREAM_HDR.pack(len(body), fid, base, zlib.crc32(snap)) + body
+        v.writer.write(data); v.inflight.append(fid)
+        v.tokens -= len(data); v.last = now; v.sent += len(data)
+        st["deltas" if base else "keyframes"] += 1; st["bytes"] += len(data)
+
+class StreamClient:
+    """
+    Spectator side: reads frames, rebuilds each snapshot from its base (checking the crc)
+    and acks it. `snap` is the newest snapshot; on_frame(snap) is called for every one.
+    """
+    KEEP = 2 * StreamServer.HISTORY
+
+    def __init__(self, on_frame=None):
+        self.on_frame = on_frame
+        self.snaps = OrderedDict()   # frame id -> snapshot, bases for later deltas
+        self.snap = None
+        self.stats = {"frames": 0, "bytes": 0, "bad": 0, "keyframes": 0}
+
+    async def run(self, host, port, seconds=None, pause=0.0):
+        """watch until the server closes (or for `seconds`); pause sleeps before every read (a slow viewer)"""
+        import asyncio
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            if await reader.readexactly(len(STREAM_MAGIC) + 1) != STREAM_MAGIC + bytes([STREAM_VERSION]):
+                raise ValueError("not an arcade stream")
+            end = None if seconds is None else asyncio.get_running_loop().time() + seconds
+            while end is None or asyncio.get_running_loop().time() < end:
+                if pause: await asyncio.sleep(pause)
+                n, fid, base, crc = STREAM_HDR.unpack(await reader.readexactly(STREAM_HDR.size))
+                body = zlib.decompress(await reader.readexactly(n))
+                self.stats["bytes"] += STREAM_HDR.size + n
+                if base:
+                    if base not in self.snaps: self.stats["bad"] += 1; continue
+                    body = xor_bytes(body, self.snaps[base])
+                else:
+                    self.stats["keyframes"] += 1
+                if zlib.crc32(body) != crc: self.stats["bad"] += 1; continue
+                self.snaps[fid] = self.snap = body
+                while len(self.snaps) > self.KEEP: self.snaps.popitem(last=False)
+                self.stats["frames"] += 1
+                writer.write(STREAM_ACK.pack(fid))
+                if self.on_frame: self.on_frame(body)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+def stream_load_test(game, clients=200, seconds=10.0, slow=0.1, seed=0, hz=30, rate=64 * 1024):
+    """
+    Loopback load test: a StreamServer on localhost fed by a fuzzed headless game at 60 FPS,
+    with `clients` StreamClients in one event loop, `slow` of them reading only every half
+    second. Reports per-frame server cost, per-viewer bandwidth and whether every rebuilt
+    snapshot matched its crc.
+    """
+    import asyncio
+    table = dict(GAMES)
+    srv = StreamServer(hz=hz, rate=rate, max_viewers=clients + 1)
+    port = srv.start()
+    vs = [StreamClient() for _ in range(clients)]
+    nslow = int(clients * slow)
+    async def watch():
+        await asyncio.gather(*(c.run("127.0.0.1", port, seconds, 0.5 if i < nslow else 0.0) for i, c in enumerate(vs)))
+    t = threading.Thread(target=lambda: asyncio.run(watch()), daemon=True); t.start()
+    while len(srv.viewers) < clients and t.is_alive(): time.sleep(0.01)
+    h = Headless(table[game], seed=seed)
+    mash = random.Random(seed ^ 0x5EED)
+    t0 = time.perf_counter(); frames = 0; pub = 0.0
+    while t.is_alive() and time.perf_counter() - t0 < seconds + 5:
+        ev = []
+        if mash.random() < 0.15: ev.append((mash.choice(FUZZ_ACTIONS), True))
+        g = h.step(ev)
+        if g.game_over: h.reset(h.seed + 1)
+        p0 = time.perf_counter(); srv.publish(h.game); pub += time.perf_counter() - p0
+        frames += 1
+        time.sleep(max(0.0, t0 + frames * STEP_MS / 1000 - time.perf_counter()))
+    t.join(); srv.stop()
+    secs = time.perf_counter() - t0
+    fast, slow_c = vs[nslow:] or vs, vs[:nslow] or vs
+    st = srv.stats; fm = sorted(st["frame_ms"]) or [0]
+    kbps = lambda cs: round(sum(c.stats["bytes"] for c in cs) / len(cs) / seconds / 1024, 2)
+    return {"game": game, "clients": clients, "slow": nslow, "frames": frames, "publish_ms": round(pub / frames * 1000, 4),
+            "frame_ms_p50": round(fm[len(fm)//2], 3), "frame_ms_p95": round(fm[int(len(fm)*0.95)], 3),
+            "keyframes": st["keyframes"], "deltas": st["deltas"], "skip_rate": st["skip_rate"], "skip_slow": st["skip_slow"],
+            "dropped": st["dropped"], "kb_per_s_fast": kbps(fast), "kb_per_s_slow": kbps(slow_c),
+            "fps_fast": round(sum(c.stats["frames"] for c in fast) / len(fast) / seconds, 1),
+            "bad": sum(c.stats["bad"] for c in vs), "seconds": round(secs, 2)}
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Arcade - Fixed Collection")
+    ap.add_argument("--headless", metavar="GAME", help="simulate GAME (menu name, or 'all') with no display and exit")
+    ap.add_argument("--frames", type=int, default=36000, help="frames to simulate per game (default: 10 min at 60 FPS)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--difficulty", default="Normal", choices=["Easy","Normal","Hard"])
+    ap.add_argument("--fuzz", action="store_true", help="mash random keys (seeded) while simulating")
+    ap.add_argument("--render", action="store_true", help="also draw every frame (offscreen with --headless, in the window with --replay)")
+    ap.add_argument("--bench-tetris", type=int, metavar="PIECES", help="compare the list and bitboard Tetris cores and exit")
+    ap.add_argument("--stress-snake", action="store_true", help="grow a near-board-filling snake, report tick times and exit")
+    ap.add_argument("--bench-collide", action="store_true", help="benchmark the collision broad phase and exit")
+    ap.add_argument("--record", metavar="DIR", help="write an input recording of every game session to DIR")
+    ap.add_argument("--replay", nargs="+", metavar="FILE", help="replay input recordings (use --render to watch at 1x) and exit")
+    ap.add_argument("--profile", metavar="TRACE", help="record per-frame phase timings; written to TRACE (.csv or .json) on exit")
+    ap.add_argument("--check-replay", action="store_true", help="record every game on remapped keys, check the recordings replay exactly and exit")
+    ap.add_argument("--check-telemetry", action="store_true", help="rotate telemetry files past their keep limit, check only the newest are left and exit")
+    ap.add_argument("--stress-bricks", action="store_true", help="run Brick Breaker on huge levels with a fast ball and exit")
+    ap.add_argument("--bench", nargs="*", metavar="SCENE", help=f"run the worst-case benchmark suite (all scenes, or some of: {', '.join(BENCH_SCENES)}) and exit")
+    ap.add_argument("--bench-frames", type=int, default=300, help="timed frames per benchmark scene")
+    ap.add_argument("--baseline", metavar="FILE", help="with --bench: fail (exit 1) on regressions against this baseline")
+    ap.add_argument("--save-baseline", metavar="FILE", help="with --bench: write the results as a new baseline")
+    ap.add_argument("--attract", type=float, metavar="SECONDS", help=f"menu idle time before the demo starts (default {ATTRACT_MS//1000}, 0 disables)")
+    ap.add_argument("--fps", type=int, help=f"render rate in games (default {FPS}); game speed stays the same")
+    ap.add_argument("--bench-env", metavar="GAME", help="measure training-env throughput for GAME (random actions) and exit")
+    ap.add_argument("--envs", type=int, default=64, help="environments for --bench-env")
+    ap.add_argument("--workers", type=int, help="worker processes for --bench-env (default: one per core, 0: in-process)")
+    ap.add_argument("--scores", metavar="GAME", help="print a page of GAME's leaderboard as JSON lines and exit")
+    ap.add_argument("--board", default="All time", choices=BOARDS, help="board for --scores")
+    ap.add_argument("--page", type=int, default=0, help="page (10 scores each) for --scores")
+    ap.add_argument("--merge-scores", nargs="+", metavar="DB", help="merge other cabinets' score databases into this one and exit")
+    ap.add_argument("--bench-scores", type=int, metavar="ROWS", help="time leaderboard queries over ROWS random scores and exit")
+    ap.add_argument("--serve", type=int, metavar="PORT", help="stream the game being played to spectators on PORT")
+    ap.add_argument("--load-test", metavar="GAME", help=f"stream a fuzzed GAME ({', '.join(SNAPSHOTS)}) to --clients localhost spectators and exit")
+    ap.add_argument("--clients", type=int, default=200, help="spectators for --load-test")
+    ap.add_argument("--load-seconds", type=float, default=10.0, help="length of --load-test")
+    ap.add_argument("--bench-autoplay", type=int, metavar="PIECES", help="benchmark the demo autoplayers headless and exit")
+    ap.add_argument("--capture", metavar="DIR", help="keep the last --capture-seconds of play in memory; record runs and F9 save clips to DIR")
+    ap.add_argument("--capture-seconds", type=float, default=15.0, help="length of the in-memory clip buffer")
+    ap.add_argument("--capture-fps", type=int, default=30, help="capture frame rate")
+    ap.add_argument("--bench-capture", type=float, metavar="SECONDS", help="time frame grabs while rendering a game headless, save a clip and exit")
+    ap.add_argument("--bench-input", metavar="GAME", help="measure input-to-present latency through the frame loop for GAME and exit")
+    ap.add_argument("--telemetry-url", metavar="URL", help="also POST telemetry batches (gzipped NDJSON) to URL")
+    ap.add_argument("--no-telemetry", action="store_true", help="record no session telemetry")
+    ap.add_argument("--telemetry-stub", type=int, metavar="PORT", help="run a local telemetry collector on PORT, appending to telemetry-stub.ndjson")
+    ap.add_argument("--telemetry-report", nargs="*", metavar="PATH", help="aggregate telemetry logs (default: the local ones) and exit")
+    ap.add_argument("--bench-telemetry", type=int, metavar="EVENTS", help="time telemetry emit and flush over EVENTS events and exit")
+    ap.add_argument("--startup-time", nargs="?", const="", metavar="LOG", help="start up to the first menu frame, print stage timings and exit; LOG also appends them as a JSON line")
+    args = ap.parse_args()
+    if args.bench_env:
+        if args.bench_env not in OBSERVERS: ap.error(f"unknown game {args.bench_env!r}; pick one of {', '.join(OBSERVERS)}")
+        print(json.dumps(bench_env(args.bench_env, args.envs, args.workers, seed=args.seed)))
+        sys.exit()
+    if args.telemetry_report is not None:
+        print(json.dumps(telemetry_report(args.telemetry_report or [DATA_DIR / "telemetry"]), indent=2))
+        sys.exit()
+    if args.telemetry_stub is not None:
+        try: telemetry_stub(args.telemetry_stub).serve_forever()
+        except KeyboardInterrupt: pass
+        sys.exit()
+    if args.bench_telemetry:
+        print(json.dumps(bench_telemetry(args.bench_telemetry)))
+        sys.exit()
+    if args.check_telemetry:
+        r = check_telemetry_rotation(); print(json.dumps(r))
+        sys.exit(0 if r["ok"] else 1)
+    if args.bench_scores:
+        print(json.dumps(bench_leaderboard(args.bench_scores, args.seed)))
+        sys.exit()
+    if args.scores or args.merge_scores:
+        lb = Leaderboard(SCORES_DB, load_json(SETTINGS_FILE, {}).get("cabinet"))
+        for f in args.merge_scores or []:
+            print(json.dumps({"merged": f, "rows": lb.merge(f)}))
+        if args.scores:
+            for i, (sc, ini, diff, t) in enumerate(lb.top(args.scores, 10, args.page, args.board)):
+                print(json.dumps({"rank": args.page*10 + i + 1, "score": sc, "initials": ini, "difficulty": diff, "t": t}))
+        lb.close(); sys.exit()
+    if args.load_test:
+        if args.load_test not in SNAPSHOTS: ap.error(f"unknown game {args.load_test!r}; pick one of {', '.join(SNAPSHOTS)}")
+        print(json.dumps(stream_load_test(args.load_test, args.clients, args.load_seconds, seed=args.seed)))
+        sys.exit()
+    if args.bench is not None:
+        bad = bench_suite(args.bench, args.bench_frames, args.seed, args.baseline, args.save_baseline)
+        sys.exit(1 if bad else 0)
+    if args.replay:
+        ok = True
+        for f in args.replay:
+            r = replay(f, render=args.render); ok &= r["match"]
+            print(json.dumps(r))
+        sys.exit(0 if ok else 1)
+    if args.check_replay:
+        rows = check_replays(seed=args.seed)
+        for r in rows: print(json.dumps(r))
+        sys.exit(0 if rows and all(r["match"] for r in rows) else 1)
+    if args.stress_bricks:
+        for row in stress_bricks(seed=args.seed): print(json.dumps(row))
+        sys.exit()
+    if args.bench_collide:
+        for row in bench_collisions(seed=args.seed): print(json.dumps(row))
+        sys.exit()
+    if args.stress_snake:
+        print(json.dumps(stress_snake(args.seed), indent=2))
+        sys.exit()
+    if args.bench_input:
+        print(json.dumps(bench_input(args.bench_input, seed=args.seed)))
+        sys.exit()
+    if args.bench_capture:
+        print(json.dumps(bench_capture(args.bench_capture, args.capture or "capture-bench", fps=args.capture_fps)))
+        sys.exit()
+    if args.bench_autoplay:
+        print(json.dumps(bench_autoplay(args.bench_autoplay, seed=args.seed), indent=2))
+        sys.exit()
+    if args.bench_tetris:
+        print(json.dumps(bench_tetris(args.bench_tetris, args.seed), indent=2))
+        sys.exit()
+    if args.headless:
+        table = dict(GAMES)
+        names = list(table) if args.headless=="all" else [args.headless]
+        for n in names:
+            if n not in table: ap.error(f"unknown game {n!r}; pick one of {', '.join(table)} or all")
+            h = Headless(table[n], args.difficulty, args.seed, render=args.render)
+            print(json.dumps(h.run(args.frames, fuzz=args.fuzz)))
+        sys.exit()
+    PROFILER.trace_path = args.profile
+    if args.attract is not None: ATTRACT_MS = int(args.attract * 1000)
+    if args.fps: BaseGame.fps = args.fps; PROFILER.budget = 1000.0 / args.fps
+    if args.record:
+        Path(args.record).mkdir(parents=True, exist_ok=True)
+        RECORD_DIR = args.record
+    if args.serve is not None:
+        STREAM = StreamServer("0.0.0.0", args.serve); STREAM.start()
+    STARTUP["imports"] = time.perf_counter()
+    setup()
+    if args.capture: CAPTURE = Capture(args.capture, SCREEN, args.capture_fps, args.capture_seconds)
+    # brief press-any-key screen, up before settings and scores are read
+    SCREEN.fill(COLS["bg"])
+    draw_text(SCREEN, "Arcade - Fixed Collection", WIDTH//2, HEIGHT//2 - 20, XL, COLS["accent"], center=True)
+    draw_text(SCREEN, "Press any key to continue", WIDTH//2, HEIGHT//2 + 30, FONT, COLS["muted"], center=True)
+    pygame.display.flip()
+    STARTUP["splash"] = time.perf_counter()
+    load_state()
+    STARTUP["state"] = time.perf_counter()
+    if args.startup_time is not None:
+        # time to the first menu frame, per stage and cumulative, in ms from T_START
+        draw_menu(); pygame.display.flip()
+        STARTUP["menu"] = time.perf_counter()
+        row = {"t": int(time.time())}; prev = T_START
+        for stage, t in STARTUP.items():
+            row[stage + "_ms"] = round((t - prev)*1000, 2); prev = t
+        row["total_ms"] = round((prev - T_START)*1000, 2)
+        print(json.dumps(row))
+        if args.startup_time: PERSIST.append(Path(args.startup_time), json.dumps(row))
+        PERSIST.flush(); pygame.quit(); sys.exit()
+    if not args.no_telemetry:
+        TELEMETRY = Telemetry(DATA_DIR / "telemetry", args.telemetry_url, SETTINGS.get("cabinet"))
+    ev = pygame.event.wait()
+    main_loop()